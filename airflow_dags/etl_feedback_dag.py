@@ -2,21 +2,41 @@
 Airflow DAG for ETL processing of special education feedback data.
 
 This DAG:
-1. Connects to MySQL database
-2. Pulls feedback marked as "unprocessed"
-3. Cleans the text (lowercase, remove punctuation)
-4. Writes cleaned feedback to a temporary CSV
-5. Marks feedback as "processed"
+1. Splits the feedback marked as "unprocessed" into id-range partitions
+2. For each partition, in parallel mapped task instances:
+   a. Streams the partition's feedback from MySQL in chunks
+   b. Cleans the text (lowercase, remove punctuation)
+   c. Writes cleaned feedback to a temporary CSV
+   d. Marks feedback as "processed"
+3. Summarizes the results of all partitions
 """
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import functools
+import logging
 import os
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
 import re
 import string
 from sqlalchemy import create_engine, text
+
+try:
+    import numba
+except ImportError:  # numba is optional; cleaning falls back to Arrow kernels
+    numba = None
 from airflow import DAG
+from airflow.models.baseoperator import chain
 from airflow.operators.python import PythonOperator
 from airflow.utils.dates import days_ago
+from airflow.utils.trigger_rule import TriggerRule
+
+# Records propagate to Airflow's task log handler
+logger = logging.getLogger(__name__)
 
 # Define default arguments for the DAG
 default_args = {
@@ -38,6 +58,33 @@ dag = DAG(
     catchup=False
 )
 
+# Number of rows fetched from MySQL and processed at a time
+CHUNK_SIZE = 50000
+
+# Number of id-range partitions processed by parallel mapped tasks
+PARTITION_COUNT = int(os.environ.get('ETL_PARTITION_COUNT', 4))
+
+# Number of ids loaded into the temporary table per multi-row INSERT
+ID_INSERT_BATCH_SIZE = 5000
+
+# Chunks with fewer rows than this are cleaned on the calling thread
+PARALLEL_CLEAN_MIN_ROWS = 10000
+
+# Chunks with at least this many rows use the compiled ASCII cleaner when
+# numba is installed
+NUMBA_CLEAN_MIN_ROWS = 10000
+
+# Column layout of the transformed feedback CSV
+CSV_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('student_id', pa.string()),
+    ('teacher_name', pa.string()),
+    ('rating', pa.int64()),
+    ('category', pa.string()),
+    ('open_feedback', pa.string()),
+    ('cleaned_feedback', pa.string()),
+])
+
 # Define the database connection parameters
 # These should ideally come from environment variables or Airflow connections
 def get_db_connection_string():
@@ -50,216 +97,409 @@ def get_db_connection_string():
     
     return f"mysql+pymysql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
 
-def clean_text(text):
+@functools.lru_cache(maxsize=1)
+def get_engine():
+    """
+    Get the shared SQLAlchemy engine for the feedback database.
+    
+    The engine and its connection pool are created on first use and reused
+    by every task run in the same worker process.
+    
+    Returns:
+        Engine: SQLAlchemy engine
+    """
+    engine = create_engine(get_db_connection_string(), pool_pre_ping=True, pool_size=8)
+    atexit.register(engine.dispose)
+    return engine
+
+# Regex patterns for the Arrow cleaning path
+_PUNCT_PATTERN = '[' + re.escape(string.punctuation) + ']'
+_WS_PATTERN = r'\s+'
+
+# Byte lookup tables for the compiled ASCII cleaning path. Whitespace is
+# what RE2's \s in _WS_PATTERN matches, which leaves out the vertical tab
+_WHITESPACE = ' \t\n\f\r'
+_PUNCT_BYTES = np.zeros(256, dtype=np.bool_)
+_PUNCT_BYTES[[ord(char) for char in string.punctuation]] = True
+_SPACE_BYTES = np.zeros(256, dtype=np.bool_)
+_SPACE_BYTES[[ord(char) for char in _WHITESPACE]] = True
+
+def clean_text_array(arr):
+    """
+    Clean an Arrow string array: lowercase it, remove ASCII punctuation and
+    collapse whitespace runs to single spaces.
+    
+    The steps run in Arrow's C++ kernels over contiguous UTF-8 buffers.
+    
+    Args:
+        arr (pa.Array or pa.ChunkedArray): Raw feedback text (may contain nulls)
+        
+    Returns:
+        pa.Array or pa.ChunkedArray: Cleaned text
+    """
+    arr = pc.fill_null(arr.cast(pa.string()), '')
+    arr = pc.utf8_lower(arr)
+    arr = pc.replace_substring_regex(arr, pattern=_PUNCT_PATTERN, replacement='')
+    arr = pc.replace_substring_regex(arr, pattern=_WS_PATTERN, replacement=' ')
+    arr = pc.utf8_trim_whitespace(arr)
+    
+    return arr
+
+if numba is not None:
+    @numba.njit(parallel=True)
+    def _clean_ascii_rows(data, offsets, out, lengths):
+        """Clean each row of an ASCII string buffer in a single pass."""
+        for row in numba.prange(len(offsets) - 1):
+            start = offsets[row]
+            pos = start
+            pending_space = False
+            for i in range(start, offsets[row + 1]):
+                byte = data[i]
+                if _SPACE_BYTES[byte]:
+                    # Collapse whitespace runs and drop leading whitespace
+                    pending_space = pos > start
+                    continue
+                if _PUNCT_BYTES[byte]:
+                    continue
+                if pending_space:
+                    out[pos] = 32
+                    pos += 1
+                    pending_space = False
+                if 65 <= byte <= 90:
+                    byte += 32
+                out[pos] = byte
+                pos += 1
+            lengths[row] = pos - start
+    
+    @numba.njit(parallel=True)
+    def _compact_rows(out, offsets, lengths, new_offsets, result):
+        """Copy each cleaned row to its final position in the result buffer."""
+        for row in numba.prange(len(lengths)):
+            start = offsets[row]
+            new_start = new_offsets[row]
+            for i in range(lengths[row]):
+                result[new_start + i] = out[start + i]
+
+def clean_ascii_array(arr):
     """
-    Clean text by converting to lowercase and removing punctuation.
+    Clean an ASCII-only Arrow string array with the compiled numba kernel.
+    
+    Lowercasing, punctuation removal and whitespace collapsing happen in one
+    pass over the UTF-8 value buffer, with rows processed in parallel.
     
     Args:
-        text (str): Text to clean
+        arr (pa.StringArray): Raw feedback text without nulls, ASCII only
         
     Returns:
-        str: Cleaned text
+        pa.StringArray: Cleaned text
     """
-    if not text:
-        return ""
+    _, offsets_buffer, data_buffer = arr.buffers()
+    if data_buffer is None or len(arr) == 0:
+        return arr
     
-    # Convert to lowercase
-    text = text.lower()
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int32)[arr.offset:arr.offset + len(arr) + 1]
+    data = np.frombuffer(data_buffer, dtype=np.uint8)
     
-    # Remove punctuation
-    translator = str.maketrans('', '', string.punctuation)
-    text = text.translate(translator)
+    # Rows are cleaned in place at their input offsets, then compacted
+    out = np.empty_like(data)
+    lengths = np.empty(len(arr), dtype=np.int32)
+    _clean_ascii_rows(data, offsets, out, lengths)
     
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    new_offsets = np.zeros(len(arr) + 1, dtype=np.int32)
+    np.cumsum(lengths, out=new_offsets[1:])
+    result = np.empty(new_offsets[-1], dtype=np.uint8)
+    _compact_rows(out, offsets, lengths, new_offsets, result)
     
-    return text
+    cleaned = pa.Array.from_buffers(
+        pa.string(), len(arr), [None, pa.py_buffer(new_offsets), pa.py_buffer(result)]
+    )
+    # The Arrow path trims more characters than it collapses (e.g. \v), so
+    # trim the same way to give the same output
+    return pc.utf8_trim_whitespace(cleaned)
 
-def extract_unprocessed_feedback(**kwargs):
+def clean_text_array_parallel(arr):
     """
-    Extract unprocessed feedback from the MySQL database.
+    Clean a large Arrow string array across CPU cores.
+    
+    Large all-ASCII arrays use the compiled numba cleaner when it is
+    available. Otherwise, since Arrow compute kernels release the GIL, the
+    array is split into one slice per core and the slices are cleaned
+    concurrently on a thread pool.
     
+    Args:
+        arr (pa.ChunkedArray): Raw feedback text (may contain nulls)
+        
     Returns:
-        dict: Dictionary containing information about the extraction process
+        pa.ChunkedArray: Cleaned text
     """
-    # Create database connection
-    connection_string = get_db_connection_string()
-    engine = create_engine(connection_string)
+    # Large all-ASCII chunks go through the compiled single-pass cleaner,
+    # whose lowercasing and punctuation rules only cover ASCII
+    if numba is not None and len(arr) >= NUMBA_CLEAN_MIN_ROWS:
+        text_arr = pc.fill_null(arr.cast(pa.string()), '').combine_chunks()
+        if pc.all(pc.string_is_ascii(text_arr)).as_py():
+            return pa.chunked_array([clean_ascii_array(text_arr)])
     
-    # Query for unprocessed feedback
-    query = "SELECT * FROM feedback WHERE processed = 0"
+    workers = os.cpu_count() or 1
+    if workers == 1 or len(arr) < PARALLEL_CLEAN_MIN_ROWS:
+        return clean_text_array(arr)
     
-    try:
-        # Read data into a pandas DataFrame
-        df = pd.read_sql(query, engine)
+    slice_length = -(-len(arr) // workers)
+    slices = [arr.slice(offset, slice_length) for offset in range(0, len(arr), slice_length)]
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        cleaned = list(executor.map(clean_text_array, slices))
+    
+    return pa.chunked_array(
+        [chunk for part in cleaned for chunk in part.chunks],
+        type=pa.string()
+    )
+
+def iter_unprocessed_feedback(engine, min_id, max_id, batch_size=CHUNK_SIZE):
+    """
+    Yield unprocessed feedback in an id range, in id order, using keyset pagination.
+    
+    Each page seeks past the last id of the previous page, so every query
+    is an index range scan on (processed, id) rather than an OFFSET scan.
+    
+    Args:
+        engine: SQLAlchemy engine for the feedback database
+        min_id (int): Smallest feedback id to include
+        max_id (int): Largest feedback id to include
+        batch_size (int): Maximum number of rows per page
         
-        # Store the DataFrame in XCom for the next task
-        num_records = len(df)
-        if num_records > 0:
-            # Save dataframe to a temp file for next task
-            temp_path = "/tmp/unprocessed_feedback.parquet"
-            df.to_parquet(temp_path, index=False)
-            
-            print(f"Extracted {num_records} unprocessed feedback records")
-            return {
-                "status": "success",
-                "record_count": num_records,
-                "temp_file_path": temp_path
-            }
-        else:
-            print("No unprocessed feedback records found")
-            return {
-                "status": "success",
-                "record_count": 0,
-                "temp_file_path": None
-            }
-            
-    except Exception as e:
-        print(f"Error extracting feedback: {str(e)}")
-        return {
-            "status": "error",
-            "message": str(e)
-        }
+    Yields:
+        pd.DataFrame: A page of unprocessed feedback records
+    """
+    query = text(
+        "SELECT id, student_id, teacher_name, rating, category, open_feedback "
+        "FROM feedback WHERE processed = 0 AND id > :last_id AND id <= :max_id "
+        "ORDER BY id LIMIT :batch_size"
+    )
+    
+    last_id = min_id - 1
+    while True:
+        df = pd.read_sql(query, engine, params={
+            "last_id": last_id,
+            "max_id": max_id,
+            "batch_size": batch_size
+        })
+        if df.empty:
+            return
+        
+        yield df
+        
+        if len(df) < batch_size:
+            return
+        last_id = int(df['id'].iloc[-1])
 
-def transform_feedback_data(**kwargs):
+def mark_feedback_processed(engine, feedback_ids):
     """
-    Transform and clean the feedback text.
+    Mark the given feedback records as processed in the database.
     
+    Args:
+        engine: SQLAlchemy engine for the feedback database
+        feedback_ids (list): IDs of the feedback records to update
+        
     Returns:
-        dict: Dictionary containing information about the transformation process
+        int: Number of records updated
     """
-    ti = kwargs['ti']
+    if not feedback_ids:
+        return 0
     
-    # Get the extraction result from the previous task
-    extraction_result = ti.xcom_pull(task_ids='extract_unprocessed_feedback')
+    with engine.begin() as connection:
+        # Load the IDs into a temporary table so MySQL can update through an
+        # indexed join instead of parsing one huge IN (...) list
+        connection.execute(text("DROP TEMPORARY TABLE IF EXISTS tmp_processed_ids"))
+        connection.execute(text(
+            "CREATE TEMPORARY TABLE tmp_processed_ids (id INT PRIMARY KEY)"
+        ))
+        # One multi-row INSERT per batch keeps this at one round-trip per
+        # ID_INSERT_BATCH_SIZE ids instead of one per id
+        for start in range(0, len(feedback_ids), ID_INSERT_BATCH_SIZE):
+            batch = feedback_ids[start:start + ID_INSERT_BATCH_SIZE]
+            placeholders = ", ".join(f"(:id{i})" for i in range(len(batch)))
+            connection.execute(
+                text(f"INSERT INTO tmp_processed_ids (id) VALUES {placeholders}"),
+                {f"id{i}": int(feedback_id) for i, feedback_id in enumerate(batch)}
+            )
+        
+        result = connection.execute(text(
+            "UPDATE feedback f JOIN tmp_processed_ids t ON f.id = t.id "
+            "SET f.processed = 1"
+        ))
+        updated_count = result.rowcount
+        
+        connection.execute(text("DROP TEMPORARY TABLE tmp_processed_ids"))
     
-    if extraction_result["status"] == "error":
-        print(f"Error in previous task: {extraction_result['message']}")
-        return {
-            "status": "error",
-            "message": "Error in extraction task"
-        }
+    return updated_count
+
+def plan_feedback_partitions(**kwargs):
+    """
+    Split the unprocessed feedback into contiguous id ranges.
     
-    if extraction_result["record_count"] == 0:
-        print("No records to transform")
-        return {
-            "status": "success",
-            "record_count": 0,
-            "temp_file_path": None
-        }
+    Returns:
+        list: Keyword arguments for each mapped run_feedback_etl task instance
+    """
+    engine = get_engine()
     
-    try:
-        # Load the DataFrame from the temporary file
-        temp_path = extraction_result["temp_file_path"]
-        df = pd.read_parquet(temp_path)
+    with engine.connect() as connection:
+        min_id, max_id = connection.execute(text(
+            "SELECT MIN(id), MAX(id) FROM feedback WHERE processed = 0"
+        )).fetchone()
+    
+    if min_id is None:
+        logger.info("No unprocessed feedback records found")
+        return []
+    
+    span = -(-(max_id - min_id + 1) // PARTITION_COUNT)
+    partitions = [
+        {"partition": index, "min_id": start, "max_id": min(start + span - 1, max_id)}
+        for index, start in enumerate(range(min_id, max_id + 1, span))
+    ]
+    
+    logger.info("Split unprocessed feedback ids %d-%d into %d partitions",
+                min_id, max_id, len(partitions))
+    return partitions
+
+def run_feedback_etl(partition, min_id, max_id, **kwargs):
+    """
+    Extract one partition of unprocessed feedback, clean it, write it to CSV
+    and mark it processed.
+    
+    The feedback is paged from MySQL in chunks of CHUNK_SIZE rows; each
+    chunk is cleaned and appended to the CSV before the next one is fetched.
+    Records are only marked as processed once the CSV has been fully written.
+    
+    Args:
+        partition (int): Index of the partition, used to name its CSV file
+        min_id (int): Smallest feedback id in the partition
+        max_id (int): Largest feedback id in the partition
         
-        # Clean the open_feedback text
-        df['cleaned_feedback'] = df['open_feedback'].apply(clean_text)
+    Returns:
+        dict: Dictionary containing information about the ETL run
+    """
+    engine = get_engine()
+    
+    transformed_path = f"/tmp/transformed_feedback_{partition}.csv"
+    
+    try:
+        record_count = 0
+        feedback_ids = []
+        writer = None
+        try:
+            for df in iter_unprocessed_feedback(engine, min_id, max_id):
+                feedback_ids.extend(df['id'].tolist())
+                
+                # Hand the chunk to Arrow once and clean the open_feedback text there
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                table = table.append_column(
+                    'cleaned_feedback', clean_text_array_parallel(table['open_feedback'])
+                )
+                
+                # The query already projects the CSV columns, in export order;
+                # casting pins the types of columns that are all NULL in a chunk
+                table = table.cast(CSV_SCHEMA)
+                
+                # The writer emits the header once, when it is opened
+                if writer is None:
+                    writer = pacsv.CSVWriter(transformed_path, CSV_SCHEMA)
+                writer.write_table(table)
+                
+                record_count += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
         
-        # Save the transformed data to a new temporary file
-        transformed_path = "/tmp/transformed_feedback.csv"
+        if record_count == 0:
+            logger.info("No unprocessed feedback records found in ids %d-%d", min_id, max_id)
+            return {
+                "status": "success",
+                "record_count": 0,
+                "updated_count": 0,
+                "temp_file_path": None
+            }
         
-        # Select needed columns for CSV export
-        csv_df = df[['id', 'student_id', 'teacher_name', 'rating', 
-                     'category', 'open_feedback', 'cleaned_feedback']]
+        logger.info("Transformed %d feedback records and saved to %s",
+                    record_count, transformed_path)
         
-        # Save to CSV
-        csv_df.to_csv(transformed_path, index=False)
+        updated_count = mark_feedback_processed(engine, feedback_ids)
         
-        print(f"Transformed {len(df)} feedback records and saved to {transformed_path}")
+        logger.info("Marked %d feedback records as processed", updated_count)
         return {
             "status": "success",
-            "record_count": len(df),
-            "temp_file_path": transformed_path,
-            "original_file_path": temp_path,
-            "feedback_ids": df['id'].tolist()
+            "record_count": record_count,
+            "updated_count": updated_count,
+            "temp_file_path": transformed_path
         }
         
     except Exception as e:
-        print(f"Error transforming feedback: {str(e)}")
+        logger.error("Error running feedback ETL: %s", e)
         return {
             "status": "error",
             "message": str(e)
         }
 
-def mark_feedback_processed(**kwargs):
+def summarize_feedback_etl(**kwargs):
     """
-    Mark feedback as processed in the database.
+    Combine the results of all mapped run_feedback_etl task instances.
     
     Returns:
-        dict: Dictionary containing information about the update process
+        dict: Dictionary containing the totals for the whole ETL run
     """
     ti = kwargs['ti']
     
-    # Get the transformation result from the previous task
-    transform_result = ti.xcom_pull(task_ids='transform_feedback')
+    # Pulling from a mapped task returns the results of every instance
+    results = list(ti.xcom_pull(task_ids='run_feedback_etl') or [])
     
-    if transform_result["status"] == "error":
-        print(f"Error in previous task: {transform_result['message']}")
-        return {
-            "status": "error",
-            "message": "Error in transformation task"
-        }
+    errors = [result["message"] for result in results if result["status"] == "error"]
+    successes = [result for result in results if result["status"] == "success"]
     
-    if transform_result["record_count"] == 0:
-        print("No records to update")
-        return {
-            "status": "success",
-            "updated_count": 0
-        }
+    record_count = sum(result["record_count"] for result in successes)
+    updated_count = sum(result["updated_count"] for result in successes)
+    csv_paths = [result["temp_file_path"] for result in successes if result["temp_file_path"]]
     
-    try:
-        # Get the list of feedback IDs to mark as processed
-        feedback_ids = transform_result["feedback_ids"]
-        
-        # Create database connection
-        connection_string = get_db_connection_string()
-        engine = create_engine(connection_string)
-        
-        # Update the records to mark them as processed
-        with engine.connect() as connection:
-            # Construct the query to update all IDs at once
-            id_list = ', '.join(map(str, feedback_ids))
-            update_query = text(f"UPDATE feedback SET processed = 1 WHERE id IN ({id_list})")
-            result = connection.execute(update_query)
-            connection.commit()
-            
-            updated_count = result.rowcount
-            
-        print(f"Marked {updated_count} feedback records as processed")
-        return {
-            "status": "success",
-            "updated_count": updated_count
-        }
-        
-    except Exception as e:
-        print(f"Error marking feedback as processed: {str(e)}")
+    logger.info("Processed %d feedback records across %d partitions",
+                record_count, len(results))
+    if errors:
+        logger.error("Errors in %d partitions: %s", len(errors), "; ".join(errors))
         return {
             "status": "error",
-            "message": str(e)
+            "message": "; ".join(errors),
+            "record_count": record_count,
+            "updated_count": updated_count,
+            "csv_paths": csv_paths
         }
+    
+    return {
+        "status": "success",
+        "record_count": record_count,
+        "updated_count": updated_count,
+        "csv_paths": csv_paths
+    }
 
 # Define the tasks
-extract_task = PythonOperator(
-    task_id='extract_unprocessed_feedback',
-    python_callable=extract_unprocessed_feedback,
+plan_task = PythonOperator(
+    task_id='plan_feedback_partitions',
+    python_callable=plan_feedback_partitions,
     provide_context=True,
     dag=dag,
 )
 
-transform_task = PythonOperator(
-    task_id='transform_feedback',
-    python_callable=transform_feedback_data,
-    provide_context=True,
+# One mapped task instance per partition returned by plan_task
+etl_task = PythonOperator.partial(
+    task_id='run_feedback_etl',
+    python_callable=run_feedback_etl,
     dag=dag,
-)
+).expand(op_kwargs=plan_task.output)
 
-update_task = PythonOperator(
-    task_id='mark_feedback_processed',
-    python_callable=mark_feedback_processed,
+summary_task = PythonOperator(
+    task_id='summarize_feedback_etl',
+    python_callable=summarize_feedback_etl,
     provide_context=True,
+    # Still summarize when there was nothing to process and the mapped task was skipped
+    trigger_rule=TriggerRule.NONE_FAILED,
     dag=dag,
 )
 
 # Define task dependencies
-extract_task >> transform_task >> update_task
+chain(plan_task, etl_task, summary_task)
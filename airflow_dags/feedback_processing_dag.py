@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from airflow import DAG
+from airflow.models.baseoperator import chain
 from airflow.operators.python import PythonOperator
-from airflow.operators.dummy import DummyOperator
 from airflow.utils.dates import days_ago
 
 # Define default arguments for the DAG
@@ -82,11 +82,6 @@ def generate_insights(**kwargs):
     }
 
 # Define tasks
-start = DummyOperator(
-    task_id='start',
-    dag=dag,
-)
-
 extract_feedback = PythonOperator(
     task_id='extract_feedback',
     python_callable=extract_feedback_data,
@@ -122,12 +117,5 @@ generate_insights_task = PythonOperator(
     dag=dag,
 )
 
-end = DummyOperator(
-    task_id='end',
-    dag=dag,
-)
-
 # Define task dependencies
-start >> extract_feedback >> transform_feedback
-transform_feedback >> [load_vectors, update_graph]
-[load_vectors, update_graph] >> generate_insights_task >> end
+chain(extract_feedback, transform_feedback, [load_vectors, update_graph], generate_insights_task)
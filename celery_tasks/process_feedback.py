@@ -1,21 +1,27 @@
+from celery import chord
 from celery_tasks.celery import app
 from utils.logger import get_logger
-from elastic_search.search import index_feedback
+from elastic_search.config import ElasticsearchConfig
+from elastic_search.search import index_feedback, bulk_index_feedback, invalidate_search_cache
+from flask_app.cache import invalidate_categories
 
 logger = get_logger(__name__)
 
 @app.task(bind=True, name='process_feedback.analyze')
-def analyze_feedback(self, feedback_data):
+def analyze_feedback(self, feedback_data, index=True):
     """
     Analyze feedback data and extract insights.
     
     Args:
         feedback_data (dict): The feedback data to process
+        index (bool): Whether to index the processed feedback in Elasticsearch
+            immediately. When False the processed document is returned under
+            "document" so it can be bulk indexed with other feedback.
         
     Returns:
         dict: Results of the analysis
     """
-    logger.info(f"Processing feedback: {feedback_data.get('id', 'unknown')}")
+    logger.info("Processing feedback: %s", feedback_data.get('id', 'unknown'))
     
     try:
         # TODO: Implement actual feedback analysis
@@ -41,17 +47,20 @@ def analyze_feedback(self, feedback_data):
         })
         
         # Index the processed feedback in Elasticsearch
-        index_success = index_feedback(feedback_data)
-        if index_success:
-            logger.info(f"Successfully indexed feedback {feedback_data.get('id', 'unknown')} in Elasticsearch")
+        if index:
+            # Indexed synchronously so a failure is retried
+            if not index_feedback(feedback_data):
+                raise RuntimeError(f"Failed to index feedback {feedback_data.get('id', 'unknown')} in Elasticsearch")
+            logger.info("Indexed feedback %s in Elasticsearch", feedback_data.get('id', 'unknown'))
+            schedule_search_invalidation([feedback_data.get("category")])
         else:
-            logger.error(f"Failed to index feedback {feedback_data.get('id', 'unknown')} in Elasticsearch")
+            results["document"] = feedback_data
         
-        logger.info(f"Successfully processed feedback {feedback_data.get('id', 'unknown')}")
+        logger.info("Successfully processed feedback %s", feedback_data.get('id', 'unknown'))
         return results
         
     except Exception as e:
-        logger.error(f"Error processing feedback: {str(e)}")
+        logger.error("Error processing feedback: %s", e)
         self.retry(exc=e, countdown=60, max_retries=3)
 
 
@@ -61,12 +70,14 @@ def categorize_feedback(self, analysis_results):
     Categorize feedback based on analysis results.
     
     Args:
-        analysis_results (dict): Results from feedback analysis
+        analysis_results (dict): Results from feedback analysis, or the raw
+            feedback data when run in parallel with the analysis
         
     Returns:
         dict: Categorization results
     """
-    logger.info(f"Categorizing feedback: {analysis_results.get('feedback_id', 'unknown')}")
+    feedback_id = analysis_results.get("feedback_id", analysis_results.get("id"))
+    logger.info("Categorizing feedback: %s", feedback_id or 'unknown')
     
     try:
         # TODO: Implement categorization logic
@@ -75,15 +86,135 @@ def categorize_feedback(self, analysis_results):
         categories = ["curriculum", "instruction", "support"]  # Placeholder
         
         return {
-            "feedback_id": analysis_results.get("feedback_id"),
+            "feedback_id": feedback_id,
             "categories": categories,
             "status": "categorized"
         }
         
     except Exception as e:
-        logger.error(f"Error categorizing feedback: {str(e)}")
+        logger.error("Error categorizing feedback: %s", e)
+        self.retry(exc=e, countdown=60, max_retries=3)
+
+@app.task(name='process_feedback.merge_results')
+def merge_feedback_results(results):
+    """
+    Merge the parallel analysis and categorization results for one feedback.
+    
+    Args:
+        results (list): [analysis results, categorization results] as
+            returned by the chord header
+        
+    Returns:
+        dict: Combined analysis and categorization results
+    """
+    analysis_results, categorization_results = results
+    
+    return {
+        **analysis_results,
+        "categories": categorization_results["categories"],
+        "status": "categorized"
+    }
+
+@app.task(bind=True, name='process_feedback.bulk_index')
+def index_feedback_batch(self, analysis_results_list):
+    """
+    Bulk index the processed feedback documents from a batch of analyses.
+    
+    Args:
+        analysis_results_list (list): Results of analyze_feedback run with
+            index=False, each carrying its processed document
+        
+    Returns:
+        dict: Indexing results
+    """
+    documents = [
+        results["document"] for results in analysis_results_list
+        if results and results.get("document")
+    ]
+    logger.info("Bulk indexing %d processed feedback documents", len(documents))
+    
+    try:
+        index_success = bulk_index_feedback(documents)
+        if index_success:
+            schedule_search_invalidation({document.get("category") for document in documents})
+        else:
+            logger.error("Failed to bulk index %d feedback documents in Elasticsearch", len(documents))
+        
+        return {
+            "indexed_count": len(documents) if index_success else 0,
+            "status": "indexed" if index_success else "error"
+        }
+        
+    except Exception as e:
+        logger.error("Error bulk indexing feedback: %s", e)
         self.retry(exc=e, countdown=60, max_retries=3)
 
+@app.task(name='process_feedback.invalidate_search_results')
+def invalidate_search_results(categories):
+    """
+    Drop cached search results that newly indexed feedback changes.
+    
+    Clears the Redis response cache for the categories and bumps the shared
+    search cache generation.
+    
+    Args:
+        categories (list): Categories of the indexed feedback
+    """
+    invalidate_categories(categories)
+    invalidate_search_cache()
+
+def schedule_search_invalidation(categories):
+    """
+    Invalidate cached search results once newly indexed feedback is searchable.
+    
+    Indexed documents only show up in searches after the next index refresh,
+    so invalidating right away would let stale results be cached again.
+    
+    Args:
+        categories (iterable): Categories of the indexed feedback
+    """
+    invalidate_search_results.apply_async(
+        args=[list(categories)],
+        countdown=ElasticsearchConfig.REFRESH_INTERVAL_SECONDS + 1
+    )
+
+def analyze_feedback_batch(feedback_items):
+    """
+    Analyze a batch of feedback in parallel and index it with one bulk request.
+    
+    Each item is analyzed by its own analyze_feedback task without per-item
+    indexing; once all analyses complete, index_feedback_batch sends the
+    processed documents to Elasticsearch in bulk.
+    
+    Args:
+        feedback_items (list): Feedback data dictionaries to process
+        
+    Returns:
+        AsyncResult: Result of the bulk indexing task
+    """
+    return chord([
+        analyze_feedback.s(feedback_data, index=False) for feedback_data in feedback_items
+    ])(index_feedback_batch.s())
+
+def analyze_and_categorize(feedback_data):
+    """
+    Run feedback analysis and categorization in parallel and merge the results.
+    
+    The two tasks are independent, so they are dispatched together as the
+    header of a chord and merge_feedback_results runs once both complete.
+    Chords require a result backend that supports them (e.g. Redis).
+    
+    Args:
+        feedback_data (dict): The feedback data to process
+        
+    Returns:
+        AsyncResult: Result of the merge task
+    """
+    return chord([
+        analyze_feedback.s(feedback_data),
+        categorize_feedback.s(feedback_data)
+    ])(merge_feedback_results.s())
+
 @app.task(bind=True, name='process_feedback.process_open_feedback')
 def process_open_feedback(self, feedback_id, open_feedback_text):
     """
@@ -103,15 +234,15 @@ def process_open_feedback(self, feedback_id, open_feedback_text):
     Returns:
         dict: Results of the processing
     """
-    logger.info(f"Processing open feedback for feedback ID: {feedback_id}")
-    logger.info(f"Open feedback text: {open_feedback_text}")
+    logger.info("Processing open feedback for feedback ID: %s", feedback_id)
+    logger.debug("Open feedback text: %s", open_feedback_text)
     
     try:
         # Simple processing for now - just log the text
         word_count = len(open_feedback_text.split()) if open_feedback_text else 0
         char_count = len(open_feedback_text) if open_feedback_text else 0
         
-        logger.info(f"Feedback {feedback_id} processed: {word_count} words, {char_count} characters")
+        logger.info("Feedback %s processed: %d words, %d characters", feedback_id, word_count, char_count)
         
         # This is where you would add more sophisticated processing in the future
         results = {
@@ -126,5 +257,5 @@ def process_open_feedback(self, feedback_id, open_feedback_text):
         return results
         
     except Exception as e:
-        logger.error(f"Error processing open feedback: {str(e)}")
+        logger.error("Error processing open feedback: %s", e)
         self.retry(exc=e, countdown=60, max_retries=3)
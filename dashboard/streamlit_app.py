@@ -8,26 +8,20 @@ This dashboard provides:
 """
 import os
 import sys
-import json
+from collections import Counter, defaultdict
+from operator import itemgetter
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
-import networkx as nx
-from pyvis.network import Network
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
-import boto3
-from boto3.dynamodb.conditions import Key
-import tempfile
-from pathlib import Path
 
 # Add project root to Python path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import project modules
 from dynamo.insights import InsightsManager
-from vector_db.semantic import get_semantic_processor
+from vector_db.semantic import get_semantic_processor, EmbeddingCache, SemanticSearchCache
 from graph_db.neptune_loader import NeptuneLoader
 
 # Configure page
@@ -39,7 +33,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -78,74 +72,166 @@ st.markdown("""
         border-radius: 0.25rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Colors shared by all sentiment charts
+SENTIMENT_COLORS = {
+    'positive': '#43A047',  # Green
+    'negative': '#E53935',  # Red
+    'neutral': '#FFA726'    # Orange
+}
+
+# Insight attributes the dashboard displays; everything else stays in DynamoDB
+INSIGHT_ATTRIBUTES = ['insight_id', 'student_id', 'sentiment', 'theme', 'summary', 'created_at']
+
+# HTML for a single semantic search result card
+SEARCH_RESULT_CARD = """<div style="margin-bottom: 1rem; padding: 1rem; border-radius: 0.5rem; background-color: rgba(30, 136, 229, {alpha});">
+<div style="display: flex; justify-content: space-between;">
+<span style="font-weight: bold;">Result {number}</span>
+<span style="background-color: #E3F2FD; padding: 0.1rem 0.5rem; border-radius: 1rem;">{score_percentage}% match</span>
+</div>
+<div style="margin: 0.5rem 0; font-size: 1.1rem;">{text}</div>
+<div style="color: #455A64; font-size: 0.9rem;">
+ID: {feedback_id} | 
+Student: {student_id} | 
+Category: {category}
+</div>
+</div>"""
+
+# Streamlit drops elements that aren't re-emitted, so the CSS is sent every run
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Helper functions
+@st.cache_resource
+def get_insights_manager():
+    """Create the DynamoDB insights manager once per server process."""
+    return InsightsManager()
+
+@st.cache_resource
+def get_neptune_loader():
+    """Create the Neptune loader once per server process."""
+    return NeptuneLoader()
+
+@st.cache_resource
+def get_cached_semantic_processor():
+    """Load the embedding model and Qdrant client once per server process."""
+    return get_semantic_processor()
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def fetch_dynamo_insights(days_back, limit):
+    """Fetch insights from DynamoDB, cached per (days_back, limit) for 5 minutes."""
+    insights_manager = get_insights_manager()
+    
+    # Calculate the timestamp for filtering (days back from now)
+    start_time = int((datetime.now() - timedelta(days=days_back)).timestamp())
+    
+    # Read the time window from the created_at index instead of scanning the table
+    result = insights_manager.get_recent_insights(
+        start_time=start_time,
+        limit=limit,
+        attributes=INSIGHT_ATTRIBUTES
+    )
+    if result['status'] != 'success':
+        raise RuntimeError(result['message'])
+    
+    # Convert to DataFrame for easier manipulation
+    df = pd.DataFrame(result['insights'])
+    
+    # DynamoDB returns numbers as Decimal, which pandas would keep as objects
+    if 'created_at' in df:
+        df['created_at'] = df['created_at'].astype('int64')
+    
+    return df
+
 def load_dynamo_insights(days_back=30, limit=500):
     """Load insights from DynamoDB."""
     try:
-        insights_manager = InsightsManager()
-        
-        # Initialize DynamoDB client directly for scanning the table
-        dynamodb = boto3.resource('dynamodb', region_name=insights_manager.region)
-        table = dynamodb.Table(insights_manager.table_name)
-        
-        # Calculate the timestamp for filtering (days back from now)
-        start_time = int((datetime.now() - timedelta(days=days_back)).timestamp())
-        
-        # Scan the table with a filter expression
-        response = table.scan(
-            FilterExpression=Key('created_at').gt(start_time),
-            Limit=limit
-        )
-        
-        insights = response.get('Items', [])
-        
-        # Convert to DataFrame for easier manipulation
-        if insights:
-            df = pd.DataFrame(insights)
-            return df
-        else:
-            return pd.DataFrame()
+        # Failures raise out of the cached fetch, so they are retried on the next rerun
+        return fetch_dynamo_insights(days_back, limit)
             
     except Exception as e:
         st.error(f"Error loading insights from DynamoDB: {str(e)}")
         return pd.DataFrame()
 
+@st.cache_resource
+def get_search_cache():
+    """Create the near-duplicate query result cache once per server process."""
+    return SemanticSearchCache(capacity=128, ttl_seconds=600, similarity_threshold=0.86)
+
+@st.cache_resource
+def get_embedding_cache():
+    """Open the on-disk query embedding cache once per server process."""
+    return EmbeddingCache()
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def embed_query(query_text):
+    """Embed a search query, cached so slider changes don't re-run the model."""
+    semantic_processor = get_cached_semantic_processor()
+    
+    # The disk cache keeps embeddings across server restarts
+    embedding_cache = get_embedding_cache()
+    model_name = semantic_processor.model_name
+    quantized = semantic_processor.quantize_model
+    query_vector = embedding_cache.get(model_name, query_text, quantized)
+    if query_vector is None:
+        query_vector = semantic_processor.generate_embedding(query_text)
+        embedding_cache.put(model_name, query_text, query_vector, quantized)
+    
+    return query_vector
+
 def perform_semantic_search(query_text, limit=10, threshold=0.6):
     """Perform semantic search using the vector database."""
     try:
-        # Initialize the semantic processor
-        semantic_processor = get_semantic_processor()
+        # Reuse the semantic processor across reruns
+        semantic_processor = get_cached_semantic_processor()
+        
+        query_vector = embed_query(query_text)
         
-        # Perform the search
+        # Near-duplicate queries are answered without calling Qdrant
+        search_cache = get_search_cache()
+        results = search_cache.get(query_vector, limit, threshold)
+        if results is not None:
+            return results
+        
+        # Perform the search with the cached query embedding
         results = semantic_processor.semantic_search(
             query_text=query_text,
             limit=limit,
-            score_threshold=threshold
+            score_threshold=threshold,
+            query_vector=query_vector
         )
         
+        # Empty results may come from a Qdrant error, so they are not cached
+        if results:
+            search_cache.put(query_vector, limit, threshold, results)
+        
         return results
         
     except Exception as e:
         st.error(f"Error performing semantic search: {str(e)}")
         return []
 
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def fetch_graph_data():
+    """Fetch graph data from Neptune, cached for 5 minutes."""
+    neptune_loader = get_neptune_loader()
+    
+    # Reuse the open connection of the cached loader
+    if neptune_loader.g is None and not neptune_loader.connect():
+        # If connection fails, use sample data
+        return generate_sample_graph_data()
+    
+    # If connected, query the graph data
+    # This is a placeholder for actual Neptune querying code
+    # In a real implementation, you would use gremlin queries to get the data
+    
+    # Return sample data for now
+    return generate_sample_graph_data()
+
 def load_graph_data():
     """Load graph data from Neptune (or generate sample data if unavailable)."""
     try:
-        # Try to connect to Neptune
-        neptune_loader = NeptuneLoader()
-        if neptune_loader.connect():
-            # If connected, query the graph data
-            # This is a placeholder for actual Neptune querying code
-            # In a real implementation, you would use gremlin queries to get the data
-            
-            # Return sample data for now
-            return generate_sample_graph_data()
-        else:
-            # If connection fails, use sample data
-            return generate_sample_graph_data()
+        return fetch_graph_data()
             
     except Exception as e:
         st.error(f"Error loading graph data: {str(e)}")
@@ -153,42 +239,17 @@ def load_graph_data():
 
 def generate_sample_graph_data():
     """Generate sample graph data for visualization when Neptune is unavailable."""
-    nodes = []
-    edges = []
-    
-    # Create student nodes
-    for i in range(1, 6):
-        nodes.append({
-            'id': f'S{i:03d}',
-            'label': f'Student {i}',
-            'type': 'Student'
-        })
-    
-    # Create teacher nodes
     teachers = ['Ms. Johnson', 'Mr. Smith', 'Mrs. Williams', 'Ms. Davis']
-    for i, name in enumerate(teachers):
-        nodes.append({
-            'id': f'T{i+1}',
-            'label': name,
-            'type': 'Teacher'
-        })
-    
-    # Create category nodes
     categories = ['Reading', 'Math', 'Behavior', 'Social', 'Motor Skills']
-    for i, name in enumerate(categories):
-        nodes.append({
-            'id': f'C{i+1}',
-            'label': name,
-            'type': 'Category'
-        })
-    
-    # Create feedback nodes
-    for i in range(1, 15):
-        nodes.append({
-            'id': f'F{i:03d}',
-            'label': f'Feedback {i}',
-            'type': 'Feedback'
-        })
+    feedback_ids = [f'F{i:03d}' for i in range(1, 15)]
+    
+    # Create student, teacher, category and feedback nodes
+    nodes = (
+        [{'id': f'S{i:03d}', 'label': f'Student {i}', 'type': 'Student'} for i in range(1, 6)] +
+        [{'id': f'T{i}', 'label': name, 'type': 'Teacher'} for i, name in enumerate(teachers, 1)] +
+        [{'id': f'C{i}', 'label': name, 'type': 'Category'} for i, name in enumerate(categories, 1)] +
+        [{'id': fid, 'label': f'Feedback {i}', 'type': 'Feedback'} for i, fid in enumerate(feedback_ids, 1)]
+    )
     
     # Create edges between students and teachers
     student_teacher_pairs = [
@@ -197,35 +258,25 @@ def generate_sample_graph_data():
         ('S002', 'T3'), ('S004', 'T1')
     ]
     
-    for source, target in student_teacher_pairs:
-        edges.append({
-            'source': source,
-            'target': target,
-            'relation': 'ASSIGNED_TO'
-        })
-    
-    # Create edges between students and feedback
-    for i in range(1, 15):
-        student_id = f'S{((i-1) % 5) + 1:03d}'
-        edges.append({
-            'source': student_id,
-            'target': f'F{i:03d}',
-            'relation': 'SUBMITS'
-        })
-    
-    # Create edges between feedback and categories
-    for i in range(1, 15):
-        category_id = f'C{((i-1) % 5) + 1}'
-        edges.append({
-            'source': f'F{i:03d}',
-            'target': category_id,
-            'relation': 'RELATED_TO'
-        })
+    # Feedback is spread round-robin over students and categories
+    edges = (
+        [{'source': source, 'target': target, 'relation': 'ASSIGNED_TO'}
+         for source, target in student_teacher_pairs] +
+        [{'source': f'S{(i % 5) + 1:03d}', 'target': fid, 'relation': 'SUBMITS'}
+         for i, fid in enumerate(feedback_ids)] +
+        [{'source': fid, 'target': f'C{(i % 5) + 1}', 'relation': 'RELATED_TO'}
+         for i, fid in enumerate(feedback_ids)]
+    )
     
     return {'nodes': nodes, 'edges': edges}
 
+@st.cache_data(max_entries=16, show_spinner=False)
 def create_graph_visualization(graph_data):
-    """Create an interactive graph visualization using PyVis."""
+    """Create an interactive graph visualization using PyVis, cached per graph."""
+    # Imported here so the graph libraries only load once a graph is requested
+    import networkx as nx
+    from pyvis.network import Network
+    
     # Create a network
     net = Network(height="600px", width="100%", bgcolor="#ffffff", font_color="black")
     
@@ -237,13 +288,23 @@ def create_graph_visualization(graph_data):
         'Feedback': '#8E24AA'   # Purple
     }
     
+    # Precompute node positions so the browser doesn't run a physics simulation
+    layout_graph = nx.Graph()
+    layout_graph.add_nodes_from(node['id'] for node in graph_data['nodes'])
+    layout_graph.add_edges_from((edge['source'], edge['target']) for edge in graph_data['edges'])
+    positions = nx.spring_layout(layout_graph, seed=42)
+    
     # Add nodes
     for node in graph_data['nodes']:
+        x, y = positions[node['id']]
         net.add_node(
             node['id'], 
             label=node['label'],
             title=f"Type: {node['type']}", 
-            color=colors.get(node['type'], '#BDBDBD')
+            color=colors.get(node['type'], '#BDBDBD'),
+            x=float(x) * 1000,
+            y=float(y) * 1000,
+            physics=False
         )
     
     # Add edges
@@ -255,37 +316,33 @@ def create_graph_visualization(graph_data):
             arrows='to'
         )
     
-    # Set physics layout
-    net.barnes_hut(spring_length=250, spring_strength=0.001, damping=0.09)
+    # Nodes are already laid out
+    net.toggle_physics(False)
     
-    # Save to a temporary HTML file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.html') as tmpfile:
-        net.save_graph(tmpfile.name)
-        return tmpfile.name
+    # Render the HTML in memory; repeat calls for the same graph hit the cache
+    return net.generate_html()
 
+@st.cache_data(show_spinner=False)
 def generate_sample_insights():
     """Generate sample insights data when DynamoDB is not available."""
-    # Create sample data
-    data = []
-    sentiments = ['positive', 'negative', 'neutral']
-    themes = ['accessibility', 'learning_style', 'participation', 'comprehension', 'communication']
-    
-    for i in range(1, 6):
-        for j in range(10):
-            # Ensure a good distribution of sentiments and themes
-            sentiment = sentiments[j % len(sentiments)]
-            theme = themes[(i + j) % len(themes)]
-            
-            data.append({
-                'insight_id': f'ins-{i}-{j}',
-                'student_id': f'S{i:03d}',
-                'sentiment': sentiment,
-                'theme': theme,
-                'summary': f'Sample insight {j} for student {i}',
-                'created_at': int(datetime.now().timestamp()) - (j * 86400)  # Vary by days
-            })
-    
-    return pd.DataFrame(data)
+    sentiments = np.array(['positive', 'negative', 'neutral'])
+    themes = np.array(['accessibility', 'learning_style', 'participation', 'comprehension', 'communication'])
+    
+    # Ten insights for each of five students, with a good distribution of
+    # sentiments and themes
+    i = np.repeat(np.arange(1, 6), 10)
+    j = np.tile(np.arange(10), 5)
+    i_str = i.astype(str)
+    j_str = j.astype(str)
+    
+    return pd.DataFrame({
+        'insight_id': np.char.add(np.char.add(np.char.add('ins-', i_str), '-'), j_str),
+        'student_id': np.char.add('S', np.char.zfill(i_str, 3)),
+        'sentiment': sentiments[j % len(sentiments)],
+        'theme': themes[(i + j) % len(themes)],
+        'summary': np.char.add(np.char.add(np.char.add('Sample insight ', j_str), ' for student '), i_str),
+        'created_at': int(datetime.now().timestamp()) - j * 86400  # Vary by days
+    })
 
 # Dashboard layout
 st.markdown("<h1 class='main-header'>Special Education Feedback Insights</h1>", unsafe_allow_html=True)
@@ -317,6 +374,9 @@ with tab1:
     with col3:
         refresh_button = st.button("Refresh Data")
     
+    if refresh_button:
+        fetch_dynamo_insights.clear()
+    
     # Load data
     try:
         with st.spinner("Loading sentiment data from DynamoDB..."):
@@ -333,6 +393,12 @@ with tab1:
         st.error(f"Error loading insights: {str(e)}")
         insights_df = generate_sample_insights()
     
+    # Group the low-cardinality columns by category codes instead of strings
+    insights_df = insights_df.astype({
+        column: 'category' for column in ('sentiment', 'theme', 'student_id')
+        if column in insights_df
+    })
+    
     # Display sentiment distribution
     if not insights_df.empty:
         col1, col2 = st.columns(2)
@@ -350,11 +416,7 @@ with tab1:
                 values='Count', 
                 names='Sentiment',
                 color='Sentiment',
-                color_discrete_map={
-                    'positive': '#43A047',  # Green
-                    'negative': '#E53935',  # Red
-                    'neutral': '#FFA726'    # Orange
-                },
+                color_discrete_map=SENTIMENT_COLORS,
                 hole=0.4
             )
             fig.update_layout(legend_title="Sentiment", height=400)
@@ -365,7 +427,13 @@ with tab1:
             st.markdown("<div class='card'><h3>Sentiment by Theme</h3>", unsafe_allow_html=True)
             
             # Group by theme and sentiment
-            theme_sentiment = insights_df.groupby(['theme', 'sentiment']).size().reset_index(name='count')
+            theme_sentiment = (
+                insights_df.value_counts(['theme', 'sentiment'], sort=False)
+                .sort_index()  # Keep the axis order alphabetical
+                .loc[lambda counts: counts > 0]  # Drop unobserved category pairs
+                .rename('count')
+                .reset_index()
+            )
             
             # Create grouped bar chart
             fig = px.bar(
@@ -374,11 +442,7 @@ with tab1:
                 y='count',
                 color='sentiment',
                 barmode='group',
-                color_discrete_map={
-                    'positive': '#43A047',  # Green
-                    'negative': '#E53935',  # Red
-                    'neutral': '#FFA726'    # Orange
-                }
+                color_discrete_map=SENTIMENT_COLORS
             )
             fig.update_layout(
                 xaxis_title="Theme",
@@ -393,7 +457,13 @@ with tab1:
         st.markdown("<div class='card'><h3>Sentiment Distribution by Student</h3>", unsafe_allow_html=True)
         
         # Group by student and sentiment
-        student_sentiment = insights_df.groupby(['student_id', 'sentiment']).size().reset_index(name='count')
+        student_sentiment = (
+            insights_df.value_counts(['student_id', 'sentiment'], sort=False)
+            .sort_index()  # Keep the axis order alphabetical
+            .loc[lambda counts: counts > 0]  # Drop unobserved category pairs
+            .rename('count')
+            .reset_index()
+        )
         
         # Create stacked bar chart
         fig = px.bar(
@@ -402,11 +472,7 @@ with tab1:
             y='count',
             color='sentiment',
             barmode='stack',
-            color_discrete_map={
-                'positive': '#43A047',  # Green
-                'negative': '#E53935',  # Red
-                'neutral': '#FFA726'    # Orange
-            }
+            color_discrete_map=SENTIMENT_COLORS
         )
         fig.update_layout(
             xaxis_title="Student ID",
@@ -516,26 +582,20 @@ with tab2:
                 st.markdown(f"<div class='card'><h3>Search Results</h3>", unsafe_allow_html=True)
                 st.markdown(f"Found {len(results)} results for: <span class='highlight'>{search_query}</span>", unsafe_allow_html=True)
                 
-                for i, result in enumerate(results):
-                    score_percentage = int(result.get('score', 0) * 100)
-                    
-                    st.markdown(
-                        f"""
-                        <div style="margin-bottom: 1rem; padding: 1rem; border-radius: 0.5rem; background-color: rgba(30, 136, 229, {result.get('score', 0) * 0.3 + 0.1});">
-                            <div style="display: flex; justify-content: space-between;">
-                                <span style="font-weight: bold;">Result {i+1}</span>
-                                <span style="background-color: #E3F2FD; padding: 0.1rem 0.5rem; border-radius: 1rem;">{score_percentage}% match</span>
-                            </div>
-                            <div style="margin: 0.5rem 0; font-size: 1.1rem;">{result.get('text', 'No text available')}</div>
-                            <div style="color: #455A64; font-size: 0.9rem;">
-                                ID: {result.get('feedback_id', 'Unknown')} | 
-                                Student: {result.get('metadata', {}).get('student_id', 'Unknown')} | 
-                                Category: {result.get('metadata', {}).get('category', 'Unknown')}
-                            </div>
-                        </div>
-                        """, 
-                        unsafe_allow_html=True
+                # Render every card in one markdown element
+                cards_html = "\n".join(
+                    SEARCH_RESULT_CARD.format(
+                        number=i + 1,
+                        alpha=result.get('score', 0) * 0.3 + 0.1,
+                        score_percentage=int(result.get('score', 0) * 100),
+                        text=result.get('text', 'No text available'),
+                        feedback_id=result.get('feedback_id', 'Unknown'),
+                        student_id=result.get('metadata', {}).get('student_id', 'Unknown'),
+                        category=result.get('metadata', {}).get('category', 'Unknown')
                     )
+                    for i, result in enumerate(results)
+                )
+                st.markdown(cards_html, unsafe_allow_html=True)
                 
                 st.markdown("</div>", unsafe_allow_html=True)
                 
@@ -569,13 +629,14 @@ with tab3:
             
             if graph_data:
                 # Create visualization
-                html_file = create_graph_visualization(graph_data)
+                graph_html = create_graph_visualization(graph_data)
                 
                 # Display summary metrics
-                student_count = sum(1 for node in graph_data['nodes'] if node['type'] == 'Student')
-                teacher_count = sum(1 for node in graph_data['nodes'] if node['type'] == 'Teacher')
-                category_count = sum(1 for node in graph_data['nodes'] if node['type'] == 'Category')
-                feedback_count = sum(1 for node in graph_data['nodes'] if node['type'] == 'Feedback')
+                type_counts = Counter(node['type'] for node in graph_data['nodes'])
+                student_count = type_counts['Student']
+                teacher_count = type_counts['Teacher']
+                category_count = type_counts['Category']
+                feedback_count = type_counts['Feedback']
                 
                 # Display metrics
                 col1, col2, col3, col4 = st.columns(4)
@@ -590,66 +651,48 @@ with tab3:
                 
                 # Display the graph visualization
                 st.markdown("<div class='card'>", unsafe_allow_html=True)
-                st.components.v1.html(open(html_file, 'r').read(), height=600)
+                st.components.v1.html(graph_html, height=600)
                 st.markdown("</div>", unsafe_allow_html=True)
                 
                 # Display network statistics
                 st.markdown("<div class='card'><h3>Network Statistics</h3>", unsafe_allow_html=True)
                 
-                # Create a NetworkX graph for analysis
-                G = nx.DiGraph()
-                
-                # Add nodes
-                for node in graph_data['nodes']:
-                    G.add_node(node['id'], label=node['label'], type=node['type'])
+                # Degree statistics only need the edge list, not a NetworkX graph
+                nodes_by_id = {node['id']: node for node in graph_data['nodes']}
+                edge_pairs = {(edge['source'], edge['target']) for edge in graph_data['edges']}
+                degrees = Counter()
+                for source, target in edge_pairs:
+                    degrees[source] += 1
+                    degrees[target] += 1
                 
-                # Add edges
-                for edge in graph_data['edges']:
-                    G.add_edge(edge['source'], edge['target'], relation=edge['relation'])
+                degrees_by_type = defaultdict(list)
+                for node_id, node in nodes_by_id.items():
+                    degrees_by_type[node['type']].append((node_id, degrees[node_id]))
                 
                 # Calculate statistics
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.metric("Total Nodes", len(G.nodes))
-                    st.metric("Total Connections", len(G.edges))
+                    st.metric("Total Nodes", len(nodes_by_id))
+                    st.metric("Total Connections", len(edge_pairs))
                     
                     # Calculate average degree
-                    total_degree = sum(dict(G.degree()).values())
-                    avg_degree = total_degree / len(G.nodes) if len(G.nodes) > 0 else 0
+                    total_degree = sum(degrees.values())
+                    avg_degree = total_degree / len(nodes_by_id) if nodes_by_id else 0
                     st.metric("Average Connections per Node", f"{avg_degree:.2f}")
                 
                 with col2:
-                    # Find most connected student
-                    student_degrees = {node: deg for node, deg in G.degree() 
-                                     if G.nodes[node]['type'] == 'Student'}
-                    if student_degrees:
-                        most_connected_student = max(student_degrees.items(), key=lambda x: x[1])
-                        st.metric("Most Connected Student", 
-                                 f"{G.nodes[most_connected_student[0]]['label']} ({most_connected_student[1]} connections)")
-                    
-                    # Find most connected teacher
-                    teacher_degrees = {node: deg for node, deg in G.degree() 
-                                     if G.nodes[node]['type'] == 'Teacher'}
-                    if teacher_degrees:
-                        most_connected_teacher = max(teacher_degrees.items(), key=lambda x: x[1])
-                        st.metric("Most Connected Teacher", 
-                                 f"{G.nodes[most_connected_teacher[0]]['label']} ({most_connected_teacher[1]} connections)")
-                    
-                    # Find most common category
-                    category_degrees = {node: deg for node, deg in G.degree() 
-                                      if G.nodes[node]['type'] == 'Category'}
-                    if category_degrees:
-                        most_common_category = max(category_degrees.items(), key=lambda x: x[1])
-                        st.metric("Most Common Category", 
-                                 f"{G.nodes[most_common_category[0]]['label']} ({most_common_category[1]} connections)")
+                    # Find the most connected student, teacher and category
+                    for node_type, metric_label in [
+                        ('Student', "Most Connected Student"),
+                        ('Teacher', "Most Connected Teacher"),
+                        ('Category', "Most Common Category")
+                    ]:
+                        if degrees_by_type[node_type]:
+                            node_id, degree = max(degrees_by_type[node_type], key=itemgetter(1))
+                            st.metric(metric_label, 
+                                     f"{nodes_by_id[node_id]['label']} ({degree} connections)")
                 
                 st.markdown("</div>", unsafe_allow_html=True)
-                
-                # Cleanup the temporary file
-                try:
-                    Path(html_file).unlink()
-                except:
-                    pass
             else:
                 st.error("Failed to load graph data.")
 
@@ -1,14 +1,69 @@
 import os
+import threading
+from functools import cached_property
 import boto3
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from cachetools import TTLCache
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from typing import Dict, List, Any, Optional
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Shared botocore settings: a pool large enough for concurrent callers so
+# connections are reused, short timeouts, and adaptive retries that back off
+# client-side when DynamoDB throttles
+DYNAMODB_CONFIG = Config(
+    max_pool_connections=50,
+    connect_timeout=5,
+    read_timeout=10,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+# get_item results are cached per table for a short time; a put_item to a
+# table drops that table's cache
+ITEM_CACHE_SIZE = 10_000
+ITEM_CACHE_TTL = 60
+
+# One session and one client per (region, endpoint) for the whole process, so
+# the service model is loaded once and pooled connections are reused across
+# instances and warm invocations
+_SESSION = boto3.session.Session()
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+def get_dynamodb_client(region: str, endpoint_url: Optional[str] = None):
+    """
+    Get the shared low-level DynamoDB client for a region and endpoint.
+    
+    Args:
+        region: AWS region
+        endpoint_url: Custom endpoint URL (for local DynamoDB)
+        
+    Returns:
+        boto3 DynamoDB client
+    """
+    key = (region, endpoint_url)
+    # Sessions aren't thread-safe, so clients are created under the lock
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            kwargs = {'region_name': region, 'config': DYNAMODB_CONFIG}
+            if endpoint_url:
+                kwargs['endpoint_url'] = endpoint_url
+            client = _CLIENTS[key] = _SESSION.client('dynamodb', **kwargs)
+        return client
+
 class DynamoDBClient:
     """Client for interacting with Amazon DynamoDB."""
     
+    # Shared converters between Python values and the DynamoDB wire format
+    # used by the low-level client
+    _serializer = TypeSerializer()
+    _deserializer = TypeDeserializer()
+    
     def __init__(self, region: str = None, endpoint_url: str = None):
         """
         Initialize the DynamoDB client.
@@ -19,24 +74,36 @@ class DynamoDBClient:
         """
         self.region = region or os.environ.get('DYNAMODB_REGION', 'us-east-1')
         self.endpoint_url = endpoint_url or os.environ.get('DYNAMODB_ENDPOINT')
-        self.client = None
-        self.resource = None
+        self._item_caches = {}
+        self._item_cache_lock = threading.Lock()
+    
+    def _session_kwargs(self) -> Dict[str, Any]:
+        """Build the keyword arguments for the boto3 resource."""
+        kwargs = {'region_name': self.region, 'config': DYNAMODB_CONFIG}
+        if self.endpoint_url:
+            kwargs['endpoint_url'] = self.endpoint_url
+        return kwargs
+    
+    @cached_property
+    def client(self):
+        """Low-level DynamoDB client, created on first access."""
+        client = get_dynamodb_client(self.region, self.endpoint_url)
+        logger.info("Connected to DynamoDB in %s", self.region)
+        return client
+    
+    @cached_property
+    def resource(self):
+        """DynamoDB service resource, created on first access."""
+        return boto3.resource('dynamodb', **self._session_kwargs())
         
     def connect(self):
         """Establish connection to DynamoDB."""
         try:
-            kwargs = {'region_name': self.region}
-            if self.endpoint_url:
-                kwargs['endpoint_url'] = self.endpoint_url
-                
-            self.client = boto3.client('dynamodb', **kwargs)
-            self.resource = boto3.resource('dynamodb', **kwargs)
-            
-            logger.info(f"Connected to DynamoDB in {self.region}")
+            self.client
             return True
             
         except Exception as e:
-            logger.error(f"Failed to connect to DynamoDB: {str(e)}")
+            logger.error("Failed to connect to DynamoDB: %s", e)
             return False
     
     def create_table(self, 
@@ -56,9 +123,6 @@ class DynamoDBClient:
         Returns:
             bool: Success status
         """
-        if not self.client:
-            self.connect()
-            
         # Default provisioned throughput if not provided
         if provisioned_throughput is None:
             provisioned_throughput = {
@@ -67,26 +131,26 @@ class DynamoDBClient:
             }
             
         try:
-            response = self.client.create_table(
+            self.client.create_table(
                 TableName=table_name,
                 KeySchema=key_schema,
                 AttributeDefinitions=attribute_definitions,
                 ProvisionedThroughput=provisioned_throughput
             )
             
-            logger.info(f"Created DynamoDB table: {table_name}")
+            logger.info("Created DynamoDB table: %s", table_name)
             return True
             
         except ClientError as e:
             if e.response['Error']['Code'] == 'ResourceInUseException':
-                logger.info(f"Table {table_name} already exists")
+                logger.info("Table %s already exists", table_name)
                 return True
             else:
-                logger.error(f"Error creating table {table_name}: {str(e)}")
+                logger.error("Error creating table %s: %s", table_name, e)
                 return False
                 
         except Exception as e:
-            logger.error(f"Error creating table {table_name}: {str(e)}")
+            logger.error("Error creating table %s: %s", table_name, e)
             return False
     
     def put_item(self, table_name: str, item: Dict[str, Any]) -> bool:
@@ -100,18 +164,21 @@ class DynamoDBClient:
         Returns:
             bool: Success status
         """
-        if not self.resource:
-            self.connect()
-            
         try:
-            table = self.resource.Table(table_name)
-            response = table.put_item(Item=item)
+            self.client.put_item(
+                TableName=table_name,
+                Item={k: self._serializer.serialize(v) for k, v in item.items()}
+            )
             
-            logger.info(f"Added item to {table_name}")
+            # The write may replace a cached item
+            with self._item_cache_lock:
+                self._item_caches.pop(table_name, None)
+            
+            logger.info("Added item to %s", table_name)
             return True
             
         except Exception as e:
-            logger.error(f"Error adding item to {table_name}: {str(e)}")
+            logger.error("Error adding item to %s: %s", table_name, e)
             return False
     
     def get_item(self, 
@@ -127,21 +194,33 @@ class DynamoDBClient:
         Returns:
             Optional[Dict[str, Any]]: The item if found, None otherwise
         """
-        if not self.resource:
-            self.connect()
-            
+        cache_key = frozenset(key.items())
+        with self._item_cache_lock:
+            item_cache = self._item_caches.get(table_name)
+            cached = item_cache.get(cache_key) if item_cache is not None else None
+        if cached is not None:
+            return cached
+        
         try:
-            table = self.resource.Table(table_name)
-            response = table.get_item(Key=key)
+            response = self.client.get_item(
+                TableName=table_name,
+                Key={k: self._serializer.serialize(v) for k, v in key.items()}
+            )
             
             if 'Item' in response:
-                return response['Item']
+                item = {k: self._deserializer.deserialize(v) for k, v in response['Item'].items()}
+                with self._item_cache_lock:
+                    item_cache = self._item_caches.setdefault(
+                        table_name, TTLCache(maxsize=ITEM_CACHE_SIZE, ttl=ITEM_CACHE_TTL)
+                    )
+                    item_cache[cache_key] = item
+                return item
             else:
-                logger.info(f"No item found in {table_name} with key {key}")
+                logger.info("No item found in %s with key %s", table_name, key)
                 return None
                 
         except Exception as e:
-            logger.error(f"Error getting item from {table_name}: {str(e)}")
+            logger.error("Error getting item from %s: %s", table_name, e)
             return None
     
     def query(self, 
@@ -154,33 +233,46 @@ class DynamoDBClient:
         
         Args:
             table_name: Name of the table
-            key_condition_expression: Key condition expression
+            key_condition_expression: Key condition expression, either a string
+                or a boto3 Key condition
             expression_attribute_values: Expression attribute values
             index_name: Optional index name to query
             
         Returns:
             List[Dict[str, Any]]: Query results
         """
-        if not self.resource:
-            self.connect()
-            
         try:
-            table = self.resource.Table(table_name)
+            kwargs = {'TableName': table_name}
+            attribute_values = dict(expression_attribute_values or {})
             
-            kwargs = {
-                'KeyConditionExpression': key_condition_expression,
-                'ExpressionAttributeValues': expression_attribute_values
-            }
+            # The low-level client only takes expression strings
+            if isinstance(key_condition_expression, ConditionBase):
+                expression = ConditionExpressionBuilder().build_expression(
+                    key_condition_expression, is_key_condition=True
+                )
+                kwargs['KeyConditionExpression'] = expression.condition_expression
+                kwargs['ExpressionAttributeNames'] = expression.attribute_name_placeholders
+                attribute_values.update(expression.attribute_value_placeholders)
+            else:
+                kwargs['KeyConditionExpression'] = key_condition_expression
+            
+            if attribute_values:
+                kwargs['ExpressionAttributeValues'] = {
+                    k: self._serializer.serialize(v) for k, v in attribute_values.items()
+                }
             
             if index_name:
                 kwargs['IndexName'] = index_name
                 
-            response = table.query(**kwargs)
+            response = self.client.query(**kwargs)
             
-            items = response.get('Items', [])
-            logger.info(f"Query returned {len(items)} items from {table_name}")
+            items = [
+                {k: self._deserializer.deserialize(v) for k, v in item.items()}
+                for item in response.get('Items', [])
+            ]
+            logger.info("Query returned %d items from %s", len(items), table_name)
             return items
             
         except Exception as e:
-            logger.error(f"Error querying {table_name}: {str(e)}")
+            logger.error("Error querying %s: %s", table_name, e)
             return []
@@ -5,28 +5,95 @@ This module handles inserting and retrieving insight records
 generated from processed feedback in DynamoDB.
 """
 import os
+import random
+import threading
 import uuid
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
-import boto3
-from boto3.dynamodb.conditions import Key, Attr
+from typing import Dict, Iterator, List, Any, Optional, Union
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from cachetools import TTLCache
 from botocore.exceptions import ClientError
+from dynamo.client import get_dynamodb_client
 from utils.logger import get_logger
 
+try:
+    import amazondax
+except ImportError:  # amazondax is optional; reads go straight to DynamoDB
+    amazondax = None
+
 logger = get_logger(__name__)
 
+# Every insight shares this entity_type so the created_at index can serve
+# time-window reads with a single Query partition
+INSIGHT_ENTITY_TYPE = "insight"
+RECENT_INSIGHTS_INDEX = "entity_type-created_at-index"
+
+# Fields every insight passed to batch_insert_insights must provide
+REQUIRED_INSIGHT_FIELDS = frozenset({'student_id', 'theme', 'sentiment', 'summary'})
+
+# Per-student query results are reused for a short time; writes for a
+# student drop that student's entry immediately
+STUDENT_CACHE_SIZE = 1024
+STUDENT_CACHE_TTL = 15
+
+# Maximum number of 25-item batch writes in flight at once
+BATCH_WRITE_WORKERS = 16
+
+# Maximum number of per-student queries in flight at once
+STUDENT_QUERY_WORKERS = 32
+
+# Retries for items a batch write leaves unprocessed, with backoff in seconds
+BATCH_WRITE_MAX_RETRIES = 5
+BATCH_WRITE_BACKOFF_BASE = 0.05
+BATCH_WRITE_BACKOFF_JITTER = 0.05
+
+# Poll a newly created table every 2 seconds, for up to a minute
+TABLE_WAITER_CONFIG = {'Delay': 2, 'MaxAttempts': 30}
+
+# Tables already confirmed to exist in this process, keyed by
+# (endpoint_url, region, table_name), so later managers skip describe_table
+_TABLE_READY = set()
+
+def _build_insight_item(
+    insight_id: str,
+    student_id: str,
+    theme: str,
+    sentiment: str,
+    summary: str,
+    created_at: int,
+    created_date: str
+) -> Dict[str, Dict[str, str]]:
+    """Build an insight's core attributes directly in the DynamoDB wire format."""
+    return {
+        'insight_id': {'S': insight_id},
+        'student_id': {'S': student_id},
+        'theme': {'S': theme},
+        'sentiment': {'S': sentiment},
+        'summary': {'S': summary},
+        'created_at': {'N': str(created_at)},
+        'created_date': {'S': created_date},
+        'entity_type': {'S': INSIGHT_ENTITY_TYPE}
+    }
+
 class InsightsManager:
     """
     Manages insight records in DynamoDB for the special education feedback system.
     """
     
+    # Shared converters between Python values and the DynamoDB wire format
+    # used by the low-level client
+    _serializer = TypeSerializer()
+    _deserializer = TypeDeserializer()
+    
     def __init__(
         self,
         table_name: str = "sped_insights",
         region: Optional[str] = None,
-        endpoint_url: Optional[str] = None
+        endpoint_url: Optional[str] = None,
+        dax_endpoint: Optional[str] = None
     ):
         """
         Initialize the insights manager.
@@ -35,47 +102,69 @@ class InsightsManager:
             table_name: Name of the DynamoDB table for insights
             region: AWS region (defaults to environment variable)
             endpoint_url: Custom endpoint URL for DynamoDB (for local testing)
+            dax_endpoint: DAX cluster endpoint to serve reads from (defaults to
+                environment variable; requires amazondax)
         """
         self.table_name = table_name
         self.region = region or os.environ.get("AWS_REGION", "us-east-1")
         self.endpoint_url = endpoint_url or os.environ.get("DYNAMODB_ENDPOINT")
+        self.dax_endpoint = dax_endpoint or os.environ.get("DAX_ENDPOINT")
+        
+        # Cached get_insights_by_student results, keyed by student_id and then
+        # by (limit, start_date, attributes)
+        self._student_cache = TTLCache(maxsize=STUDENT_CACHE_SIZE, ttl=STUDENT_CACHE_TTL)
+        self._student_cache_lock = threading.Lock()
         
-        # Initialize the DynamoDB resource
+        # Initialize the DynamoDB client
         self._init_dynamodb()
         
     def _init_dynamodb(self):
-        """Initialize the DynamoDB resource and ensure table exists."""
+        """Initialize the DynamoDB client and ensure table exists."""
         try:
-            # Create DynamoDB resource
-            kwargs = {'region_name': self.region}
-            if self.endpoint_url:
-                kwargs['endpoint_url'] = self.endpoint_url
-                
-            self.dynamodb = boto3.resource('dynamodb', **kwargs)
+            # Shared DynamoDB client; it is thread-safe, unlike boto3 resources
+            self.client = get_dynamodb_client(self.region, self.endpoint_url)
+            
+            # Queries and scans go through DAX when a cluster is configured;
+            # writes and table management always use DynamoDB directly
+            self.read_client = self.client
+            if self.dax_endpoint:
+                if amazondax is None:
+                    logger.warning("DAX_ENDPOINT is set but amazondax is not installed; reading from DynamoDB")
+                else:
+                    self.read_client = amazondax.AmazonDaxClient(
+                        endpoint_url=self.dax_endpoint,
+                        region_name=self.region
+                    )
+                    logger.info("Reading insights through DAX at %s", self.dax_endpoint)
+            
+            table_key = (self.endpoint_url, self.region, self.table_name)
+            if table_key in _TABLE_READY:
+                return
             
             # Try to get the table
             try:
-                self.table = self.dynamodb.Table(self.table_name)
-                # Check if table exists by accessing its creation date
-                self.table.creation_date_time
-                logger.info(f"Connected to DynamoDB table: {self.table_name}")
+                # Check if table exists by describing it
+                self.client.describe_table(TableName=self.table_name)
+                logger.info("Connected to DynamoDB table: %s", self.table_name)
             except ClientError as e:
                 if e.response['Error']['Code'] == 'ResourceNotFoundException':
-                    logger.info(f"Table {self.table_name} does not exist, creating it")
+                    logger.info("Table %s does not exist, creating it", self.table_name)
                     self._create_insights_table()
                 else:
-                    logger.error(f"Error checking table: {str(e)}")
+                    logger.error("Error checking table: %s", e)
                     raise
+            
+            _TABLE_READY.add(table_key)
                     
         except Exception as e:
-            logger.error(f"Error initializing DynamoDB: {str(e)}")
+            logger.error("Error initializing DynamoDB: %s", e)
             raise
     
     def _create_insights_table(self):
         """Create the insights table if it doesn't exist."""
         try:
             # Create the insights table
-            self.table = self.dynamodb.create_table(
+            self.client.create_table(
                 TableName=self.table_name,
                 KeySchema=[
                     {'AttributeName': 'insight_id', 'KeyType': 'HASH'},  # Partition key
@@ -84,6 +173,7 @@ class InsightsManager:
                     {'AttributeName': 'insight_id', 'AttributeType': 'S'},
                     {'AttributeName': 'student_id', 'AttributeType': 'S'},
                     {'AttributeName': 'created_at', 'AttributeType': 'N'},
+                    {'AttributeName': 'entity_type', 'AttributeType': 'S'},
                 ],
                 GlobalSecondaryIndexes=[
                     {
@@ -100,6 +190,20 @@ class InsightsManager:
                             'WriteCapacityUnits': 5
                         }
                     },
+                    {
+                        'IndexName': RECENT_INSIGHTS_INDEX,
+                        'KeySchema': [
+                            {'AttributeName': 'entity_type', 'KeyType': 'HASH'},
+                            {'AttributeName': 'created_at', 'KeyType': 'RANGE'},
+                        ],
+                        'Projection': {
+                            'ProjectionType': 'ALL'
+                        },
+                        'ProvisionedThroughput': {
+                            'ReadCapacityUnits': 5,
+                            'WriteCapacityUnits': 5
+                        }
+                    },
                 ],
                 ProvisionedThroughput={
                     'ReadCapacityUnits': 5,
@@ -108,16 +212,25 @@ class InsightsManager:
             )
             
             # Wait for table to be created
-            self.table.meta.client.get_waiter('table_exists').wait(
-                TableName=self.table_name
+            self.client.get_waiter('table_exists').wait(
+                TableName=self.table_name,
+                WaiterConfig=TABLE_WAITER_CONFIG
             )
             
-            logger.info(f"Created DynamoDB table: {self.table_name}")
+            logger.info("Created DynamoDB table: %s", self.table_name)
             
         except Exception as e:
-            logger.error(f"Error creating table: {str(e)}")
+            logger.error("Error creating table: %s", e)
             raise
     
+    def _serialize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an item of Python values to the DynamoDB wire format."""
+        return {key: self._serializer.serialize(value) for key, value in item.items()}
+    
+    def _deserialize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an item in the DynamoDB wire format to Python values."""
+        return {key: self._deserializer.deserialize(value) for key, value in item.items()}
+    
     def insert_insight(
         self, 
         student_id: str,
@@ -143,28 +256,26 @@ class InsightsManager:
             # Generate a unique insight ID
             insight_id = str(uuid.uuid4())
             
-            # Get current timestamp
-            current_time = int(time.time())
-            
-            # Prepare the item to insert
-            item = {
-                'insight_id': insight_id,
-                'student_id': student_id,
-                'theme': theme,
-                'sentiment': sentiment,
-                'summary': summary,
-                'created_at': current_time,
-                'created_date': datetime.utcnow().isoformat()
-            }
+            # The core fields have fixed types, so they skip the generic serializer
+            item = _build_insight_item(
+                insight_id,
+                student_id,
+                theme,
+                sentiment,
+                summary,
+                int(time.time()),
+                datetime.utcnow().isoformat()
+            )
             
             # Add any additional data
             if additional_data:
-                item.update(additional_data)
+                item.update(self._serialize_item(additional_data))
             
             # Insert the item into DynamoDB
-            self.table.put_item(Item=item)
+            self.client.put_item(TableName=self.table_name, Item=item)
+            self._invalidate_students([student_id])
             
-            logger.info(f"Inserted insight record with ID: {insight_id}")
+            logger.info("Inserted insight record with ID: %s", insight_id)
             
             return {
                 'status': 'success',
@@ -172,7 +283,7 @@ class InsightsManager:
             }
             
         except Exception as e:
-            logger.error(f"Error inserting insight: {str(e)}")
+            logger.error("Error inserting insight: %s", e)
             return {
                 'status': 'error',
                 'message': str(e)
@@ -207,6 +318,11 @@ class InsightsManager:
             
             success_count = 0
             failed_items = []
+            batches = []
+            
+            # All items in one call share a timestamp
+            current_time = int(time.time())
+            created_date = datetime.utcnow().isoformat()
             
             # DynamoDB can only process 25 items in a single batch write
             # Split the insights into chunks of 25
@@ -218,68 +334,47 @@ class InsightsManager:
                 batch_items = []
                 for insight in chunk:
                     # Validate required fields
-                    if not all(k in insight for k in ['student_id', 'theme', 'sentiment', 'summary']):
+                    if not REQUIRED_INSIGHT_FIELDS.issubset(insight):
                         failed_items.append({
                             'item': insight,
                             'error': 'Missing required fields'
                         })
                         continue
                     
-                    # Generate a unique insight ID
-                    insight_id = str(uuid.uuid4())
-                    
-                    # Get current timestamp
-                    current_time = int(time.time())
-                    
                     # Prepare the item to insert
                     item = {
-                        'insight_id': insight_id,
+                        'insight_id': str(uuid.uuid4()),
                         'student_id': insight['student_id'],
                         'theme': insight['theme'],
                         'sentiment': insight['sentiment'],
                         'summary': insight['summary'],
                         'created_at': current_time,
-                        'created_date': datetime.utcnow().isoformat()
+                        'created_date': created_date,
+                        'entity_type': INSIGHT_ENTITY_TYPE
                     }
                     
                     # Add any additional data
-                    for k, v in insight.items():
-                        if k not in ['student_id', 'theme', 'sentiment', 'summary']:
-                            item[k] = v
+                    item.update((k, insight[k]) for k in insight.keys() - REQUIRED_INSIGHT_FIELDS)
                     
                     batch_items.append({
                         'PutRequest': {
-                            'Item': item
+                            'Item': self._serialize_item(item)
                         }
                     })
                 
-                # Execute the batch write
                 if batch_items:
-                    try:
-                        response = self.dynamodb.batch_write_item(
-                            RequestItems={
-                                self.table_name: batch_items
-                            }
-                        )
-                        
-                        # Check for unprocessed items
-                        unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
-                        if unprocessed:
-                            for item in unprocessed:
-                                failed_items.append({
-                                    'item': item['PutRequest']['Item'],
-                                    'error': 'Unprocessed in batch write'
-                                })
-                        
-                        success_count += (len(batch_items) - len(unprocessed))
-                        
-                    except Exception as e:
-                        logger.error(f"Error in batch write: {str(e)}")
-                        for item in batch_items:
-                            failed_items.append({
-                                'item': item['PutRequest']['Item'],
-                                'error': str(e)
-                            })
+                    batches.append(batch_items)
+            
+            # Execute the batch writes concurrently; each one is a network round-trip
+            if batches:
+                with ThreadPoolExecutor(max_workers=min(BATCH_WRITE_WORKERS, len(batches))) as executor:
+                    futures = [executor.submit(self._write_insight_batch, batch_items) for batch_items in batches]
+                    for future in as_completed(futures):
+                        batch_success_count, batch_failed_items = future.result()
+                        success_count += batch_success_count
+                        failed_items.extend(batch_failed_items)
+            
+            self._invalidate_students({insight['student_id'] for insight in insights if 'student_id' in insight})
             
             return {
                 'status': 'success',
@@ -289,17 +384,69 @@ class InsightsManager:
             }
             
         except Exception as e:
-            logger.error(f"Error in batch insert: {str(e)}")
+            logger.error("Error in batch insert: %s", e)
             return {
                 'status': 'error',
                 'message': str(e)
             }
     
+    def _write_insight_batch(self, batch_items: List[Dict[str, Any]]):
+        """
+        Write up to 25 insight put requests with a single batch_write_item call.
+        
+        Args:
+            batch_items: PutRequest entries for the insights table
+            
+        Returns:
+            Tuple of the number of written items and the failed items
+        """
+        failed_items = []
+        try:
+            response = self.client.batch_write_item(
+                RequestItems={
+                    self.table_name: batch_items
+                }
+            )
+            
+            # DynamoDB routinely returns unprocessed items under load; retry
+            # them with jittered exponential backoff before giving up
+            unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            for attempt in range(BATCH_WRITE_MAX_RETRIES):
+                if not unprocessed:
+                    break
+                time.sleep(BATCH_WRITE_BACKOFF_BASE * 2 ** attempt + random.random() * BATCH_WRITE_BACKOFF_JITTER)
+                response = self.client.batch_write_item(
+                    RequestItems={
+                        self.table_name: unprocessed
+                    }
+                )
+                unprocessed = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            
+            # Check for unprocessed items
+            if unprocessed:
+                for item in unprocessed:
+                    failed_items.append({
+                        'item': self._deserialize_item(item['PutRequest']['Item']),
+                        'error': 'Unprocessed in batch write'
+                    })
+            
+            return len(batch_items) - len(unprocessed), failed_items
+            
+        except Exception as e:
+            logger.error("Error in batch write: %s", e)
+            for item in batch_items:
+                failed_items.append({
+                    'item': self._deserialize_item(item['PutRequest']['Item']),
+                    'error': str(e)
+                })
+            return 0, failed_items
+    
     def get_insights_by_student(
         self,
         student_id: str,
         limit: int = 50,
-        start_date: Optional[int] = None
+        start_date: Optional[int] = None,
+        attributes: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Get insights for a specific student.
@@ -308,27 +455,293 @@ class InsightsManager:
             student_id: ID of the student
             limit: Maximum number of insights to return
             start_date: Optional timestamp to start from
+            attributes: Attributes to return for each insight (defaults to all)
             
         Returns:
             Dict with status and insights
         """
+        cache_key = (limit, start_date, tuple(attributes) if attributes else None)
+        with self._student_cache_lock:
+            cached = self._student_cache.get(student_id, {}).get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             # Build query parameters
             query_params = {
+                'TableName': self.table_name,
                 'IndexName': 'student_id-created_at-index',
-                'KeyConditionExpression': Key('student_id').eq(student_id),
+                'KeyConditionExpression': 'student_id = :student_id',
+                'ExpressionAttributeValues': {
+                    ':student_id': self._serializer.serialize(student_id)
+                },
                 'Limit': limit,
-                'ScanIndexForward': False  # Sort in descending order (newest first)
+                'ScanIndexForward': False,  # Sort in descending order (newest first)
+                **self._projection_params(attributes)
             }
             
             if start_date:
-                query_params['KeyConditionExpression'] = Key('student_id').eq(student_id) & \
-                                                       Key('created_at').gt(start_date)
+                query_params['KeyConditionExpression'] += ' AND created_at > :start_date'
+                query_params['ExpressionAttributeValues'][':start_date'] = self._serializer.serialize(start_date)
             
             # Execute the query
-            response = self.table.query(**query_params)
+            response = self.read_client.query(**query_params)
+            
+            insights = [self._deserialize_item(item) for item in response.get('Items', [])]
+            
+            result = {
+                'status': 'success',
+                'count': len(insights),
+                'insights': insights
+            }
+            
+            with self._student_cache_lock:
+                student_results = self._student_cache.get(student_id)
+                if student_results is None:
+                    student_results = self._student_cache[student_id] = {}
+                student_results[cache_key] = result
+            
+            return result
+            
+        except Exception as e:
+            logger.error("Error getting insights for student %s: %s", student_id, e)
+            return {
+                'status': 'error',
+                'message': str(e)
+            }
+
+    def iter_insights_by_student(
+        self,
+        student_id: str,
+        start_date: Optional[int] = None,
+        attributes: Optional[List[str]] = None,
+        page_size: int = 50
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all insights for a student, newest first.
+        
+        Pages are fetched as the caller consumes items, so stopping early
+        skips the remaining requests. Errors are raised, not returned.
+        
+        Args:
+            student_id: ID of the student
+            start_date: Optional timestamp to start from
+            attributes: Attributes to return for each insight (defaults to all)
+            page_size: Number of insights to fetch per request
+            
+        Yields:
+            Insight records
+        """
+        query_params = {
+            'TableName': self.table_name,
+            'IndexName': 'student_id-created_at-index',
+            'KeyConditionExpression': 'student_id = :student_id',
+            'ExpressionAttributeValues': {
+                ':student_id': self._serializer.serialize(student_id)
+            },
+            'Limit': page_size,
+            'ScanIndexForward': False,  # Sort in descending order (newest first)
+            **self._projection_params(attributes)
+        }
+        
+        if start_date:
+            query_params['KeyConditionExpression'] += ' AND created_at > :start_date'
+            query_params['ExpressionAttributeValues'][':start_date'] = self._serializer.serialize(start_date)
+        
+        while True:
+            response = self.read_client.query(**query_params)
+            for item in response.get('Items', []):
+                yield self._deserialize_item(item)
+            
+            if 'LastEvaluatedKey' not in response:
+                return
+            query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def get_insights_for_students(
+        self,
+        student_ids: List[str],
+        limit: int = 50,
+        start_date: Optional[int] = None,
+        attributes: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get insights for several students at once.
+        
+        The per-student queries run concurrently, since each one is a
+        network round-trip.
+        
+        Args:
+            student_ids: IDs of the students
+            limit: Maximum number of insights to return per student
+            start_date: Optional timestamp to start from
+            attributes: Attributes to return for each insight (defaults to all)
+            
+        Returns:
+            Dict mapping each student ID to its get_insights_by_student result
+        """
+        student_ids = list(dict.fromkeys(student_ids))
+        if not student_ids:
+            return {}
+        
+        def query_student(student_id):
+            return self.get_insights_by_student(
+                student_id,
+                limit=limit,
+                start_date=start_date,
+                attributes=attributes
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(STUDENT_QUERY_WORKERS, len(student_ids))) as executor:
+            return dict(zip(student_ids, executor.map(query_student, student_ids)))
+
+    def _invalidate_students(self, student_ids):
+        """Drop cached get_insights_by_student results for the given students."""
+        with self._student_cache_lock:
+            for student_id in student_ids:
+                self._student_cache.pop(student_id, None)
+    
+    @staticmethod
+    def _projection_params(attributes: Optional[List[str]]) -> Dict[str, Any]:
+        """Build ProjectionExpression parameters that return only the given attributes."""
+        if not attributes:
+            return {}
+        
+        # Placeholders sidestep DynamoDB reserved words in attribute names
+        names = {f"#p{i}": attribute for i, attribute in enumerate(attributes)}
+        return {
+            'ProjectionExpression': ", ".join(names),
+            'ExpressionAttributeNames': names
+        }
+    
+    def get_recent_insights(
+        self,
+        start_time: int,
+        limit: int = 500,
+        attributes: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the newest insights created after a given time.
+        
+        Args:
+            start_time: Unix timestamp; only insights created after it are returned
+            limit: Maximum number of insights to return
+            attributes: Attributes to return for each insight (defaults to all)
+            
+        Returns:
+            Dict with status and insights
+        """
+        try:
+            query_params = {
+                'TableName': self.table_name,
+                'IndexName': RECENT_INSIGHTS_INDEX,
+                'KeyConditionExpression': 'entity_type = :entity_type AND created_at > :start_time',
+                'ExpressionAttributeValues': {
+                    ':entity_type': self._serializer.serialize(INSIGHT_ENTITY_TYPE),
+                    ':start_time': self._serializer.serialize(start_time)
+                },
+                'ScanIndexForward': False,  # Sort in descending order (newest first)
+                **self._projection_params(attributes)
+            }
+            
+            insights = []
+            while len(insights) < limit:
+                query_params['Limit'] = limit - len(insights)
+                response = self.read_client.query(**query_params)
+                insights.extend(self._deserialize_item(item) for item in response.get('Items', []))
+                
+                if 'LastEvaluatedKey' not in response:
+                    break
+                query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+            
+            return {
+                'status': 'success',
+                'count': len(insights),
+                'insights': insights
+            }
+            
+        except ClientError as e:
+            # Tables created before the created_at index existed can't be queried
+            if e.response['Error']['Code'] == 'ValidationException':
+                logger.warning("Recent insights index unavailable, scanning instead: %s", e)
+                return self.scan_recent_insights(
+                    start_time=start_time,
+                    limit=limit,
+                    attributes=attributes
+                )
+            logger.error("Error getting recent insights: %s", e)
+            return {
+                'status': 'error',
+                'message': str(e)
+            }
+            
+        except Exception as e:
+            logger.error("Error getting recent insights: %s", e)
+            return {
+                'status': 'error',
+                'message': str(e)
+            }
+
+    def scan_recent_insights(
+        self,
+        start_time: int,
+        limit: int = 500,
+        total_segments: Optional[int] = None,
+        attributes: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the newest insights created after a given time using a parallel scan.
+        
+        Fallback for tables without the created_at index. The table is split
+        into segments that are scanned concurrently, since each scan page is
+        a network round-trip.
+        
+        Args:
+            start_time: Unix timestamp; only insights created after it are returned
+            limit: Maximum number of insights to return
+            total_segments: Number of parallel scan segments (defaults to
+                twice the CPU count, capped at 8)
+            attributes: Attributes to return for each insight (defaults to all)
+            
+        Returns:
+            Dict with status and insights
+        """
+        try:
+            if total_segments is None:
+                total_segments = min(8, (os.cpu_count() or 1) * 2)
+            
+            # created_at is needed to order the merged segments
+            if attributes and 'created_at' not in attributes:
+                attributes = [*attributes, 'created_at']
+            projection_params = self._projection_params(attributes)
+            
+            def scan_segment(segment):
+                scan_params = {
+                    'TableName': self.table_name,
+                    'FilterExpression': 'created_at > :start_time',
+                    'ExpressionAttributeValues': {
+                        ':start_time': self._serializer.serialize(start_time)
+                    },
+                    'Segment': segment,
+                    'TotalSegments': total_segments,
+                    **projection_params
+                }
+                items = []
+                while len(items) < limit:
+                    response = self.read_client.scan(**scan_params)
+                    items.extend(self._deserialize_item(item) for item in response.get('Items', []))
+                    
+                    if 'LastEvaluatedKey' not in response:
+                        break
+                    scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+                return items
+            
+            with ThreadPoolExecutor(max_workers=total_segments) as executor:
+                segments = executor.map(scan_segment, range(total_segments))
+                insights = [item for items in segments for item in items]
             
-            insights = response.get('Items', [])
+            # Match the index query: newest first, at most limit items
+            insights.sort(key=lambda item: item['created_at'], reverse=True)
+            insights = insights[:limit]
             
             return {
                 'status': 'success',
@@ -337,7 +750,7 @@ class InsightsManager:
             }
             
         except Exception as e:
-            logger.error(f"Error getting insights for student {student_id}: {str(e)}")
+            logger.error("Error scanning recent insights: %s", e)
             return {
                 'status': 'error',
                 'message': str(e)
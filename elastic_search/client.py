@@ -1,14 +1,62 @@
+import atexit
 import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import List, Dict, Any, Optional, Union
-from elasticsearch import Elasticsearch
+import orjson
+from elasticsearch import Elasticsearch, helpers
 from elasticsearch.exceptions import ConnectionError, RequestError
+from elasticsearch.serializer import JsonSerializer
+from elastic_search.config import ElasticsearchConfig
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+def _index_action(index_name: str, doc_id: Any, document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a bulk index action.
+    
+    Documents without an ID get no _id at all, so Elasticsearch generates one
+    and skips the version lookup it does for explicit IDs.
+    """
+    action = {"_op_type": "index", "_index": index_name, "_source": document}
+    if doc_id:
+        action["_id"] = doc_id
+    return action
+
+class OrjsonSerializer(JsonSerializer):
+    """
+    JSON serializer backed by orjson.
+    
+    Request bodies, including each line helpers.bulk pre-serializes for bulk
+    requests, are encoded much faster than with the stdlib json module.
+    Types orjson can't handle natively go through JsonSerializer.default.
+    """
+    
+    def dumps(self, data: Any) -> bytes:
+        # Bodies that are already encoded are sent as-is
+        if isinstance(data, str):
+            return data.encode("utf-8", "surrogatepass")
+        if isinstance(data, bytes):
+            return data
+        return orjson.dumps(data, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY)
+    
+    def loads(self, data: bytes) -> Any:
+        # Some responses are declared as JSON but have an empty body
+        if data == b"":
+            return None
+        return orjson.loads(data)
+
 class ElasticsearchClient:
     """Client for interacting with Elasticsearch for feedback data."""
     
+    # Thread pool shared by all clients for concurrent bulk requests, created
+    # on first use so its threads are reused across calls
+    _bulk_executor = None
+    _bulk_executor_lock = threading.Lock()
+    
     def __init__(self, host: Optional[str] = None, port: Optional[str] = None, 
                  username: Optional[str] = None, password: Optional[str] = None):
         """
@@ -30,39 +78,66 @@ class ElasticsearchClient:
         
     def connect(self) -> bool:
         """
-        Establish connection to Elasticsearch.
+        Create the Elasticsearch client.
+        
+        No request is sent, so success doesn't mean the cluster is reachable;
+        use health() to check that. Requests that fail to connect mark the
+        client disconnected so it is recreated on the next call.
         
         Returns:
-            bool: True if connection successful, False otherwise
+            bool: True if the client was created, False otherwise
         """
         try:
-            # Build connection params
-            conn_params = {"hosts": [self.url]}
+            # Build connection params. Bodies are gzipped, and each node gets
+            # enough pooled keep-alive connections for concurrent requests
+            conn_params = {
+                "hosts": [self.url],
+                "http_compress": True,
+                "connections_per_node": 25,
+                "request_timeout": 30,
+                "max_retries": 3,
+                "retry_on_timeout": True
+            }
             
             # Add authentication if provided
             if self.username and self.password:
                 conn_params["basic_auth"] = [self.username, self.password]
             
-            # Connect to Elasticsearch
-            self.client = Elasticsearch(**conn_params)
-            self.connected = self.client.ping()
+            conn_params["serializer"] = OrjsonSerializer()
             
-            if self.connected:
-                logger.info(f"Connected to Elasticsearch at {self.url}")
-                return True
-            else:
-                logger.error("Failed to ping Elasticsearch server")
-                return False
+            # Creating the client opens no connection, so it is assumed to be
+            # usable until a request fails to connect
+            self.client = Elasticsearch(**conn_params)
+            self.connected = True
+            logger.info(f"Created Elasticsearch client for {self.url}")
+            return True
             
-        except ConnectionError as e:
-            logger.error(f"Failed to connect to Elasticsearch: {str(e)}")
-            self.connected = False
-            return False
         except Exception as e:
-            logger.error(f"Unexpected error connecting to Elasticsearch: {str(e)}")
+            logger.error(f"Error creating Elasticsearch client: {str(e)}")
             self.connected = False
             return False
     
+    def health(self) -> bool:
+        """
+        Check that the Elasticsearch server responds.
+        
+        Returns:
+            bool: True if the server answered a ping, False otherwise
+        """
+        if not self.connected and not self.connect():
+            return False
+        
+        healthy = self.client.ping()
+        if not healthy:
+            logger.error("Failed to ping Elasticsearch server")
+            self.connected = False
+        return healthy
+    
+    def _mark_disconnected(self, error: Exception):
+        """Reconnect on the next request if error was a failure to connect."""
+        if isinstance(error, ConnectionError):
+            self.connected = False
+    
     def create_index(self, index_name: str, mapping: Optional[Dict[str, Any]] = None) -> bool:
         """
         Create an Elasticsearch index with optional mapping.
@@ -96,6 +171,7 @@ class ElasticsearchClient:
             logger.error(f"Error creating index '{index_name}': {str(e)}")
             return False
         except Exception as e:
+            self._mark_disconnected(e)
             logger.error(f"Unexpected error creating index '{index_name}': {str(e)}")
             return False
     
@@ -120,17 +196,39 @@ class ElasticsearchClient:
             return True
             
         except Exception as e:
+            self._mark_disconnected(e)
             logger.error(f"Error indexing document '{doc_id}': {str(e)}")
             return False
     
-    def bulk_index(self, index_name: str, documents: List[Dict[str, Any]], id_field: str = "id") -> bool:
+    @classmethod
+    def _get_bulk_executor(cls) -> ThreadPoolExecutor:
+        """Get the shared thread pool used to send bulk requests concurrently."""
+        if cls._bulk_executor is None:
+            with cls._bulk_executor_lock:
+                if cls._bulk_executor is None:
+                    cls._bulk_executor = ThreadPoolExecutor(
+                        max_workers=ElasticsearchConfig.get_bulk_concurrency(),
+                        thread_name_prefix="es-bulk"
+                    )
+        return cls._bulk_executor
+    
+    def bulk_index(self, 
+                  index_name: str, 
+                  documents: List[Dict[str, Any]], 
+                  id_field: Optional[str] = "id",
+                  chunk_size: int = 500) -> bool:
         """
         Bulk index multiple documents in Elasticsearch.
         
+        Each chunk of documents is sent as its own bulk request, and the
+        requests run concurrently so the cluster can index them in parallel.
+        
         Args:
             index_name: Name of the index
             documents: List of documents to index
-            id_field: Field name to use as document ID
+            id_field: Field name to use as document ID. Documents without it,
+                or all documents when None, get an ID generated by Elasticsearch
+            chunk_size: Number of documents sent per bulk request
             
         Returns:
             bool: Success status
@@ -139,37 +237,51 @@ class ElasticsearchClient:
             return False
             
         try:
-            # Prepare bulk indexing operations
-            operations = []
-            for doc in documents:
-                doc_id = doc.get(id_field)
-                if not doc_id:
-                    doc_id = None  # Let ES generate an ID
-                    
-                operations.append({"index": {"_index": index_name, "_id": doc_id}})
-                operations.append(doc)
-            
-            # Execute bulk operation
-            if operations:
-                response = self.client.bulk(operations=operations)
-                if response.get("errors"):
-                    logger.warning(f"Some errors occurred during bulk indexing: {response}")
-                    return False
-                logger.info(f"Bulk indexed {len(documents)} documents in index '{index_name}'")
-                return True
-            else:
+            if not documents:
                 logger.warning("No documents to index")
                 return False
             
+            bulk_client = self.client.options(request_timeout=60)
+            
+            def index_chunk(chunk):
+                # Prepare bulk indexing actions
+                actions = (
+                    _index_action(index_name, doc.get(id_field) if id_field else None, doc)
+                    for doc in chunk
+                )
+                return helpers.bulk(
+                    bulk_client,
+                    actions,
+                    chunk_size=chunk_size,
+                    raise_on_error=False
+                )
+            
+            # Execute one bulk request per chunk of chunk_size documents
+            chunks = [documents[i:i + chunk_size] for i in range(0, len(documents), chunk_size)]
+            success_count = 0
+            errors = []
+            for chunk_success, chunk_errors in self._get_bulk_executor().map(index_chunk, chunks):
+                success_count += chunk_success
+                errors.extend(chunk_errors)
+            
+            if errors:
+                logger.warning(f"Some errors occurred during bulk indexing: {errors}")
+                return False
+            logger.info(f"Bulk indexed {success_count} documents in index '{index_name}'")
+            return True
+            
         except Exception as e:
+            self._mark_disconnected(e)
             logger.error(f"Error bulk indexing documents: {str(e)}")
             return False
     
     def search(self, 
               index_name: str, 
-              query: Dict[str, Any], 
+              query: Optional[Dict[str, Any]] = None, 
               size: int = 10, 
-              from_: int = 0) -> Dict[str, Any]:
+              from_: int = 0,
+              source_fields: Optional[List[str]] = None,
+              body: Optional[bytes] = None) -> Dict[str, Any]:
         """
         Perform a search query in Elasticsearch.
         
@@ -178,6 +290,9 @@ class ElasticsearchClient:
             query: Elasticsearch query DSL
             size: Number of results to return
             from_: Starting offset for pagination
+            source_fields: Fields of each hit to return, or None for all
+            body: Already-encoded JSON request body holding the query, sent
+                as-is instead of encoding query
             
         Returns:
             Dict with search results
@@ -186,12 +301,25 @@ class ElasticsearchClient:
             return {"error": "Not connected to Elasticsearch", "hits": [], "total": 0}
             
         try:
-            response = self.client.search(
-                index=index_name,
-                query=query,
-                size=size,
-                from_=from_
-            )
+            if body is not None:
+                params = {"size": size, "from": from_}
+                if source_fields is not None:
+                    params["_source"] = ",".join(source_fields)
+                response = self.client.perform_request(
+                    "POST",
+                    f"/{index_name}/_search",
+                    params=params,
+                    headers={"accept": "application/json", "content-type": "application/json"},
+                    body=body
+                )
+            else:
+                response = self.client.search(
+                    index=index_name,
+                    query=query,
+                    size=size,
+                    from_=from_,
+                    source=source_fields
+                )
             
             # Format the results
             hits = []
@@ -211,10 +339,57 @@ class ElasticsearchClient:
             return result
             
         except Exception as e:
+            self._mark_disconnected(e)
             logger.error(f"Error searching in index '{index_name}': {str(e)}")
             return {"error": str(e), "hits": [], "total": 0}
     
-    def text_search(self, index_name: str, text: str, fields: List[str], size: int = 10) -> Dict[str, Any]:
+    def mget(self, 
+             index_name: str, 
+             ids: List[str], 
+             source_fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch documents by ID in a single request.
+        
+        Unlike a search, this runs no query and computes no scores.
+        
+        Args:
+            index_name: Name of the index
+            ids: IDs of the documents to fetch
+            source_fields: Fields of each document to return, or None for all
+            
+        Returns:
+            List of found documents in the order of ids, each with its _id
+        """
+        if not ids:
+            return []
+        if not self.connected and not self.connect():
+            return []
+            
+        try:
+            response = self.client.mget(index=index_name, ids=ids, source=source_fields)
+            
+            docs = []
+            for hit in response["docs"]:
+                if not hit.get("found"):
+                    continue
+                doc = hit["_source"]
+                doc["_id"] = hit["_id"]
+                docs.append(doc)
+            
+            logger.info(f"Fetched {len(docs)} of {len(ids)} documents from index '{index_name}'")
+            return docs
+            
+        except Exception as e:
+            self._mark_disconnected(e)
+            logger.error(f"Error fetching documents from index '{index_name}': {str(e)}")
+            return []
+    
+    def text_search(self, 
+                    index_name: str, 
+                    text: str, 
+                    fields: List[str], 
+                    size: int = 10,
+                    source_fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Perform a multi-match text search across specified fields.
         
@@ -223,6 +398,7 @@ class ElasticsearchClient:
             text: Text to search for
             fields: List of fields to search in
             size: Number of results to return
+            source_fields: Fields of each hit to return, or None for all
             
         Returns:
             Dict with search results
@@ -236,7 +412,81 @@ class ElasticsearchClient:
             }
         }
         
-        return self.search(index_name, query, size)
+        return self.search(index_name, query, size, source_fields=source_fields)
+    
+    def update_index_settings(self, index_name: str, settings: Dict[str, Any]) -> bool:
+        """
+        Update the dynamic settings of an index.
+        
+        Args:
+            index_name: Name of the index
+            settings: Settings to apply
+            
+        Returns:
+            bool: Success status
+        """
+        if not self.connected and not self.connect():
+            return False
+            
+        try:
+            self.client.indices.put_settings(index=index_name, settings=settings)
+            logger.info(f"Updated settings of index '{index_name}': {settings}")
+            return True
+            
+        except Exception as e:
+            self._mark_disconnected(e)
+            logger.error(f"Error updating settings of index '{index_name}': {str(e)}")
+            return False
+    
+    @contextmanager
+    def bulk_load_settings(self, index_name: str):
+        """
+        Disable refreshes and replicas on an index for a bulk load.
+        
+        The translog is also fsynced asynchronously instead of per request,
+        so a node crash during the load can lose recent writes; re-run the
+        load if that happens. The previous refresh interval, replica count
+        and translog durability are restored on exit. Meant for one-off
+        initial loads; replicas are rebuilt afterwards.
+        
+        Args:
+            index_name: Name of the index being loaded
+        """
+        previous = None
+        if self.connected or self.connect():
+            try:
+                response = self.client.indices.get_settings(
+                    index=index_name,
+                    name=[
+                        "index.refresh_interval",
+                        "index.number_of_replicas",
+                        "index.translog.durability"
+                    ],
+                    include_defaults=True,
+                    flat_settings=True
+                )
+                index_settings = response[index_name]
+                merged = {**index_settings.get("defaults", {}), **index_settings.get("settings", {})}
+                previous = {
+                    "refresh_interval": merged["index.refresh_interval"],
+                    "number_of_replicas": merged["index.number_of_replicas"],
+                    "translog.durability": merged["index.translog.durability"]
+                }
+            except Exception as e:
+                self._mark_disconnected(e)
+                logger.error(f"Error reading settings of index '{index_name}': {str(e)}")
+        
+        if previous is not None:
+            self.update_index_settings(index_name, {
+                "refresh_interval": "-1",
+                "number_of_replicas": 0,
+                "translog.durability": "async"
+            })
+        try:
+            yield
+        finally:
+            if previous is not None:
+                self.update_index_settings(index_name, previous)
     
     def delete_document(self, index_name: str, doc_id: str) -> bool:
         """
@@ -258,6 +508,7 @@ class ElasticsearchClient:
             return True
             
         except Exception as e:
+            self._mark_disconnected(e)
             logger.error(f"Error deleting document '{doc_id}': {str(e)}")
             return False
     
@@ -280,5 +531,114 @@ class ElasticsearchClient:
             return True
             
         except Exception as e:
+            self._mark_disconnected(e)
             logger.error(f"Error deleting index '{index_name}': {str(e)}")
             return False
+
+
+class BulkBuffer:
+    """
+    Buffers single-document index requests and sends them with the bulk API.
+    
+    The buffer is flushed when it holds batch_size documents, or
+    flush_interval seconds after the first document was added, whichever
+    comes first. A flush that can't reach Elasticsearch puts its documents
+    back and is retried after another flush_interval. Anything still
+    buffered is flushed at interpreter exit, which processes ending with
+    os._exit (e.g. Celery prefork children) skip, so those should index
+    synchronously instead.
+    """
+    
+    def __init__(self, client: ElasticsearchClient, batch_size: int = 100,
+                 flush_interval: float = 1.0):
+        """
+        Initialize the bulk buffer.
+        
+        Args:
+            client: Client used to send the bulk requests
+            batch_size: Number of buffered documents that triggers a flush
+            flush_interval: Maximum seconds a document waits before a flush
+        """
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+    
+    def append(self, index_name: str, doc_id: Optional[str], document: Dict[str, Any]) -> bool:
+        """
+        Queue a document for indexing.
+        
+        Args:
+            index_name: Name of the index
+            doc_id: Unique ID for the document, or None to let Elasticsearch generate one
+            document: Document data to index
+            
+        Returns:
+            bool: True once the document is queued
+        """
+        with self._lock:
+            self._buffer.append(_index_action(index_name, doc_id, document))
+            full = len(self._buffer) >= self.batch_size
+            if not full:
+                self._schedule_flush()
+        
+        if full:
+            self.flush()
+        return True
+    
+    def _schedule_flush(self):
+        """Start the flush timer unless it is already running; call with the lock held."""
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _requeue(self, actions: List[Dict[str, Any]]):
+        """Put actions that couldn't be sent back at the front of the buffer."""
+        with self._lock:
+            self._buffer.extendleft(reversed(actions))
+            self._schedule_flush()
+    
+    def flush(self) -> bool:
+        """
+        Send all buffered documents to Elasticsearch.
+        
+        Returns:
+            bool: Success status
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            actions = list(self._buffer)
+            self._buffer.clear()
+        
+        if not actions:
+            return True
+        
+        if not self.client.connected and not self.client.connect():
+            logger.error(f"Keeping {len(actions)} buffered documents for retry: not connected to Elasticsearch")
+            self._requeue(actions)
+            return False
+        
+        try:
+            success_count, errors = helpers.bulk(
+                self.client.client.options(request_timeout=60),
+                actions,
+                chunk_size=500,
+                raise_on_error=False
+            )
+            if errors:
+                logger.warning(f"Some errors occurred during buffered bulk indexing: {errors}")
+                return False
+            logger.info(f"Flushed {success_count} buffered documents to Elasticsearch")
+            return True
+            
+        except Exception as e:
+            self.client._mark_disconnected(e)
+            logger.error(f"Error flushing buffered documents, keeping them for retry: {str(e)}")
+            self._requeue(actions)
+            return False
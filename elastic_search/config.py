@@ -6,13 +6,24 @@ logger = get_logger(__name__)
 class ElasticsearchConfig:
     """Configuration settings for Elasticsearch."""
     
+    # Seconds before indexed feedback becomes searchable
+    REFRESH_INTERVAL_SECONDS = 30
+    
     # Default index mappings
     FEEDBACK_INDEX_MAPPING = {
         "mappings": {
             "properties": {
-                "id": {"type": "keyword"},
+                # Never searched, only returned or aggregated, so skip the
+                # inverted index and keep doc values
+                "id": {"type": "keyword", "index": False},
                 "student_id": {"type": "keyword"},
-                "teacher_name": {"type": "text"},
+                "teacher_name": {
+                    "type": "text",
+                    # Keyword copy for aggregations and sorting by teacher
+                    "fields": {
+                        "raw": {"type": "keyword", "ignore_above": 256}
+                    }
+                },
                 "rating": {"type": "integer"},
                 "category": {"type": "keyword"},
                 "open_feedback": {
@@ -23,12 +34,20 @@ class ElasticsearchConfig:
                 "topics": {"type": "keyword"},
                 "entities": {"type": "keyword"},
                 "created_at": {"type": "date"},
-                "updated_at": {"type": "date"}
+                "updated_at": {"type": "date", "index": False}
             }
         },
         "settings": {
-            "number_of_shards": 1,
-            "number_of_replicas": 1
+            "number_of_shards": int(os.environ.get("ELASTICSEARCH_SHARDS", "1")),
+            "number_of_replicas": 1,
+            # Feedback is ingested in batches, so trade search freshness and
+            # translog flushes for indexing throughput. Writes are still
+            # fsynced per request; ElasticsearchClient.bulk_load_settings
+            # relaxes that only for the duration of a load
+            "refresh_interval": f"{REFRESH_INTERVAL_SECONDS}s",
+            "translog": {
+                "flush_threshold_size": "1gb"
+            }
         }
     }
     
@@ -55,6 +74,27 @@ class ElasticsearchConfig:
         """Get Elasticsearch password from environment."""
         return os.environ.get("ELASTICSEARCH_PASSWORD", "")
     
+    @classmethod
+    def get_index_batch_size(cls) -> int:
+        """Get the number of buffered documents that triggers a bulk flush."""
+        return int(os.environ.get("ELASTICSEARCH_INDEX_BATCH_SIZE", "100"))
+    
+    @classmethod
+    def get_index_flush_interval(cls) -> float:
+        """Get the maximum seconds a buffered document waits before a bulk flush."""
+        return float(os.environ.get("ELASTICSEARCH_INDEX_FLUSH_INTERVAL", "1.0"))
+    
+    @classmethod
+    def get_bulk_concurrency(cls) -> int:
+        """Get the maximum number of bulk requests sent concurrently."""
+        default = min(12, (os.cpu_count() or 1) * 3)
+        return int(os.environ.get("ELASTICSEARCH_BULK_CONCURRENCY", default))
+    
+    @classmethod
+    def get_cache_redis_url(cls) -> str:
+        """Get the Redis URL holding the search cache generation shared by all processes."""
+        return os.environ.get("CACHE_REDIS_URL", "redis://localhost:6379/1")
+    
     @classmethod
     def get_url(cls) -> str:
         """Get full Elasticsearch URL."""
@@ -1,28 +1,137 @@
 """
 Elasticsearch utility functions for search operations and indexing.
 """
+import functools
+import json
+import threading
 from typing import Dict, List, Any, Optional
-from elastic_search.client import ElasticsearchClient
+import redis
+from cachetools import TTLCache
+from elastic_search.client import BulkBuffer, ElasticsearchClient
 from elastic_search.config import ElasticsearchConfig
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Shared by every helper in this module so the underlying connection pool is
+# reused instead of reconnecting and pinging on each call
+_client = None
+_client_lock = threading.Lock()
+
+# Single-document index requests are batched into bulk requests
+_bulk_buffer = None
+
+# Search results are reused for a short time. Every write bumps the
+# generation, which is part of the cache key, so older entries stop matching.
+# The generation is kept in Redis so a write in one process (e.g. a Celery
+# worker) invalidates the caches of every process serving searches
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL = 60
+SEARCH_CACHE_GENERATION_KEY = "feedback:search:generation"
+_search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+_search_cache_lock = threading.Lock()
+_redis = None
+
+# Fields a list of search results renders. The full document is fetched
+# separately with get_feedback_detail
+FEEDBACK_SUMMARY_FIELDS = ["id", "teacher_name", "category", "sentiment", "rating"]
+
+def _get_redis() -> redis.Redis:
+    """Get the shared Redis client holding the cache generation."""
+    global _redis
+    if _redis is None:
+        with _search_cache_lock:
+            if _redis is None:
+                _redis = redis.Redis.from_url(ElasticsearchConfig.get_cache_redis_url())
+    return _redis
+
+def _cache_generation() -> Optional[int]:
+    """Get the current cache generation, or None if Redis is unavailable."""
+    try:
+        return int(_get_redis().get(SEARCH_CACHE_GENERATION_KEY) or 0)
+    except redis.RedisError as e:
+        logger.error(f"Error reading search cache generation: {str(e)}")
+        return None
+
+def cached_search(func):
+    """
+    Cache a search helper's successful results, keyed by its arguments.
+    
+    Searches skip the cache while the generation can't be read, since a
+    write might have gone unnoticed. The undecorated helper is available as
+    the wrapper's uncached attribute.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        generation = _cache_generation()
+        if generation is None:
+            return func(*args, **kwargs)
+        
+        key = (func.__name__, args, tuple(sorted(kwargs.items())), generation)
+        with _search_cache_lock:
+            result = _search_cache.get(key)
+        if result is not None:
+            return result
+        
+        result = func(*args, **kwargs)
+        if "error" not in result:
+            with _search_cache_lock:
+                _search_cache[key] = result
+        return result
+    wrapper.uncached = func
+    return wrapper
+
+def invalidate_search_cache():
+    """Make cached search results stale in every process after a write."""
+    with _search_cache_lock:
+        _search_cache.clear()
+    try:
+        _get_redis().incr(SEARCH_CACHE_GENERATION_KEY)
+    except redis.RedisError as e:
+        logger.error(f"Error bumping search cache generation: {str(e)}")
+
 def get_client() -> ElasticsearchClient:
     """
-    Get a configured Elasticsearch client.
+    Get the shared, configured Elasticsearch client.
+    
+    The client is created and connected on first use. If that connection
+    fails, the client reconnects on its next request.
     
     Returns:
         ElasticsearchClient: Configured client instance
     """
-    client = ElasticsearchClient(
-        host=ElasticsearchConfig.get_host(),
-        port=ElasticsearchConfig.get_port(),
-        username=ElasticsearchConfig.get_username(),
-        password=ElasticsearchConfig.get_password()
-    )
-    client.connect()
-    return client
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                client = ElasticsearchClient(
+                    host=ElasticsearchConfig.get_host(),
+                    port=ElasticsearchConfig.get_port(),
+                    username=ElasticsearchConfig.get_username(),
+                    password=ElasticsearchConfig.get_password()
+                )
+                client.connect()
+                _client = client
+    return _client
+
+def get_bulk_buffer() -> BulkBuffer:
+    """
+    Get the shared buffer that batches single-document index requests.
+    
+    Returns:
+        BulkBuffer: Buffer backed by the shared client
+    """
+    global _bulk_buffer
+    if _bulk_buffer is None:
+        client = get_client()
+        with _client_lock:
+            if _bulk_buffer is None:
+                _bulk_buffer = BulkBuffer(
+                    client,
+                    batch_size=ElasticsearchConfig.get_index_batch_size(),
+                    flush_interval=ElasticsearchConfig.get_index_flush_interval()
+                )
+    return _bulk_buffer
 
 def initialize_indices():
     """
@@ -36,66 +145,143 @@ def initialize_indices():
         mapping=ElasticsearchConfig.FEEDBACK_INDEX_MAPPING
     )
 
-def index_feedback(feedback_data: Dict[str, Any]) -> bool:
+def index_feedback(feedback_data: Dict[str, Any], buffered: bool = False) -> bool:
     """
     Index a feedback document in Elasticsearch.
     
     Args:
         feedback_data: The feedback data to index
+        buffered: Queue the document and send it with other feedback in a
+            bulk request shortly afterwards, instead of waiting for it to be
+            indexed. Indexing errors are then only logged, so callers that
+            retry on failure (e.g. Celery tasks) must leave this off.
         
     Returns:
-        bool: Success status
+        bool: Success status, or True once the document is queued when
+            buffered
     """
-    client = get_client()
-    
     # Extract document ID
     doc_id = feedback_data.get("id")
     if not doc_id:
         logger.warning("Feedback data missing ID, generating one automatically")
-        
-    # Index the document
-    return client.index_document(
-        ElasticsearchConfig.FEEDBACK_INDEX,
-        str(doc_id) if doc_id else "",
-        feedback_data
-    )
+    
+    doc_id = str(doc_id) if doc_id else None
+    if buffered:
+        # Queue the document for the next bulk request
+        success = get_bulk_buffer().append(ElasticsearchConfig.FEEDBACK_INDEX, doc_id, feedback_data)
+    else:
+        success = get_client().index_document(ElasticsearchConfig.FEEDBACK_INDEX, doc_id, feedback_data)
+    invalidate_search_cache()
+    return success
 
-def bulk_index_feedback(feedback_items: List[Dict[str, Any]]) -> bool:
+def bulk_index_feedback(
+    feedback_items: List[Dict[str, Any]],
+    initial_load: bool = False,
+    use_auto_ids: bool = False
+) -> bool:
     """
     Bulk index multiple feedback documents.
     
     Args:
         feedback_items: List of feedback documents to index
+        initial_load: Disable refreshes and replicas on the index while
+            loading. Only for one-off loads with no concurrent writers.
+        use_auto_ids: Let Elasticsearch generate document IDs instead of
+            using each feedback's id. Indexing is faster, but re-indexing
+            the same feedback creates duplicates instead of overwriting.
         
     Returns:
         bool: Success status
     """
     client = get_client()
-    return client.bulk_index(
-        ElasticsearchConfig.FEEDBACK_INDEX,
-        feedback_items,
-        id_field="id"
-    )
+    id_field = None if use_auto_ids else "id"
+    if initial_load:
+        with client.bulk_load_settings(ElasticsearchConfig.FEEDBACK_INDEX):
+            success = client.bulk_index(
+                ElasticsearchConfig.FEEDBACK_INDEX,
+                feedback_items,
+                id_field=id_field
+            )
+    else:
+        success = client.bulk_index(
+            ElasticsearchConfig.FEEDBACK_INDEX,
+            feedback_items,
+            id_field=id_field
+        )
+    invalidate_search_cache()
+    return success
 
-def search_feedback(query_text: str, size: int = 10) -> Dict[str, Any]:
+def search_feedback(
+    query_text: str,
+    size: int = 10,
+    source_fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Search for feedback using text query.
     
+    Only the IDs and scores of the hits are cached. A repeated search
+    fetches the documents by ID with mget instead of re-running the query,
+    so callers asking for different fields share one cache entry.
+    
     Args:
         query_text: Text to search for
         size: Number of results to return
+        source_fields: Fields of each hit to return. Defaults to
+            FEEDBACK_SUMMARY_FIELDS
         
     Returns:
         Dict with search results
     """
     client = get_client()
-    return client.text_search(
+    if source_fields is None:
+        source_fields = FEEDBACK_SUMMARY_FIELDS
+    generation = _cache_generation()
+    key = ("search_feedback", query_text, size, generation)
+    cached = None
+    if generation is not None:
+        with _search_cache_lock:
+            cached = _search_cache.get(key)
+    
+    if cached is not None:
+        scores = cached["scores"]
+        hits = client.mget(ElasticsearchConfig.FEEDBACK_INDEX, list(scores), source_fields)
+        if len(hits) == len(scores):
+            for hit in hits:
+                hit["_score"] = scores[hit["_id"]]
+            return {"hits": hits, "total": cached["total"], "max_score": cached["max_score"]}
+        # Fall through and re-run the search if documents went missing
+    
+    result = client.text_search(
         ElasticsearchConfig.FEEDBACK_INDEX,
         query_text,
         fields=["open_feedback", "teacher_name", "topics", "entities"],
-        size=size
+        size=size,
+        source_fields=source_fields
     )
+    if "error" not in result and generation is not None:
+        with _search_cache_lock:
+            _search_cache[key] = {
+                "scores": {hit["_id"]: hit["_score"] for hit in result["hits"]},
+                "total": result["total"],
+                "max_score": result["max_score"]
+            }
+    return result
 
+def get_feedback_detail(feedback_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the full feedback document for a search result.
+    
+    Args:
+        feedback_id: ID of the feedback document
+        
+    Returns:
+        The feedback document, or None if it was not found
+    """
+    client = get_client()
+    docs = client.mget(ElasticsearchConfig.FEEDBACK_INDEX, [str(feedback_id)])
+    return docs[0] if docs else None
+
+@cached_search
 def search_feedback_by_category(category: str, size: int = 10) -> Dict[str, Any]:
     """
     Search for feedback by category.
@@ -108,13 +294,15 @@ def search_feedback_by_category(category: str, size: int = 10) -> Dict[str, Any]
         Dict with search results
     """
     client = get_client()
+    # Filter context skips scoring and lets Elasticsearch cache the match
     query = {
-        "term": {
-            "category": category
+        "bool": {
+            "filter": [{"term": {"category": category}}]
         }
     }
     return client.search(ElasticsearchConfig.FEEDBACK_INDEX, query, size)
 
+@cached_search
 def search_feedback_by_sentiment(sentiment: str, size: int = 10) -> Dict[str, Any]:
     """
     Search for feedback by sentiment.
@@ -127,37 +315,31 @@ def search_feedback_by_sentiment(sentiment: str, size: int = 10) -> Dict[str, An
         Dict with search results
     """
     client = get_client()
+    # Filter context skips scoring and lets Elasticsearch cache the match
     query = {
-        "term": {
-            "sentiment": sentiment
+        "bool": {
+            "filter": [{"term": {"sentiment": sentiment}}]
         }
     }
     return client.search(ElasticsearchConfig.FEEDBACK_INDEX, query, size)
 
-def advanced_feedback_search(
-    text: Optional[str] = None,
-    category: Optional[str] = None,
-    sentiment: Optional[str] = None,
-    min_rating: Optional[int] = None,
-    max_rating: Optional[int] = None,
-    size: int = 10
-) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=256)
+def _build_query(
+    text: Optional[str],
+    category: Optional[str],
+    sentiment: Optional[str],
+    min_rating: Optional[int],
+    max_rating: Optional[int]
+) -> bytes:
     """
-    Perform advanced search on feedback with multiple filters.
+    Build the encoded search body for advanced_feedback_search.
+    
+    Bodies are cached per combination of filters, so repeated searches skip
+    building and encoding the query.
     
-    Args:
-        text: Optional text to search for
-        category: Optional category to filter by
-        sentiment: Optional sentiment to filter by
-        min_rating: Optional minimum rating
-        max_rating: Optional maximum rating
-        size: Number of results to return
-        
     Returns:
-        Dict with search results
+        bytes: JSON request body with the query
     """
-    client = get_client()
-    
     # Build compound query
     must_clauses = []
     filter_clauses = []
@@ -212,4 +394,31 @@ def advanced_feedback_search(
     if not must_clauses and not filter_clauses:
         query = {"match_all": {}}
     
-    return client.search(ElasticsearchConfig.FEEDBACK_INDEX, query, size)
+    return json.dumps({"query": query}).encode("utf-8")
+
+@cached_search
+def advanced_feedback_search(
+    text: Optional[str] = None,
+    category: Optional[str] = None,
+    sentiment: Optional[str] = None,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    size: int = 10
+) -> Dict[str, Any]:
+    """
+    Perform advanced search on feedback with multiple filters.
+    
+    Args:
+        text: Optional text to search for
+        category: Optional category to filter by
+        sentiment: Optional sentiment to filter by
+        min_rating: Optional minimum rating
+        max_rating: Optional maximum rating
+        size: Number of results to return
+        
+    Returns:
+        Dict with search results
+    """
+    client = get_client()
+    body = _build_query(text, category, sentiment, min_rating, max_rating)
+    return client.search(ElasticsearchConfig.FEEDBACK_INDEX, size=size, body=body)
@@ -12,7 +12,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 from elastic_search.client import ElasticsearchClient
 from elastic_search.config import ElasticsearchConfig
-from elastic_search.search import initialize_indices, index_feedback, search_feedback
+from elastic_search.search import get_client, initialize_indices, index_feedback, search_feedback
 
 def test_elasticsearch_connection():
     """Test basic Elasticsearch connection and operations."""
@@ -22,7 +22,7 @@ def test_elasticsearch_connection():
     client = ElasticsearchClient()
     
     # Test connection
-    if client.connect():
+    if client.connect() and client.health():
         print("✅ Connected to Elasticsearch successfully")
     else:
         print("❌ Failed to connect to Elasticsearch")
@@ -62,10 +62,10 @@ def test_elasticsearch_operations():
         print("❌ Failed to index sample feedback document")
         return False
     
-    # Wait for indexing to complete
-    print("Waiting for document to be searchable...")
-    import time
-    time.sleep(2)
+    # Refresh the index so the document is searchable now instead of after
+    # the refresh interval
+    print("Refreshing the feedback index...")
+    get_client().client.indices.refresh(index=ElasticsearchConfig.FEEDBACK_INDEX)
     
     # Search for the indexed document
     print("Searching for the indexed document...")
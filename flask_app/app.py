@@ -1,7 +1,25 @@
-from flask import Flask, request, jsonify
+import hashlib
+import os
+from typing import List
+import msgpack
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import BadRequest
+from pydantic import ValidationError, parse_obj_as
 from flask_app.models import db, Feedback
+from flask_app.cache import (
+    add_recent_feedback,
+    get_cached,
+    get_recent_feedback,
+    make_key,
+    set_cached
+)
 from flask_app.config import Config
+from flask_app.health import HealthMiddleware
+from flask_app.json_encoder import OrjsonDecoder, OrjsonEncoder, encode_json
+from flask_app.schemas import FeedbackIn
+from flask_app.task_buffer import TaskBuffer, dispatch_open_feedback, should_process
+from flask_app.writer import FeedbackWriter
 from elastic_search.search import (
     search_feedback, 
     search_feedback_by_category,
@@ -12,19 +30,79 @@ from elastic_search.search import (
 
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json_encoder = OrjsonEncoder
+app.json_decoder = OrjsonDecoder
 db.init_app(app)
 CORS(app)
 
-# Create tables if they don't exist
-with app.app_context():
+# /health is answered before the request reaches Flask
+app.wsgi_app = HealthMiddleware(app.wsgi_app)
+
+# Open feedback processing tasks are published to Celery in batches
+task_buffer = TaskBuffer()
+
+# Submitted feedback is saved in batches unless the client asks to wait
+feedback_writer = FeedbackWriter(
+    app,
+    batch_size=app.config['FEEDBACK_WRITE_BATCH_SIZE'],
+    flush_interval=app.config['FEEDBACK_WRITE_FLUSH_INTERVAL']
+)
+
+@app.cli.command('init')
+def init_command():
+    """Create the database tables and Elasticsearch indices if they don't exist."""
     db.create_all()
     # Initialize Elasticsearch indices
     initialize_indices()
 
-@app.route('/health', methods=['GET'])
-def health_check():
-    """Simple health check endpoint."""
-    return jsonify({"status": "healthy", "service": "sped-feedback-etl"}), 200
+def _parse_body(expected: type = dict):
+    """
+    Decode the request body as msgpack or JSON, based on its Content-Type.
+    
+    msgpack bodies are smaller and faster to decode for large submissions.
+    
+    Args:
+        expected: Type the decoded body must have, dict or list
+        
+    Raises:
+        BadRequest: If the body can't be decoded or has another type
+    """
+    if "msgpack" in request.mimetype:
+        try:
+            data = msgpack.unpackb(request.get_data(cache=False))
+        except (msgpack.exceptions.ExtraData, msgpack.exceptions.UnpackException, ValueError) as e:
+            raise BadRequest(f"Failed to decode msgpack object: {str(e)}")
+    else:
+        data = request.get_json()
+    if not isinstance(data, expected):
+        raise BadRequest(f"Request body must be {'an array' if expected is list else 'an object'}")
+    return data
+
+def _encode_search_results(hits, total, max_score):
+    """Encode a search response as JSON, one hit at a time."""
+    yield b'{"status":"success","total":%d,"max_score":%s,"results":[' % (
+        total, encode_json(max_score)
+    )
+    for i, hit in enumerate(hits):
+        yield b"," + encode_json(hit) if i else encode_json(hit)
+    yield b"]}"
+
+def _stream_search_results(hits, total, max_score, cache_key=None, category=None):
+    """
+    Stream an encoded search response.
+    
+    When cache_key is given, the complete body is cached once it has been
+    sent.
+    """
+    if cache_key is None:
+        yield from _encode_search_results(hits, total, max_score)
+        return
+    
+    chunks = []
+    for chunk in _encode_search_results(hits, total, max_score):
+        chunks.append(chunk)
+        yield chunk
+    set_cached(cache_key, b"".join(chunks), category, app.config['SEARCH_CACHE_TTL'])
 
 @app.route('/search-feedback', methods=['GET'])
 def search_feedback_endpoint():
@@ -38,6 +116,15 @@ def search_feedback_endpoint():
     - min_rating: Minimum rating (optional)
     - max_rating: Maximum rating (optional)
     - size: Number of results to return (optional, default=10)
+    
+    Responses are cached in Redis for a short time and dropped once feedback
+    in a matching category has been indexed and become searchable. Only
+    responses served from the cache carry an ETag, and a matching
+    If-None-Match gets a 304 without a body: a response built on a cache
+    miss is streamed, so its body can't be hashed before the headers are
+    sent, and conditional requests start matching from the second fetch.
+    Searches without any criteria return the most recently saved feedback
+    from Redis.
     """
     try:
         # Extract search parameters
@@ -54,8 +141,29 @@ def search_feedback_endpoint():
         if max_rating:
             max_rating = int(max_rating)
         
-        # Perform search
-        search_results = advanced_feedback_search(
+        if not any((text, category, sentiment, min_rating, max_rating)):
+            recent = get_recent_feedback(size)
+            if recent is not None:
+                body = b'{"status":"success","total":%d,"max_score":null,"results":[%s]}' % (
+                    len(recent), b",".join(recent)
+                )
+                return Response(body, mimetype="application/json")
+        
+        key = make_key("feedback:search", text, category, sentiment, min_rating, max_rating, size)
+        cached = get_cached(key)
+        if cached is not None:
+            etag = hashlib.blake2b(cached, digest_size=10).hexdigest()
+            headers = {"Cache-Control": "public, max-age=30"}
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304, headers=headers)
+            else:
+                response = Response(cached, mimetype="application/json", headers=headers)
+            response.set_etag(etag, weak=True)
+            return response
+        
+        # Perform search, skipping the process-local cache so a stale result
+        # isn't written back to Redis
+        search_results = advanced_feedback_search.uncached(
             text=text,
             category=category,
             sentiment=sentiment,
@@ -64,12 +172,20 @@ def search_feedback_endpoint():
             size=size
         )
         
-        return jsonify({
-            "status": "success",
-            "results": search_results["hits"],
-            "total": search_results["total"],
-            "max_score": search_results["max_score"]
-        })
+        # Stream the hits instead of building the whole body first
+        succeeded = "error" not in search_results
+        body = _stream_search_results(
+            search_results["hits"],
+            search_results["total"],
+            search_results["max_score"],
+            cache_key=key if succeeded else None,
+            category=category
+        )
+        return Response(
+            stream_with_context(body),
+            mimetype="application/json",
+            headers={"Cache-Control": "public, max-age=30"} if succeeded else None
+        )
         
     except Exception as e:
         return jsonify({
@@ -88,50 +204,51 @@ def submit_feedback():
     - rating: Numerical rating (typically 1-5)
     - category: Category of feedback (e.g., 'academics', 'behavior', 'social')
     - open_feedback: Open-ended text feedback
+    
+    The feedback is saved in the background with other submissions and the
+    response returns before it is written. Pass sync=true as a query
+    parameter to wait for the write and get the new feedback_id. The body
+    may be sent as msgpack with Content-Type application/msgpack.
     """
     try:
-        data = request.get_json()
+        data = _parse_body()
         
-        # Validate required fields
-        required_fields = ['student_id', 'teacher_name', 'rating', 'category']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    "status": "error", 
-                    "message": f"Missing required field: {field}"
-                }), 400
-        
-        # Validate rating is a number between 1-5
+        # Validate the payload against the feedback schema
         try:
-            rating = int(data['rating'])
-            if rating < 1 or rating > 5:
-                return jsonify({
-                    "status": "error", 
-                    "message": "Rating must be between 1 and 5"
-                }), 400
-        except ValueError:
+            payload = FeedbackIn.parse_obj(data)
+        except ValidationError as e:
             return jsonify({
-                "status": "error", 
-                "message": "Rating must be a number"
+                "status": "error",
+                "message": "Invalid feedback",
+                "errors": e.errors()
             }), 400
         
+        feedback_data = payload.dict()
+        
+        if request.args.get('sync', 'false').lower() != 'true':
+            # Queue for the next batched write
+            feedback_writer.submit(feedback_data)
+            if should_process(feedback_data["open_feedback"]):
+                processing_message = "Open feedback will be queued for processing once saved"
+            else:
+                processing_message = "No open feedback to process"
+            return jsonify({
+                "status": "success",
+                "message": "Feedback accepted and queued for saving",
+                "processing_status": processing_message
+            }), 202
+        
         # Create a new feedback entry
-        feedback = Feedback(
-            student_id=data['student_id'],
-            teacher_name=data['teacher_name'],
-            rating=rating,
-            category=data['category'],
-            open_feedback=data.get('open_feedback')  # Optional field
-        )
+        feedback = Feedback(**feedback_data)
         
         # Save to database
         db.session.add(feedback)
         db.session.commit()
+        add_recent_feedback([feedback.to_dict()])
         
         # Queue open feedback for asynchronous processing with Celery
-        from celery_tasks.process_feedback import process_open_feedback
-        if feedback.open_feedback:
-            process_open_feedback.delay(feedback.id, feedback.open_feedback)
+        if should_process(feedback.open_feedback):
+            task_buffer.append(feedback.id, feedback.open_feedback)
             processing_message = "Open feedback queued for processing"
         else:
             processing_message = "No open feedback to process"
@@ -143,6 +260,11 @@ def submit_feedback():
             "processing_status": processing_message
         }), 201
         
+    except BadRequest as e:
+        return jsonify({
+            "status": "error",
+            "message": e.description
+        }), 400
     except Exception as e:
         # Log the exception
         app.logger.error(f"Error submitting feedback: {str(e)}")
@@ -153,10 +275,75 @@ def submit_feedback():
             "message": "An error occurred while processing your request"
         }), 500
 
+@app.route('/api/feedback/bulk', methods=['POST'])
+def submit_feedback_bulk():
+    """
+    Endpoint to submit many feedback entries in one request.
+    
+    Accepts a JSON array of feedback objects with the same fields as
+    /submit-feedback. The entries are inserted in one transaction and their
+    open feedback is queued for processing with a single broker publish.
+    Nothing is saved if any entry is invalid. The body may be sent as msgpack
+    with Content-Type application/msgpack.
+    """
+    try:
+        data = _parse_body(list)
+        
+        # Validate every entry against the feedback schema
+        try:
+            payloads = parse_obj_as(List[FeedbackIn], data)
+        except ValidationError as e:
+            return jsonify({
+                "status": "error",
+                "message": "Invalid feedback",
+                "errors": e.errors()
+            }), 400
+        
+        feedbacks = [Feedback(**payload.dict()) for payload in payloads]
+        
+        # Save to database, fetching the new IDs for the Celery tasks
+        db.session.add_all(feedbacks)
+        db.session.flush()
+        # Load the columns the database filled in with one query, before the
+        # commit expires the rows and each would be reloaded on access
+        Feedback.query.filter(Feedback.id.in_([feedback.id for feedback in feedbacks])).all()
+        saved = [feedback.to_dict() for feedback in feedbacks]
+        db.session.commit()
+        add_recent_feedback(saved)
+        
+        # Queue open feedback for asynchronous processing with Celery
+        queued = dispatch_open_feedback(
+            (feedback["id"], feedback["open_feedback"])
+            for feedback in saved
+            if should_process(feedback["open_feedback"])
+        )
+        
+        return jsonify({
+            "status": "success",
+            "message": f"{len(feedbacks)} feedback entries submitted successfully",
+            "feedback_ids": [feedback["id"] for feedback in saved],
+            "processing_status": f"{queued} open feedback entries queued for processing"
+        }), 201
+        
+    except BadRequest as e:
+        return jsonify({
+            "status": "error",
+            "message": e.description
+        }), 400
+    except Exception as e:
+        # Log the exception
+        app.logger.error(f"Error submitting feedback in bulk: {str(e)}")
+        # Rollback in case of error
+        db.session.rollback()
+        return jsonify({
+            "status": "error",
+            "message": "An error occurred while processing your request"
+        }), 500
+
 @app.route('/api/feedback', methods=['POST'])
 def receive_feedback():
     """Endpoint to receive new feedback data."""
-    data = request.get_json()
+    data = _parse_body()
     
     # TODO: Implement feedback processing logic
     # - Validate input data
@@ -165,6 +352,13 @@ def receive_feedback():
     
     return jsonify({"status": "received", "message": "Feedback received successfully"}), 201
 
+# Placeholder response, encoded once
+_INSIGHTS_PLACEHOLDER = encode_json({
+    "summary": "Sample insights will appear here",
+    "trends": [],
+    "recommendations": []
+})
+
 @app.route('/api/insights', methods=['GET'])
 def get_insights():
     """Endpoint to retrieve insights from processed feedback."""
@@ -172,14 +366,8 @@ def get_insights():
     # - Query from databases (vector, graph, dynamo)
     # - Format response
     
-    # Placeholder response
-    insights = {
-        "summary": "Sample insights will appear here",
-        "trends": [],
-        "recommendations": []
-    }
-    
-    return jsonify(insights), 200
+    return Response(_INSIGHTS_PLACEHOLDER, 200, mimetype="application/json")
 
-if __name__ == '__main__':
+if __name__ == '__main__' and os.environ.get('FLASK_ENV') == 'development':
+    # Development server only; serve with gunicorn (see wsgi.py) otherwise
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,170 @@
+"""
+Redis cache for Flask API responses, shared by all app workers.
+"""
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+import redis
+from flask import current_app, has_app_context
+from flask_app.config import Config
+from flask_app.json_encoder import encode_json
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Tag for cached searches that are not limited to one category, which any
+# new feedback can change
+ALL_CATEGORIES = "*"
+
+# Sorted set of the most recently saved feedback, encoded as JSON and
+# scored by feedback ID
+RECENT_FEEDBACK_KEY = "feedback:recent"
+RECENT_FEEDBACK_LIMIT = 1000
+
+_redis = None
+_redis_lock = threading.Lock()
+
+def get_redis() -> redis.Redis:
+    """
+    Get the shared Redis client for the response cache.
+    
+    Outside the Flask app (e.g. in Celery workers) the URL comes from Config.
+    
+    Returns:
+        redis.Redis: Client backed by a connection pool
+    """
+    global _redis
+    if _redis is None:
+        with _redis_lock:
+            if _redis is None:
+                url = (
+                    current_app.config['CACHE_REDIS_URL'] if has_app_context()
+                    else Config.CACHE_REDIS_URL
+                )
+                _redis = redis.Redis.from_url(url)
+    return _redis
+
+def make_key(prefix: str, *parts: Any) -> str:
+    """
+    Build a cache key from a prefix and a hash of the request parameters.
+    
+    Args:
+        prefix: Namespace of the cached response
+        parts: Parameters the response depends on
+        
+    Returns:
+        str: Cache key
+    """
+    digest = hashlib.blake2b(json.dumps(parts).encode("utf-8"), digest_size=16).hexdigest()
+    return f"{prefix}:{digest}"
+
+def _category_tag(category: Optional[str]) -> str:
+    return f"feedback:tag:cat:{category or ALL_CATEGORIES}"
+
+def get_cached(key: str) -> Optional[bytes]:
+    """
+    Get a cached response body.
+    
+    Args:
+        key: Cache key
+        
+    Returns:
+        The cached body, or None on a miss or if Redis is unavailable
+    """
+    try:
+        return get_redis().get(key)
+    except redis.RedisError as e:
+        logger.error(f"Error reading cache key '{key}': {str(e)}")
+        return None
+
+def set_cached(key: str, body: bytes, category: Optional[str], ttl: int) -> None:
+    """
+    Cache a response body, tagged with the category it is limited to.
+    
+    Args:
+        key: Cache key
+        body: Response body
+        category: Category the response is limited to, or None for all
+        ttl: Seconds to keep the response
+    """
+    tag = _category_tag(category)
+    try:
+        pipe = get_redis().pipeline()
+        pipe.setex(key, ttl, body)
+        pipe.sadd(tag, key)
+        pipe.expire(tag, ttl)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"Error writing cache key '{key}': {str(e)}")
+
+def invalidate_categories(categories: Iterable[str]) -> None:
+    """
+    Drop cached responses that new feedback in the given categories changes.
+    
+    Responses for those categories and responses not limited to a category
+    are dropped.
+    
+    Args:
+        categories: Categories of the new feedback
+    """
+    tags = {_category_tag(category) for category in categories}
+    tags.add(_category_tag(None))
+    try:
+        client = get_redis()
+        keys = set()
+        for tag in tags:
+            keys.update(client.smembers(tag))
+        client.delete(*keys, *tags)
+    except redis.RedisError as e:
+        logger.error(f"Error invalidating cached responses: {str(e)}")
+
+def add_recent_feedback(feedbacks: Iterable[Dict[str, Any]]) -> None:
+    """
+    Add saved feedback to the recent feedback list.
+    
+    Only the newest RECENT_FEEDBACK_LIMIT entries are kept.
+    
+    Args:
+        feedbacks: Saved feedback, as returned by Feedback.to_dict
+    """
+    mapping = {encode_json(feedback): feedback["id"] for feedback in feedbacks}
+    if not mapping:
+        return
+    try:
+        pipe = get_redis().pipeline()
+        pipe.zadd(RECENT_FEEDBACK_KEY, mapping)
+        pipe.zremrangebyrank(RECENT_FEEDBACK_KEY, 0, -RECENT_FEEDBACK_LIMIT - 1)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"Error updating recent feedback: {str(e)}")
+
+def get_recent_feedback(count: int) -> Optional[List[bytes]]:
+    """
+    Get the most recently saved feedback, newest first.
+    
+    Args:
+        count: Number of entries to return
+        
+    Returns:
+        JSON-encoded feedback entries, or None if the list can't answer for
+        that many entries or Redis is unavailable
+    """
+    if count < 1:
+        return []
+    if count > RECENT_FEEDBACK_LIMIT:
+        return None
+    try:
+        pipe = get_redis().pipeline()
+        pipe.zcard(RECENT_FEEDBACK_KEY)
+        pipe.zrevrange(RECENT_FEEDBACK_KEY, 0, count - 1)
+        stored, entries = pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"Error reading recent feedback: {str(e)}")
+        return None
+    
+    # A short list, e.g. after a Redis restart, doesn't mean there is no
+    # older feedback
+    if stored < count:
+        return None
+    return entries
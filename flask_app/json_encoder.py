@@ -0,0 +1,37 @@
+"""
+Faster JSON encoding and decoding for Flask requests and responses.
+"""
+import orjson
+from flask.json import JSONDecoder, JSONEncoder
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+class OrjsonEncoder(JSONEncoder):
+    """
+    JSON encoder backed by orjson.
+    
+    jsonify encodes every response body through this class. Datetimes are
+    written natively as RFC 3339 strings, with naive ones treated as UTC.
+    Other types orjson can't serialize go through JSONEncoder.default.
+    """
+    
+    def encode(self, o):
+        option = _ORJSON_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(o, default=self.default, option=option).decode("utf-8")
+
+class OrjsonDecoder(JSONDecoder):
+    """JSON decoder backed by orjson, used for request bodies."""
+    
+    def decode(self, s):
+        return orjson.loads(s)
+
+# Handles the types orjson can't serialize itself
+_default_encoder = JSONEncoder()
+
+def encode_json(obj) -> bytes:
+    """Encode a value as JSON bytes the way responses are encoded."""
+    return orjson.dumps(obj, default=_default_encoder.default, option=_ORJSON_OPTIONS)
@@ -1,5 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
-from datetime import datetime
+from sqlalchemy import func, text
 
 db = SQLAlchemy()
 
@@ -7,15 +7,23 @@ class Feedback(db.Model):
     """Model for storing special education feedback data."""
     
     __tablename__ = 'feedback'
+    __table_args__ = (
+        # Supports the ETL DAG's keyset scan over unprocessed feedback
+        db.Index('idx_feedback_unprocessed', 'processed', 'id'),
+        # Filter by category or student, then range-scan or sort by date
+        db.Index('idx_feedback_category_created', 'category', 'created_at'),
+        db.Index('idx_feedback_student_created', 'student_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.String(50), nullable=False, index=True)
+    student_id = db.Column(db.String(50), nullable=False)
     teacher_name = db.Column(db.String(100), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
-    category = db.Column(db.String(50), nullable=False, index=True)
+    category = db.Column(db.String(50), nullable=False)
     open_feedback = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    processed = db.Column(db.Boolean, default=False)
+    # Filled in by the database on insert
+    created_at = db.Column(db.DateTime, server_default=func.now(), nullable=False)
+    processed = db.Column(db.Boolean, server_default=text('0'), nullable=False)
     
     def __init__(self, student_id, teacher_name, rating, category, open_feedback=None):
         self.student_id = student_id
@@ -33,7 +41,8 @@ class Feedback(db.Model):
             'rating': self.rating,
             'category': self.category,
             'open_feedback': self.open_feedback,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            # Serialized by the app's JSON encoder
+            'created_at': self.created_at,
             'processed': self.processed
         }
     
@@ -0,0 +1,22 @@
+"""
+Request schemas for the Flask API.
+"""
+from typing import Optional
+from pydantic import BaseModel, conint, constr, validator
+
+class FeedbackIn(BaseModel):
+    """Feedback submitted to the submit-feedback endpoint."""
+    
+    # Length limits match the Feedback columns
+    student_id: constr(max_length=50)
+    teacher_name: constr(max_length=100)
+    rating: conint(ge=1, le=5)
+    category: constr(max_length=50)
+    open_feedback: Optional[str] = None
+    
+    @validator('open_feedback')
+    def strip_open_feedback(cls, value):
+        """Strip surrounding whitespace and treat blank feedback as missing."""
+        if value is None:
+            return None
+        return value.strip() or None
@@ -0,0 +1,81 @@
+"""
+Batched dispatch of open-feedback processing tasks to Celery.
+"""
+from typing import Iterable, Optional, Tuple
+from celery import group
+from celery_tasks.process_feedback import process_open_feedback
+from utils.batcher import MicroBatcher
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bound once instead of looked up for every task
+_process_signature = process_open_feedback.s
+
+# Shorter open feedback has too little text to be worth a processing task
+MIN_PROCESSED_LENGTH = 8
+
+def should_process(open_feedback: Optional[str]) -> bool:
+    """Whether open feedback is long enough to queue for processing."""
+    return bool(open_feedback) and len(open_feedback) >= MIN_PROCESSED_LENGTH
+
+def dispatch_open_feedback(items: Iterable[Tuple[int, str]]) -> int:
+    """
+    Queue processing of several open feedback texts as one Celery group.
+    
+    Processing is best-effort and can be re-run from the database, so the
+    messages are sent non-persistent and skip the broker's disk writes.
+    
+    Args:
+        items: (feedback ID, open feedback text) pairs
+        
+    Returns:
+        int: Number of tasks queued
+    """
+    tasks = [_process_signature(feedback_id, text) for feedback_id, text in items]
+    if tasks:
+        group(tasks).apply_async(delivery_mode=1)
+    return len(tasks)
+
+class TaskBuffer:
+    """
+    Collects open-feedback processing tasks and dispatches them in groups.
+    
+    Buffered tasks are sent from a background thread once batch_size are
+    waiting, or flush_interval seconds after the first one was added,
+    whichever comes first. Anything still buffered is sent at interpreter
+    exit.
+    """
+    
+    def __init__(self, batch_size: int = 64, flush_interval: float = 0.05):
+        """
+        Initialize the task buffer.
+        
+        Args:
+            batch_size: Number of buffered tasks that triggers a dispatch
+            flush_interval: Maximum seconds a task waits before a dispatch
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._batcher = MicroBatcher(
+            dispatch_open_feedback, batch_size, flush_interval, name="feedback-task-buffer"
+        )
+    
+    def append(self, feedback_id: int, open_feedback: str) -> None:
+        """
+        Buffer processing of one feedback's open text.
+        
+        Args:
+            feedback_id: ID of the feedback record
+            open_feedback: The open-ended feedback text to process
+        """
+        self._batcher.submit((feedback_id, open_feedback))
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Dispatch any buffered tasks and stop the dispatch thread.
+        
+        Args:
+            timeout: Maximum seconds to wait for the last dispatch
+        """
+        self._batcher.stop(timeout)
@@ -0,0 +1,149 @@
+"""
+Batched database writes for submitted feedback.
+"""
+import threading
+from typing import Any, Dict, List, Optional
+from flask_app.cache import add_recent_feedback
+from flask_app.json_encoder import encode_json
+from flask_app.models import db, Feedback
+from flask_app.task_buffer import dispatch_open_feedback, should_process
+from utils.batcher import MicroBatcher
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class FeedbackWriter:
+    """
+    Saves submitted feedback to the database from a background thread.
+    
+    Queued feedback is committed in one transaction once batch_size rows
+    are waiting, or flush_interval seconds after the first one was queued,
+    whichever comes first. Anything still queued is written at interpreter
+    exit. Rows that can't be saved are appended to a JSON lines dead-letter
+    file instead of being dropped.
+    """
+    
+    def __init__(
+        self,
+        app,
+        batch_size: int = 50,
+        flush_interval: float = 0.2,
+        dead_letter_path: str = None
+    ):
+        """
+        Initialize the feedback writer.
+        
+        Args:
+            app: Flask app whose database the feedback is written to
+            batch_size: Number of queued rows that triggers a commit
+            flush_interval: Maximum seconds a row waits before a commit
+            dead_letter_path: File that rows failing on their own are
+                appended to (defaults to the app's FEEDBACK_DEAD_LETTER_PATH)
+        """
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dead_letter_path = dead_letter_path or app.config['FEEDBACK_DEAD_LETTER_PATH']
+        self._dead_letter_lock = threading.Lock()
+        self._batcher = MicroBatcher(self._write, batch_size, flush_interval, name="feedback-writer")
+    
+    def submit(self, feedback_data: Dict[str, Any]) -> None:
+        """
+        Queue validated feedback for the next batch.
+        
+        Args:
+            feedback_data: Keyword arguments for a Feedback row
+        """
+        self._batcher.submit(feedback_data)
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Write any queued feedback and stop the writer thread.
+        
+        Args:
+            timeout: Maximum seconds to wait for the last batch
+        """
+        self._batcher.stop(timeout)
+    
+    def _write(self, batch: List[Dict[str, Any]]) -> bool:
+        """
+        Insert a batch of feedback in a single commit.
+        
+        If the batch fails, its rows are retried one at a time so one bad
+        row doesn't lose the others, and rows that still fail are appended
+        to the dead-letter file.
+        
+        Args:
+            batch: Keyword arguments for each Feedback row
+        
+        Returns:
+            bool: True if every row was saved
+        """
+        with self.app.app_context():
+            saved = self._save(batch)
+            if saved is None:
+                saved = []
+                for data in batch:
+                    row = self._save([data])
+                    if row is None:
+                        self._dead_letter(data)
+                    else:
+                        saved.extend(row)
+            if not saved:
+                return False
+            
+            add_recent_feedback(saved)
+            
+            # Queue open feedback for asynchronous processing with Celery
+            try:
+                dispatch_open_feedback(
+                    (feedback["id"], feedback["open_feedback"])
+                    for feedback in saved
+                    if should_process(feedback["open_feedback"])
+                )
+            except Exception as e:
+                logger.error(f"Error dispatching open feedback tasks for {len(saved)} saved entries: {str(e)}")
+            
+            logger.info(f"Saved {len(saved)} queued feedback entries")
+            return len(saved) == len(batch)
+    
+    def _save(self, batch: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Insert feedback rows in one transaction.
+        
+        Args:
+            batch: Keyword arguments for each Feedback row
+        
+        Returns:
+            The saved rows as dictionaries, or None if the transaction failed
+        """
+        try:
+            feedbacks = [Feedback(**data) for data in batch]
+            db.session.add_all(feedbacks)
+            db.session.flush()
+            # Load the columns the database filled in with one query,
+            # before the commit expires the rows and each would be
+            # reloaded on access
+            Feedback.query.filter(Feedback.id.in_([feedback.id for feedback in feedbacks])).all()
+            saved = [feedback.to_dict() for feedback in feedbacks]
+            db.session.commit()
+            return saved
+        except Exception as e:
+            logger.error(f"Error saving {len(batch)} queued feedback entries: {str(e)}")
+            db.session.rollback()
+            return None
+    
+    def _dead_letter(self, data: Dict[str, Any]) -> None:
+        """
+        Append feedback that couldn't be saved to the dead-letter file.
+        
+        Args:
+            data: Keyword arguments for the Feedback row
+        """
+        try:
+            with self._dead_letter_lock, open(self.dead_letter_path, "ab") as f:
+                f.write(encode_json(data) + b"\n")
+            logger.error(f"Wrote unsaved feedback to {self.dead_letter_path}")
+        except Exception as e:
+            logger.error(f"Error writing unsaved feedback to {self.dead_letter_path}: {str(e)}; "
+                         f"lost entry: {data!r}")
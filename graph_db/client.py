@@ -1,13 +1,53 @@
+import atexit
 import os
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+from neo4j import Driver, GraphDatabase
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# One driver per process. It keeps a thread-safe pool of connections that
+# every GraphDBClient shares
+_driver = None
+_driver_lock = threading.Lock()
+
+# Maximum number of nodes or relationships created per UNWIND query
+BULK_BATCH_SIZE = 1000
+
+def get_driver(uri: str, user: str, password: str) -> Driver:
+    """
+    Get the shared Neo4j driver, creating it on first use.
+    
+    The driver is created with the connection settings of the first call.
+    
+    Args:
+        uri: Graph DB connection URI
+        user: Username for authentication
+        password: Password for authentication
+        
+    Returns:
+        Driver: Shared driver with a pool of connections
+    """
+    global _driver
+    if _driver is None:
+        with _driver_lock:
+            if _driver is None:
+                _driver = GraphDatabase.driver(
+                    uri,
+                    auth=(user, password),
+                    max_connection_pool_size=50,
+                    connection_acquisition_timeout=10
+                )
+                atexit.register(_driver.close)
+                logger.info(f"Connected to Graph DB at {uri}")
+    return _driver
+
 class GraphDBClient:
     """Client for interacting with a graph database."""
     
-    def __init__(self, uri: str = None, user: str = None, password: str = None):
+    def __init__(self, uri: str = None, user: str = None, password: str = None,
+                 database: str = None):
         """
         Initialize the Graph DB client.
         
@@ -15,42 +55,33 @@ class GraphDBClient:
             uri: Graph DB connection URI
             user: Username for authentication
             password: Password for authentication
+            database: Name of the database to use
         """
         self.uri = uri or os.environ.get('GRAPH_DB_URI', 'bolt://localhost:7687')
         self.user = user or os.environ.get('GRAPH_DB_USER', 'neo4j')
         self.password = password or os.environ.get('GRAPH_DB_PASSWORD', 'password')
-        self.driver = None
-        self.connected = False
+        self.database = database or os.environ.get('GRAPH_DB_DATABASE', 'neo4j')
         
+    @property
+    def driver(self) -> Driver:
+        """Shared driver; it checks connections out of its pool as needed."""
+        return get_driver(self.uri, self.user, self.password)
+    
     def connect(self) -> bool:
         """
-        Establish connection to the graph database.
+        Check that the graph database can be reached.
         
         Returns:
             bool: True if connection successful, False otherwise
         """
         try:
-            # TODO: Implement actual connection logic
-            # For example, with Neo4j:
-            # from neo4j import GraphDatabase
-            # self.driver = GraphDatabase.driver(self.uri, auth=(self.user, self.password))
-            
-            logger.info(f"Connected to Graph DB at {self.uri}")
-            self.connected = True
+            self.driver.verify_connectivity()
             return True
             
         except Exception as e:
             logger.error(f"Failed to connect to Graph DB: {str(e)}")
-            self.connected = False
             return False
     
-    def close(self):
-        """Close the database connection."""
-        if self.driver:
-            # self.driver.close()
-            self.connected = False
-            logger.info("Closed Graph DB connection")
-    
     def create_node(self, label: str, properties: Dict[str, Any]) -> Optional[str]:
         """
         Create a node in the graph database.
@@ -62,18 +93,12 @@ class GraphDBClient:
         Returns:
             Optional[str]: Node ID if created successfully, None otherwise
         """
-        if not self.connected:
-            self.connect()
-            
+        query = f"CREATE (n:{label} $props) RETURN elementId(n) AS node_id"
         try:
-            # TODO: Implement node creation logic
-            # Example query for Neo4j:
-            # query = f"CREATE (n:{label} $props) RETURN id(n) AS node_id"
-            # result = self.driver.session().run(query, props=properties)
-            # node_id = result.single()["node_id"]
-            
-            # Placeholder node ID
-            node_id = "node-123"
+            with self.driver.session(database=self.database) as session:
+                node_id = session.execute_write(
+                    lambda tx: tx.run(query, props=properties).single()["node_id"]
+                )
             
             logger.info(f"Created {label} node with ID {node_id}")
             return node_id
@@ -99,22 +124,25 @@ class GraphDBClient:
         Returns:
             bool: Success status
         """
-        if not self.connected:
-            self.connect()
-            
         properties = properties or {}
+        query = f"""
+            MATCH (a), (b)
+            WHERE elementId(a) = $source_id AND elementId(b) = $target_id
+            CREATE (a)-[r:{relationship_type} $props]->(b)
+            RETURN type(r)
+        """
             
         try:
-            # TODO: Implement relationship creation logic
-            # Example query for Neo4j:
-            # query = f"""
-            #     MATCH (a), (b) 
-            #     WHERE id(a) = $source_id AND id(b) = $target_id
-            #     CREATE (a)-[r:{relationship_type} $props]->(b)
-            #     RETURN type(r)
-            # """
-            # self.driver.session().run(query, source_id=source_id, target_id=target_id, props=properties)
-            
+            with self.driver.session(database=self.database) as session:
+                created = session.execute_write(
+                    lambda tx: tx.run(
+                        query, source_id=source_id, target_id=target_id, props=properties
+                    ).single()
+                )
+            
+            if created is None:
+                logger.error(f"Nodes {source_id} and {target_id} not found for {relationship_type} relationship")
+                return False
             logger.info(f"Created {relationship_type} relationship between nodes {source_id} and {target_id}")
             return True
             
@@ -122,30 +150,95 @@ class GraphDBClient:
             logger.error(f"Error creating relationship: {str(e)}")
             return False
     
-    def query(self, query: str, parameters: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    def create_nodes_bulk(self, label: str, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create many nodes with one query per batch of BULK_BATCH_SIZE.
+        
+        Args:
+            label: Node label (type)
+            rows: Properties of each node
+            
+        Returns:
+            List[str]: IDs of the created nodes, in the order of rows. Empty
+            if creation failed.
+        """
+        query = f"UNWIND $rows AS row CREATE (n:{label}) SET n = row RETURN elementId(n) AS node_id"
+        node_ids = []
+        try:
+            with self.driver.session(database=self.database) as session:
+                for i in range(0, len(rows), BULK_BATCH_SIZE):
+                    batch = rows[i:i + BULK_BATCH_SIZE]
+                    node_ids.extend(session.execute_write(
+                        lambda tx: [record["node_id"] for record in tx.run(query, rows=batch)]
+                    ))
+            
+            logger.info(f"Created {len(node_ids)} {label} nodes")
+            return node_ids
+            
+        except Exception as e:
+            logger.error(f"Error creating {label} nodes in bulk: {str(e)}")
+            return []
+    
+    def create_relationships_bulk(self, 
+                                  relationship_type: str,
+                                  relationships: List[Tuple[str, str, Optional[Dict[str, Any]]]]) -> bool:
+        """
+        Create many relationships with one query per batch of BULK_BATCH_SIZE.
+        
+        Args:
+            relationship_type: Type of the relationships
+            relationships: (source node ID, target node ID, properties) for
+                each relationship
+            
+        Returns:
+            bool: Success status
+        """
+        query = f"""
+            UNWIND $pairs AS pair
+            MATCH (a) WHERE elementId(a) = pair.source_id
+            MATCH (b) WHERE elementId(b) = pair.target_id
+            CREATE (a)-[r:{relationship_type}]->(b)
+            SET r = pair.props
+        """
+        pairs = [
+            {"source_id": source_id, "target_id": target_id, "props": properties or {}}
+            for source_id, target_id, properties in relationships
+        ]
+        
+        try:
+            with self.driver.session(database=self.database) as session:
+                for i in range(0, len(pairs), BULK_BATCH_SIZE):
+                    batch = pairs[i:i + BULK_BATCH_SIZE]
+                    session.execute_write(lambda tx: tx.run(query, pairs=batch).consume())
+            
+            logger.info(f"Created {len(pairs)} {relationship_type} relationships")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error creating {relationship_type} relationships in bulk: {str(e)}")
+            return False
+    
+    def query(self, query: str, parameters: Dict[str, Any] = None, write: bool = False) -> List[Dict[str, Any]]:
         """
         Execute a graph query.
         
         Args:
             query: The query string in the graph database query language
             parameters: Query parameters
+            write: Whether the query writes to the graph. Read queries run in
+                read transactions, which a cluster can route to any member
             
         Returns:
             List[Dict[str, Any]]: Query results
         """
-        if not self.connected:
-            self.connect()
-            
         parameters = parameters or {}
             
         try:
-            # TODO: Implement query execution logic
-            # Example for Neo4j:
-            # result = self.driver.session().run(query, parameters)
-            # records = [record.data() for record in result]
-            
-            # Placeholder query results
-            records = [{"example": "data"}]
+            with self.driver.session(database=self.database) as session:
+                execute = session.execute_write if write else session.execute_read
+                records = execute(
+                    lambda tx: [record.data() for record in tx.run(query, parameters)]
+                )
             
             logger.info(f"Executed graph query with {len(records)} results")
             return records
@@ -7,19 +7,159 @@ This module handles:
 3. Creating edges to represent relationships between nodes
 4. Loading feedback data into the graph database
 """
+import csv
+import io
+import logging
 import os
+import threading
+import time
 import uuid
 import json
+from concurrent.futures import Future
 from typing import Dict, List, Any, Optional, Union
+from cachetools import LRUCache
 from gremlin_python.driver import client
 from gremlin_python.driver.driver_remote_connection import DriverRemoteConnection
 from gremlin_python.process.anonymous_traversal import traversal
 from gremlin_python.process.graph_traversal import __
-from gremlin_python.process.traversal import T, P, Cardinality
+from gremlin_python.process.traversal import T, P, Cardinality, Merge
+from utils.batcher import MicroBatcher
 from utils.logger import get_logger
+from utils.validation import DataValidator
 
 logger = get_logger(__name__)
 
+# Number of feedback items loaded per Gremlin traversal in batch loads
+BATCH_SIZE = 50
+
+# Websocket connections kept open per loader, so concurrent traversals don't
+# wait on each other or on a new TLS handshake
+POOL_SIZE = int(os.environ.get("NEPTUNE_POOL_SIZE", 8))
+
+# Milliseconds Neptune may spend evaluating a traversal before cancelling it
+EVALUATION_TIMEOUT_MS = int(os.environ.get("NEPTUNE_EVALUATION_TIMEOUT_MS", 30000))
+
+# Batches larger than this are loaded with Neptune's bulk loader from S3 when
+# NEPTUNE_LOAD_S3_BUCKET and NEPTUNE_LOAD_IAM_ROLE_ARN are set
+BULK_LOAD_THRESHOLD = 1000
+BULK_LOAD_POLL_INTERVAL = 5
+BULK_LOAD_TIMEOUT = 60 * 60
+
+# Statuses of a bulk load job that is still running
+_BULK_LOAD_RUNNING = {'LOAD_NOT_STARTED', 'LOAD_IN_QUEUE', 'LOAD_IN_PROGRESS'}
+
+# A StreamingNeptuneLoader flushes once this many items are waiting, or this
+# many seconds after the first one was submitted
+STREAM_BATCH_SIZE = 100
+STREAM_MAX_WAIT = 0.05
+
+# Resolved vertex IDs kept per label for vertices shared by many feedback
+# items, as {identifying value: vertex ID}
+VERTEX_CACHE_SIZE = 10_000
+_CACHED_LABELS = ('Student', 'Teacher', 'Category')
+
+# Maximum number of values looked up per query when prefetching vertices
+PREFETCH_SIZE = 1000
+
+# Vertex label, identifying property and feedback data key of each vertex
+# created for a feedback item
+_VERTEX_KEYS = [
+    ('Student', 'student_id', 'student_id'),
+    ('Teacher', 'name', 'teacher_name'),
+    ('Category', 'name', 'category'),
+    ('Feedback', 'feedback_id', 'feedback_id')
+]
+
+# IAM request signers are shared per (region, endpoint) across loaders and
+# reconnects, so credentials aren't re-fetched from the instance metadata
+# service on every connect. A signer is rebuilt after AWS_AUTH_TTL seconds, or
+# sooner once its credentials are due for refresh.
+AWS_AUTH_TTL = 30 * 60
+_AWS_SESSIONS = {}
+_AWS_AUTH = {}
+_AWS_AUTH_LOCK = threading.Lock()
+
+def _get_aws_auth(region: str, endpoint: str):
+    """
+    Get the shared IAM request signer for a Neptune endpoint.
+    
+    Args:
+        region: AWS region
+        endpoint: Neptune endpoint host
+        
+    Returns:
+        AWSRequestsAuth signing requests for the neptune-db service
+    """
+    from aws_requests_auth.aws_auth import AWSRequestsAuth
+    import boto3
+    
+    key = (region, endpoint)
+    # Sessions aren't thread-safe, so credentials are fetched under the lock
+    with _AWS_AUTH_LOCK:
+        cached = _AWS_AUTH.get(key)
+        if cached is not None:
+            auth, credentials, expires_at = cached
+            # Static credentials have no refresh_needed()
+            refresh_needed = getattr(credentials, 'refresh_needed', lambda: False)
+            if time.monotonic() < expires_at and not refresh_needed():
+                return auth
+        
+        session = _AWS_SESSIONS.get(region)
+        if session is None:
+            session = _AWS_SESSIONS[region] = boto3.Session(region_name=region)
+        credentials = session.get_credentials()
+        frozen = credentials.get_frozen_credentials()
+        
+        auth = AWSRequestsAuth(
+            aws_access_key=frozen.access_key,
+            aws_secret_access_key=frozen.secret_key,
+            aws_token=frozen.token,
+            aws_host=endpoint,
+            aws_region=region,
+            aws_service='neptune-db'
+        )
+        _AWS_AUTH[key] = (auth, credentials, time.monotonic() + AWS_AUTH_TTL)
+        return auth
+
+def _vertex_value(key: str, value: Any) -> Any:
+    """Normalize an identifying property value the way it is stored."""
+    # Feedback IDs are stored as strings
+    return str(value) if key == 'feedback_id' else value
+
+def _merge_vertex(g, label: str, key: str, value: Any, extra: Dict[str, Any] = None):
+    """
+    Build a mergeV() upsert that finds a vertex by a key property or adds it.
+    
+    Args:
+        g: Traversal source
+        label: Vertex label
+        key: Property identifying the vertex
+        value: Value of the key property
+        extra: Properties set only when the vertex is added
+    """
+    match = {T.label: label, key: value}
+    create = {**match, T.id: str(uuid.uuid4())}
+    for name, prop in (extra or {}).items():
+        if prop is not None:
+            create[name] = prop
+    return g.merge_v(match).option(Merge.on_create, create)
+
+def _find_or_add_vertex(label: str, key: str, value: Any, extra: Dict[str, Any] = None):
+    """
+    Build coalesce() branches that find a vertex by a key property or add it.
+    
+    Args:
+        label: Vertex label
+        key: Property identifying the vertex
+        value: Value of the key property
+        extra: Properties set only when the vertex is added
+    """
+    add = __.addV(label).property(T.id, str(uuid.uuid4())).property(key, value)
+    for name, prop in (extra or {}).items():
+        if prop is not None:
+            add = add.property(name, prop)
+    return __.V().hasLabel(label).has(key, value).limit(1), add
+
 class NeptuneLoader:
     """
     Handles loading data into Amazon Neptune graph database.
@@ -47,109 +187,151 @@ class NeptuneLoader:
         self.region = region or os.environ.get("AWS_REGION", "us-east-1")
         self.gremlin_client = None
         self.g = None
+        self._connection = None
+        self._vertex_caches = {label: LRUCache(maxsize=VERTEX_CACHE_SIZE) for label in _CACHED_LABELS}
+        self._vertex_cache_lock = threading.Lock()
         
         if not self.endpoint:
             raise ValueError("Neptune endpoint not provided and NEPTUNE_ENDPOINT environment variable not set")
         
         self.connection_string = f"wss://{self.endpoint}:{self.port}/gremlin"
+        self.loader_url = f"https://{self.endpoint}:{self.port}/loader"
         
     def connect(self) -> bool:
         """
         Establish connection to Neptune.
         
+        The connection holds a pool of POOL_SIZE websockets that is reused by
+        every traversal until close() is called; calling connect() again
+        while connected does nothing.
+        
         Returns:
             bool: True if connection successful, False otherwise
         """
+        if self.g is not None:
+            return True
+        
         try:
             if self.use_iam_auth:
                 # Configure IAM auth
-                from aws_requests_auth.aws_auth import AWSRequestsAuth
                 from gremlin_python.driver.aiohttp.transport import AiohttpTransport
-                import boto3
                 
-                session = boto3.Session(region_name=self.region)
-                credentials = session.get_credentials()
-                
-                auth = AWSRequestsAuth(
-                    aws_access_key=credentials.access_key,
-                    aws_secret_access_key=credentials.secret_key,
-                    aws_token=credentials.token,
-                    aws_host=self.endpoint,
-                    aws_region=self.region,
-                    aws_service='neptune-db'
-                )
+                auth = _get_aws_auth(self.region, self.endpoint)
                 
                 # Create connection with IAM auth
                 connection = DriverRemoteConnection(
                     self.connection_string,
                     'g',
-                    transport_factory=lambda: AiohttpTransport(auth=auth)
+                    transport_factory=lambda: AiohttpTransport(auth=auth),
+                    pool_size=POOL_SIZE,
+                    max_workers=POOL_SIZE
                 )
             else:
                 # Create connection without IAM auth
-                connection = DriverRemoteConnection(self.connection_string, 'g')
+                connection = DriverRemoteConnection(
+                    self.connection_string,
+                    'g',
+                    pool_size=POOL_SIZE,
+                    max_workers=POOL_SIZE
+                )
+            self._connection = connection
             
             # Create traversal source
-            self.g = traversal().withRemote(connection)
+            g = traversal().withRemote(connection).with_('evaluationTimeout', EVALUATION_TIMEOUT_MS)
             
             # Test connection
-            self.g.V().limit(1).count().next()
+            g.V().limit(1).count().next()
+            self.g = g
             
             logger.info(f"Successfully connected to Neptune at {self.endpoint}:{self.port}")
             return True
             
         except Exception as e:
             logger.error(f"Error connecting to Neptune: {str(e)}")
+            self.close()
             return False
     
-    def add_student(
+    def _cached_vertex(self, label: str, value: Any) -> Optional[Any]:
+        """Get the cached vertex ID for an identifying value, if any."""
+        cache = self._vertex_caches.get(label)
+        if cache is None:
+            return None
+        with self._vertex_cache_lock:
+            return cache.get(value)
+    
+    def _cache_vertices(self, label: str, vertex_ids: Dict[Any, Any]) -> None:
+        """Remember vertex IDs by identifying value."""
+        cache = self._vertex_caches.get(label)
+        if cache is None:
+            return
+        with self._vertex_cache_lock:
+            for value, vertex_id in vertex_ids.items():
+                if vertex_id is not None:
+                    cache[value] = vertex_id
+    
+    def close(self) -> None:
+        """Close the pooled connections to Neptune."""
+        connection, self._connection, self.g = self._connection, None, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.error(f"Error closing Neptune connection: {str(e)}")
+    
+    def _add_vertex(
         self,
-        student_id: str,
-        properties: Dict[str, Any] = None
+        label: str,
+        key: str,
+        value: Any,
+        properties: Dict[str, Any]
     ) -> Optional[str]:
         """
-        Add a Student node to the graph.
+        Add a vertex identified by a key property, unless it already exists.
         
         Args:
-            student_id: Unique identifier for the student
-            properties: Additional properties for the student node
+            label: Vertex label
+            key: Property identifying the vertex
+            value: Value of the key property
+            properties: Additional properties, set only when the vertex is added
             
         Returns:
             Optional[str]: Vertex ID if successful, None otherwise
         """
         try:
-            if properties is None:
-                properties = {}
-            
-            # Check if student already exists
-            existing = self.g.V().hasLabel('Student').has('student_id', student_id).count().next()
-            
-            if existing > 0:
-                logger.info(f"Student with ID {student_id} already exists, retrieving vertex")
-                vertex_id = self.g.V().hasLabel('Student').has('student_id', student_id).id().next()
+            vertex_id = self._cached_vertex(label, value)
+            if vertex_id is not None:
                 return vertex_id
             
-            # Add student vertex
-            vertex = self.g.addV('Student').property(T.id, str(uuid.uuid4()))
-            
-            # Add student_id as a property
-            vertex = vertex.property('student_id', student_id)
+            # Find the vertex or add it with its additional properties in
+            # one atomic request
+            vertex_id = _merge_vertex(self.g, label, key, value, properties).id().next()
             
-            # Add additional properties
-            for key, value in properties.items():
-                if value is not None:
-                    vertex = vertex.property(key, value)
-            
-            # Execute and get the vertex ID
-            vertex_id = vertex.id().next()
-            
-            logger.info(f"Added Student node with ID {vertex_id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Upserted {label} node with ID {vertex_id}")
+            self._cache_vertices(label, {value: vertex_id})
             return vertex_id
             
         except Exception as e:
-            logger.error(f"Error adding student: {str(e)}")
+            logger.error(f"Error adding {label.lower()}: {str(e)}")
             return None
     
+    def add_student(
+        self,
+        student_id: str,
+        properties: Dict[str, Any] = None
+    ) -> Optional[str]:
+        """
+        Add a Student node to the graph.
+        
+        Args:
+            student_id: Unique identifier for the student
+            properties: Additional properties for the student node
+            
+        Returns:
+            Optional[str]: Vertex ID if successful, None otherwise
+        """
+        return self._add_vertex('Student', 'student_id', student_id, properties)
+    
     def add_teacher(
         self,
         teacher_name: str,
@@ -165,38 +347,7 @@ class NeptuneLoader:
         Returns:
             Optional[str]: Vertex ID if successful, None otherwise
         """
-        try:
-            if properties is None:
-                properties = {}
-            
-            # Check if teacher already exists
-            existing = self.g.V().hasLabel('Teacher').has('name', teacher_name).count().next()
-            
-            if existing > 0:
-                logger.info(f"Teacher with name {teacher_name} already exists, retrieving vertex")
-                vertex_id = self.g.V().hasLabel('Teacher').has('name', teacher_name).id().next()
-                return vertex_id
-            
-            # Add teacher vertex
-            vertex = self.g.addV('Teacher').property(T.id, str(uuid.uuid4()))
-            
-            # Add name as a property
-            vertex = vertex.property('name', teacher_name)
-            
-            # Add additional properties
-            for key, value in properties.items():
-                if value is not None:
-                    vertex = vertex.property(key, value)
-            
-            # Execute and get the vertex ID
-            vertex_id = vertex.id().next()
-            
-            logger.info(f"Added Teacher node with ID {vertex_id}")
-            return vertex_id
-            
-        except Exception as e:
-            logger.error(f"Error adding teacher: {str(e)}")
-            return None
+        return self._add_vertex('Teacher', 'name', teacher_name, properties)
     
     def add_category(
         self,
@@ -213,38 +364,7 @@ class NeptuneLoader:
         Returns:
             Optional[str]: Vertex ID if successful, None otherwise
         """
-        try:
-            if properties is None:
-                properties = {}
-            
-            # Check if category already exists
-            existing = self.g.V().hasLabel('Category').has('name', category_name).count().next()
-            
-            if existing > 0:
-                logger.info(f"Category with name {category_name} already exists, retrieving vertex")
-                vertex_id = self.g.V().hasLabel('Category').has('name', category_name).id().next()
-                return vertex_id
-            
-            # Add category vertex
-            vertex = self.g.addV('Category').property(T.id, str(uuid.uuid4()))
-            
-            # Add name as a property
-            vertex = vertex.property('name', category_name)
-            
-            # Add additional properties
-            for key, value in properties.items():
-                if value is not None:
-                    vertex = vertex.property(key, value)
-            
-            # Execute and get the vertex ID
-            vertex_id = vertex.id().next()
-            
-            logger.info(f"Added Category node with ID {vertex_id}")
-            return vertex_id
-            
-        except Exception as e:
-            logger.error(f"Error adding category: {str(e)}")
-            return None
+        return self._add_vertex('Category', 'name', category_name, properties)
     
     def add_feedback(
         self,
@@ -265,42 +385,12 @@ class NeptuneLoader:
         Returns:
             Optional[str]: Vertex ID if successful, None otherwise
         """
-        try:
-            if properties is None:
-                properties = {}
-            
-            # Check if feedback already exists
-            existing = self.g.V().hasLabel('Feedback').has('feedback_id', str(feedback_id)).count().next()
-            
-            if existing > 0:
-                logger.info(f"Feedback with ID {feedback_id} already exists, retrieving vertex")
-                vertex_id = self.g.V().hasLabel('Feedback').has('feedback_id', str(feedback_id)).id().next()
-                return vertex_id
-            
-            # Add feedback vertex
-            vertex = self.g.addV('Feedback').property(T.id, str(uuid.uuid4()))
-            
-            # Add basic properties
-            vertex = vertex.property('feedback_id', str(feedback_id))
-            vertex = vertex.property('rating', rating)
-            
-            if open_feedback:
-                vertex = vertex.property('open_feedback', open_feedback)
-            
-            # Add additional properties
-            for key, value in properties.items():
-                if value is not None:
-                    vertex = vertex.property(key, value)
-            
-            # Execute and get the vertex ID
-            vertex_id = vertex.id().next()
-            
-            logger.info(f"Added Feedback node with ID {vertex_id}")
-            return vertex_id
-            
-        except Exception as e:
-            logger.error(f"Error adding feedback: {str(e)}")
-            return None
+        return self._add_vertex(
+            'Feedback',
+            'feedback_id',
+            str(feedback_id),
+            {'rating': rating, 'open_feedback': open_feedback or None, **(properties or {})}
+        )
     
     def create_student_submits_feedback_edge(
         self,
@@ -334,7 +424,8 @@ class NeptuneLoader:
             # Execute
             edge.next()
             
-            logger.info(f"Created SUBMITS edge from Student {student_vertex_id} to Feedback {feedback_vertex_id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Created SUBMITS edge from Student {student_vertex_id} to Feedback {feedback_vertex_id}")
             return True
             
         except Exception as e:
@@ -373,7 +464,8 @@ class NeptuneLoader:
             # Execute
             edge.next()
             
-            logger.info(f"Created ASSIGNED_TO edge from Student {student_vertex_id} to Teacher {teacher_vertex_id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Created ASSIGNED_TO edge from Student {student_vertex_id} to Teacher {teacher_vertex_id}")
             return True
             
         except Exception as e:
@@ -412,7 +504,8 @@ class NeptuneLoader:
             # Execute
             edge.next()
             
-            logger.info(f"Created RELATED_TO edge from Feedback {feedback_vertex_id} to Category {category_vertex_id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Created RELATED_TO edge from Feedback {feedback_vertex_id} to Category {category_vertex_id}")
             return True
             
         except Exception as e:
@@ -439,6 +532,14 @@ class NeptuneLoader:
         Returns:
             Dict with status and created vertex IDs
         """
+        # Validate required fields before any request is sent
+        valid, missing = DataValidator.validate_graph_feedback(feedback_data)
+        if not valid:
+            return {
+                'status': 'error',
+                'message': f"Missing required fields: {', '.join(missing)}"
+            }
+        
         try:
             # Extract basic data
             feedback_id = feedback_data.get('feedback_id')
@@ -448,45 +549,37 @@ class NeptuneLoader:
             rating = feedback_data.get('rating')
             open_feedback = feedback_data.get('open_feedback')
             
-            # Validate required fields
-            if not all([feedback_id, student_id, teacher_name, category_name, rating]):
-                missing = []
-                if not feedback_id: missing.append('feedback_id')
-                if not student_id: missing.append('student_id')
-                if not teacher_name: missing.append('teacher_name')
-                if not category_name: missing.append('category')
-                if not rating: missing.append('rating')
-                
-                return {
-                    'status': 'error',
-                    'message': f"Missing required fields: {', '.join(missing)}"
-                }
-            
-            # Create nodes
-            student_vertex_id = self.add_student(student_id)
-            teacher_vertex_id = self.add_teacher(teacher_name)
-            category_vertex_id = self.add_category(category_name)
-            feedback_vertex_id = self.add_feedback(
-                feedback_id, 
-                rating, 
-                open_feedback
-            )
-            
-            # Create edges
-            self.create_student_submits_feedback_edge(
-                student_vertex_id, 
-                feedback_vertex_id
-            )
-            
-            self.create_student_assigned_to_teacher_edge(
-                student_vertex_id, 
-                teacher_vertex_id
-            )
-            
-            self.create_feedback_related_to_category_edge(
-                feedback_vertex_id, 
-                category_vertex_id
+            # Find or create the nodes that aren't cached concurrently; they
+            # don't depend on each other, so all requests are in flight at once
+            nodes = []
+            for label, key, value, extra in (
+                ('Student', 'student_id', student_id, None),
+                ('Teacher', 'name', teacher_name, None),
+                ('Category', 'name', category_name, None),
+                ('Feedback', 'feedback_id', str(feedback_id), {'rating': rating, 'open_feedback': open_feedback or None})
+            ):
+                node = self._cached_vertex(label, value)
+                if node is None:
+                    node = _merge_vertex(self.g, label, key, value, extra).id().promise(lambda t: t.next())
+                nodes.append(node)
+            student_vertex_id, teacher_vertex_id, category_vertex_id, feedback_vertex_id = (
+                node.result() if isinstance(node, Future) else node for node in nodes
             )
+            self._cache_vertices('Student', {student_id: student_vertex_id})
+            self._cache_vertices('Teacher', {teacher_name: teacher_vertex_id})
+            self._cache_vertices('Category', {category_name: category_vertex_id})
+            
+            # Create the edges concurrently once the nodes exist
+            edges = [
+                self.g.V(out_id).addE(label).to(__.V(in_id)).promise(lambda t: t.iterate())
+                for out_id, label, in_id in (
+                    (student_vertex_id, 'SUBMITS', feedback_vertex_id),
+                    (student_vertex_id, 'ASSIGNED_TO', teacher_vertex_id),
+                    (feedback_vertex_id, 'RELATED_TO', category_vertex_id)
+                )
+            ]
+            for edge in edges:
+                edge.result()
             
             return {
                 'status': 'success',
@@ -510,6 +603,12 @@ class NeptuneLoader:
         """
         Load multiple feedback items into the graph in batch.
         
+        Each traversal sent to Neptune loads up to BATCH_SIZE items, finding
+        or adding their vertices and adding their edges, instead of making
+        several round-trips per item. Batches of more than
+        BULK_LOAD_THRESHOLD items go through bulk_load_feedback() instead
+        when an S3 bucket and IAM role for the bulk loader are configured.
+        
         Args:
             feedback_data_list: List of feedback data dictionaries
                 
@@ -518,23 +617,335 @@ class NeptuneLoader:
         """
         success_count = 0
         failed_items = []
+        valid_items = []
         
+        # Invalid items fail without any request being sent
         for feedback_data in feedback_data_list:
-            result = self.load_feedback_into_graph(feedback_data)
-            
-            if result.get('status') == 'success':
-                success_count += 1
-            else:
+            valid, missing = DataValidator.validate_graph_feedback(feedback_data)
+            if not valid:
                 failed_items.append({
                     'feedback_data': feedback_data,
-                    'error': result.get('message')
+                    'error': f"Missing required fields: {', '.join(missing)}"
                 })
+            else:
+                valid_items.append(feedback_data)
+        
+        s3_bucket = os.environ.get("NEPTUNE_LOAD_S3_BUCKET")
+        iam_role_arn = os.environ.get("NEPTUNE_LOAD_IAM_ROLE_ARN")
+        if len(valid_items) > BULK_LOAD_THRESHOLD and s3_bucket and iam_role_arn:
+            result = self.bulk_load_feedback(valid_items, s3_bucket, iam_role_arn)
+            result['failed_items'] = failed_items + result['failed_items']
+            result['failed_count'] = len(result['failed_items'])
+            return result
         
+        existing = self._prefetch_existing(valid_items)
+        
+        for i in range(0, len(valid_items), BATCH_SIZE):
+            chunk = valid_items[i:i + BATCH_SIZE]
+            try:
+                self._load_feedback_chunk(chunk, existing)
+                success_count += len(chunk)
+            except Exception as e:
+                logger.error(f"Error loading batch of {len(chunk)} feedback items into graph: {str(e)}")
+                failed_items.extend(
+                    {'feedback_data': feedback_data, 'error': str(e)}
+                    for feedback_data in chunk
+                )
+        
+        logger.info(f"Loaded {success_count} feedback items into graph, {len(failed_items)} failed")
         return {
             'success_count': success_count,
             'failed_count': len(failed_items),
             'failed_items': failed_items
         }
+    
+    def bulk_load_feedback(
+        self,
+        feedback_data_list: List[Dict[str, Any]],
+        s3_bucket: str,
+        iam_role_arn: str,
+        s3_prefix: str = "neptune-load"
+    ) -> Dict[str, Any]:
+        """
+        Load feedback items with Neptune's bulk loader.
+        
+        The vertices that don't exist yet and the edges are written as
+        Gremlin load CSV files to S3, and Neptune is asked to load them; this
+        waits until the load job finishes. Much faster than traversals for
+        large batches.
+        
+        Args:
+            feedback_data_list: Validated feedback data dictionaries
+            s3_bucket: S3 bucket for the load files
+            iam_role_arn: IAM role Neptune assumes to read the bucket
+            s3_prefix: Key prefix for the load files
+            
+        Returns:
+            Dict with success count and failed items
+        """
+        import boto3
+        import requests
+        
+        existing = self._prefetch_existing(feedback_data_list)
+        
+        vertices = io.StringIO()
+        vertex_writer = csv.writer(vertices)
+        vertex_writer.writerow([
+            '~id', '~label', 'student_id:String', 'name:String',
+            'feedback_id:String', 'rating:Int', 'open_feedback:String'
+        ])
+        edges = io.StringIO()
+        edge_writer = csv.writer(edges)
+        edge_writer.writerow(['~id', '~from', '~to', '~label'])
+        
+        # Vertices added by this load, by label and identifying value
+        added = {label: {} for label, _, _ in _VERTEX_KEYS}
+        
+        def vertex(label, key, value, row):
+            value = _vertex_value(key, value)
+            vertex_id = existing[label].get(value) or added[label].get(value)
+            if vertex_id is None:
+                vertex_id = added[label][value] = str(uuid.uuid4())
+                vertex_writer.writerow([vertex_id, label] + row)
+            return vertex_id
+        
+        for feedback_data in feedback_data_list:
+            student = vertex('Student', 'student_id', feedback_data['student_id'],
+                             [feedback_data['student_id'], '', '', '', ''])
+            teacher = vertex('Teacher', 'name', feedback_data['teacher_name'],
+                             ['', feedback_data['teacher_name'], '', '', ''])
+            category = vertex('Category', 'name', feedback_data['category'],
+                              ['', feedback_data['category'], '', '', ''])
+            feedback = vertex('Feedback', 'feedback_id', feedback_data['feedback_id'], [
+                '', '', str(feedback_data['feedback_id']), feedback_data['rating'],
+                feedback_data.get('open_feedback') or ''
+            ])
+            for out_id, label, in_id in (
+                (student, 'SUBMITS', feedback),
+                (student, 'ASSIGNED_TO', teacher),
+                (feedback, 'RELATED_TO', category)
+            ):
+                edge_writer.writerow([str(uuid.uuid4()), out_id, in_id, label])
+        
+        try:
+            # Neptune loads every file under the prefix
+            prefix = f"{s3_prefix.rstrip('/')}/{uuid.uuid4()}/"
+            s3 = boto3.client('s3', region_name=self.region)
+            s3.put_object(Bucket=s3_bucket, Key=f"{prefix}vertices.csv", Body=vertices.getvalue().encode())
+            s3.put_object(Bucket=s3_bucket, Key=f"{prefix}edges.csv", Body=edges.getvalue().encode())
+            
+            auth = _get_aws_auth(self.region, self.endpoint) if self.use_iam_auth else None
+            response = requests.post(
+                self.loader_url,
+                json={
+                    'source': f"s3://{s3_bucket}/{prefix}",
+                    'format': 'csv',
+                    'iamRoleArn': iam_role_arn,
+                    'region': self.region,
+                    'failOnError': 'TRUE',
+                    'parallelism': 'HIGH'
+                },
+                auth=auth,
+                timeout=30
+            )
+            response.raise_for_status()
+            load_id = response.json()['payload']['loadId']
+            logger.info(f"Started Neptune bulk load {load_id} of {len(feedback_data_list)} feedback items")
+            
+            # Wait for the load job to finish
+            deadline = time.monotonic() + BULK_LOAD_TIMEOUT
+            while True:
+                response = requests.get(f"{self.loader_url}/{load_id}", auth=auth, timeout=30)
+                response.raise_for_status()
+                status = response.json()['payload']['overallStatus']['status']
+                if status not in _BULK_LOAD_RUNNING:
+                    break
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Bulk load {load_id} still running after {BULK_LOAD_TIMEOUT} seconds")
+                time.sleep(BULK_LOAD_POLL_INTERVAL)
+            
+            if status != 'LOAD_COMPLETED':
+                raise RuntimeError(f"Bulk load {load_id} finished with status {status}")
+            
+        except Exception as e:
+            logger.error(f"Error bulk loading {len(feedback_data_list)} feedback items into graph: {str(e)}")
+            return {
+                'success_count': 0,
+                'failed_count': len(feedback_data_list),
+                'failed_items': [
+                    {'feedback_data': feedback_data, 'error': str(e)}
+                    for feedback_data in feedback_data_list
+                ]
+            }
+        
+        for label in _CACHED_LABELS:
+            self._cache_vertices(label, added[label])
+        logger.info(f"Bulk loaded {len(feedback_data_list)} feedback items into graph")
+        return {
+            'success_count': len(feedback_data_list),
+            'failed_count': 0,
+            'failed_items': []
+        }
+    
+    def _prefetch_existing(self, feedback_data_list: List[Dict[str, Any]]) -> Dict[str, Dict[Any, Any]]:
+        """
+        Look up the IDs of vertices that already exist for feedback items.
+        
+        Each label takes one query per PREFETCH_SIZE distinct values instead
+        of one lookup per item. Values with a cached vertex ID aren't looked
+        up, and the IDs found are cached.
+        
+        Args:
+            feedback_data_list: Validated feedback data dictionaries
+            
+        Returns:
+            Dict mapping each vertex label to {identifying value: vertex ID}
+        """
+        existing = {}
+        for label, key, data_key in _VERTEX_KEYS:
+            found = {}
+            values = []
+            for value in {_vertex_value(key, feedback_data[data_key]) for feedback_data in feedback_data_list}:
+                vertex_id = self._cached_vertex(label, value)
+                if vertex_id is None:
+                    values.append(value)
+                else:
+                    found[value] = vertex_id
+            try:
+                for i in range(0, len(values), PREFETCH_SIZE):
+                    rows = (
+                        self.g.V().hasLabel(label).has(key, P.within(values[i:i + PREFETCH_SIZE]))
+                        .project('value', 'id').by(key).by(T.id)
+                        .toList()
+                    )
+                    found.update((row['value'], row['id']) for row in rows)
+            except Exception as e:
+                # Vertices that weren't prefetched are looked up while loading
+                logger.error(f"Error prefetching {label} vertices: {str(e)}")
+            self._cache_vertices(label, found)
+            existing[label] = found
+        return existing
+    
+    def _load_feedback_chunk(self, chunk: List[Dict[str, Any]], existing: Dict[str, Dict[Any, Any]]) -> None:
+        """
+        Load feedback items into the graph with a single traversal.
+        
+        Args:
+            chunk: Validated feedback data dictionaries
+            existing: IDs of vertices known to exist, from _prefetch_existing
+        """
+        def vertex(traversal, label, key, value, extra=None):
+            # Known vertices are fetched by ID, others found or added
+            value = _vertex_value(key, value)
+            vertex_id = existing.get(label, {}).get(value)
+            if vertex_id is not None:
+                return traversal.V(vertex_id)
+            return traversal.coalesce(*_find_or_add_vertex(label, key, value, extra))
+        
+        traversal = self.g.inject(0)
+        for n, feedback_data in enumerate(chunk):
+            student, teacher, category, feedback = (f"s{n}", f"t{n}", f"c{n}", f"f{n}")
+            traversal = vertex(traversal, 'Student', 'student_id', feedback_data['student_id']).as_(student)
+            traversal = vertex(traversal, 'Teacher', 'name', feedback_data['teacher_name']).as_(teacher)
+            traversal = vertex(traversal, 'Category', 'name', feedback_data['category']).as_(category)
+            traversal = vertex(
+                traversal,
+                'Feedback',
+                'feedback_id',
+                feedback_data['feedback_id'],
+                {
+                    'rating': feedback_data['rating'],
+                    'open_feedback': feedback_data.get('open_feedback') or None
+                }
+            ).as_(feedback)
+            traversal = (
+                traversal
+                .addE('SUBMITS').from_(student).to(feedback)
+                .addE('ASSIGNED_TO').from_(student).to(teacher)
+                .addE('RELATED_TO').from_(feedback).to(category)
+            )
+        
+        traversal.iterate()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Loaded batch of {len(chunk)} feedback items into graph")
+
+class StreamingNeptuneLoader:
+    """
+    Loads feedback submitted one item at a time into Neptune in batches.
+    
+    A background thread collects submitted items and loads them with
+    NeptuneLoader.batch_load_feedback() once STREAM_BATCH_SIZE are waiting,
+    or STREAM_MAX_WAIT seconds after the first one was submitted, whichever
+    comes first. Slow streams are flushed in small batches without waiting
+    long, fast ones in full batches. Anything still queued is loaded at
+    interpreter exit.
+    """
+    
+    def __init__(
+        self,
+        loader: NeptuneLoader,
+        batch_size: int = STREAM_BATCH_SIZE,
+        max_wait: float = STREAM_MAX_WAIT
+    ):
+        """
+        Initialize the streaming loader.
+        
+        Args:
+            loader: Connected loader the batches are loaded with
+            batch_size: Number of waiting items that triggers a load
+            max_wait: Maximum seconds an item waits before a load
+        """
+        self.loader = loader
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._batcher = MicroBatcher(self._load, batch_size, max_wait, name="neptune-loader")
+    
+    def submit(self, feedback_data: Dict[str, Any]) -> Future:
+        """
+        Queue a feedback item for the next batch.
+        
+        Args:
+            feedback_data: Feedback data dictionary, as for load_feedback_into_graph
+            
+        Returns:
+            Future resolving to None once the item is loaded, or raising
+            the error it failed with
+        """
+        future = Future()
+        self._batcher.submit((feedback_data, future))
+        return future
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Load any queued feedback and stop the loader thread.
+        
+        Args:
+            timeout: Maximum seconds to wait for the last batch
+        """
+        self._batcher.stop(timeout)
+    
+    def _load(self, batch: List[tuple]) -> None:
+        """
+        Load a batch and resolve the futures of its items.
+        
+        Args:
+            batch: (feedback data, future) pairs
+        """
+        try:
+            result = self.loader.batch_load_feedback([feedback_data for feedback_data, _ in batch])
+        except Exception as e:
+            logger.error(f"Error loading {len(batch)} streamed feedback items into graph: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        
+        errors = {id(failed['feedback_data']): failed['error'] for failed in result['failed_items']}
+        for feedback_data, future in batch:
+            error = errors.get(id(feedback_data))
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(RuntimeError(error))
 
 # Example usage function
 def load_feedback_example():
@@ -0,0 +1,47 @@
+"""
+Gunicorn settings for the Flask API.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('FLASK_PORT', '5000')}"
+
+# Threaded workers so requests waiting on a backend don't block each other
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+
+# Recycle workers periodically, staggered so they don't restart together
+max_requests = 2000
+max_requests_jitter = 200
+
+def post_worker_init(worker):
+    """
+    Open the Elasticsearch, database and broker connections before the first request.
+    
+    This is best-effort: an exception here would fail the worker boot and
+    halt the whole server, so a backend that is down only logs a warning and
+    is connected on first use instead.
+    """
+    from celery_tasks.celery import app as celery_app
+    from elastic_search.search import get_client
+    from flask_app.app import app
+    from flask_app.models import db
+    
+    try:
+        get_client()
+    except Exception as e:
+        worker.log.warning(f"Elasticsearch warm-up failed: {str(e)}")
+    
+    try:
+        with app.app_context():
+            db.engine.connect().close()
+    except Exception as e:
+        worker.log.warning(f"Database warm-up failed: {str(e)}")
+    
+    # Put a connected broker connection in Celery's pool for the first publish
+    try:
+        with celery_app.pool.acquire(block=True) as connection:
+            connection.ensure_connection(max_retries=1)
+    except Exception as e:
+        worker.log.warning(f"Broker warm-up failed: {str(e)}")
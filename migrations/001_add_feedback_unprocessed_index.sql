@@ -0,0 +1,16 @@
+-- Composite index backing the ETL DAG's keyset-paginated scan for
+-- unprocessed feedback (WHERE processed = 0 AND id > ? ORDER BY id).
+-- New databases get this index from db.create_all(); run this on
+-- databases created before it was added to the Feedback model.
+-- MySQL has no CREATE INDEX IF NOT EXISTS, so the index is only created
+-- when information_schema doesn't list it yet and the file can be re-run.
+SET @stmt = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'feedback'
+       AND index_name = 'idx_feedback_unprocessed') = 0,
+    'CREATE INDEX idx_feedback_unprocessed ON feedback (processed, id)',
+    'DO 0'
+);
+PREPARE stmt FROM @stmt;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
@@ -0,0 +1,51 @@
+-- Composite indexes for reads that filter by category or student and
+-- filter or order by created_at, so MySQL can range-scan the index instead
+-- of filesorting. They lead with the columns of the old single-column
+-- indexes, which are dropped as redundant.
+-- New databases get these indexes from db.create_all(); run this on
+-- databases created before they were added to the Feedback model.
+-- Each statement only runs when information_schema shows it is still
+-- needed, so the file can be re-run and is a no-op on new databases.
+SET @stmt = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'feedback'
+       AND index_name = 'idx_feedback_category_created') = 0,
+    'CREATE INDEX idx_feedback_category_created ON feedback (category, created_at)',
+    'DO 0'
+);
+PREPARE stmt FROM @stmt;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @stmt = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'feedback'
+       AND index_name = 'idx_feedback_student_created') = 0,
+    'CREATE INDEX idx_feedback_student_created ON feedback (student_id, created_at)',
+    'DO 0'
+);
+PREPARE stmt FROM @stmt;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @stmt = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'feedback'
+       AND index_name = 'ix_feedback_category') > 0,
+    'DROP INDEX ix_feedback_category ON feedback',
+    'DO 0'
+);
+PREPARE stmt FROM @stmt;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
+
+SET @stmt = IF(
+    (SELECT COUNT(*) FROM information_schema.statistics
+     WHERE table_schema = DATABASE() AND table_name = 'feedback'
+       AND index_name = 'ix_feedback_student_id') > 0,
+    'DROP INDEX ix_feedback_student_id ON feedback',
+    'DO 0'
+);
+PREPARE stmt FROM @stmt;
+EXECUTE stmt;
+DEALLOCATE PREPARE stmt;
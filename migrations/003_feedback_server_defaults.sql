@@ -0,0 +1,11 @@
+-- Let MySQL fill in created_at and processed on insert instead of the app.
+-- New databases get these defaults from db.create_all(); run this on
+-- databases created before they were added to the Feedback model.
+-- CURRENT_TIMESTAMP follows the session time zone; the app pins its
+-- sessions to UTC (see Config.SQLALCHEMY_ENGINE_OPTIONS), so other clients
+-- inserting feedback must do the same.
+UPDATE feedback SET created_at = UTC_TIMESTAMP() WHERE created_at IS NULL;
+UPDATE feedback SET processed = 0 WHERE processed IS NULL;
+ALTER TABLE feedback
+    MODIFY created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    MODIFY processed TINYINT(1) NOT NULL DEFAULT 0;
@@ -358,6 +358,7 @@ if [[ "$start_flask" =~ ^[Yy]$ ]]; then
     print_info "Starting Flask application in the background..."
     export FLASK_APP=flask_app.app
     export FLASK_ENV=development
+    flask init
     flask run --host=0.0.0.0 --port=5000 > logs/flask.log 2>&1 &
     FLASK_PID=$!
     print_success "Flask application started with PID: $FLASK_PID"
@@ -366,6 +367,7 @@ else
     print_info "Skipping Flask application. You can start it later with:"
     print_info "export FLASK_APP=flask_app.app"
     print_info "export FLASK_ENV=development"
+    print_info "flask init"
     print_info "flask run --host=0.0.0.0 --port=5000"
 fi
 
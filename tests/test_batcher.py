@@ -0,0 +1,44 @@
+"""
+Tests for the micro-batcher shared by the background writers.
+"""
+import os
+import sys
+import threading
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.batcher import MicroBatcher
+
+def test_flushes_full_batches_and_the_rest_on_stop():
+    batches = []
+    batcher = MicroBatcher(batches.append, batch_size=3, max_wait=60, name="test-batcher")
+    for item in range(7):
+        batcher.submit(item)
+    batcher.stop()
+
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+def test_flushes_after_max_wait():
+    flushed = threading.Event()
+    batcher = MicroBatcher(lambda batch: flushed.set(), batch_size=100, max_wait=0.01, name="test-batcher")
+    try:
+        batcher.submit(1)
+        assert flushed.wait(5)
+    finally:
+        batcher.stop()
+
+def test_keeps_flushing_after_an_error():
+    batches = []
+
+    def flush(batch):
+        batches.append(batch)
+        if len(batches) == 1:
+            raise RuntimeError("flush failed")
+
+    batcher = MicroBatcher(flush, batch_size=1, max_wait=60, name="test-batcher")
+    batcher.submit(1)
+    batcher.submit(2)
+    batcher.stop()
+
+    assert batches == [[1], [2]]
@@ -0,0 +1,74 @@
+"""
+Tests that the batched feedback writer keeps saving after errors.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("flask_sqlalchemy")
+pytest.importorskip("celery")
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask import Flask
+from flask_app import writer
+from flask_app.config import TestingConfig
+from flask_app.models import db, Feedback
+
+def make_feedback(student_id):
+    return {
+        "student_id": student_id,
+        "teacher_name": "Ms. Johnson",
+        "rating": 4,
+        "category": "reading",
+        "open_feedback": "Shows great improvement in phonemic awareness"
+    }
+
+def wait_for_rows(app, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with app.app_context():
+            if Feedback.query.count() >= count:
+                return True
+        time.sleep(0.01)
+    return False
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config.from_object(TestingConfig)
+    app.config["FEEDBACK_DEAD_LETTER_PATH"] = str(tmp_path / "dead_letter.jsonl")
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.drop_all()
+
+def test_writer_survives_dispatch_error(app, monkeypatch):
+    dispatched = []
+
+    def dispatch(items):
+        dispatched.append(list(items))
+        if len(dispatched) == 1:
+            raise ConnectionError("broker is down")
+        return len(dispatched[-1])
+
+    monkeypatch.setattr(writer, "dispatch_open_feedback", dispatch)
+    monkeypatch.setattr(writer, "add_recent_feedback", lambda feedbacks: None)
+
+    feedback_writer = writer.FeedbackWriter(app, batch_size=1, flush_interval=0.01)
+    try:
+        feedback_writer.submit(make_feedback("S1"))
+        assert wait_for_rows(app, 1)
+
+        feedback_writer.submit(make_feedback("S2"))
+        assert wait_for_rows(app, 2)
+    finally:
+        feedback_writer.stop()
+
+    # The batch after the failed dispatch was saved and dispatched
+    assert len(dispatched) == 2
@@ -0,0 +1,43 @@
+"""
+Tests that undecodable or mistyped request bodies are rejected with a 400.
+"""
+import os
+import sys
+
+import pytest
+
+msgpack = pytest.importorskip("msgpack")
+pytest.importorskip("flask_sqlalchemy")
+pytest.importorskip("celery")
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask_app.app import app
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+@pytest.mark.parametrize("body", [b"\xc1", b"\x93\x01", msgpack.packb({"a": 1}) + b"\x01"])
+def test_malformed_msgpack_is_rejected(client, body):
+    response = client.post("/submit-feedback", data=body, content_type="application/msgpack")
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+def test_malformed_json_is_rejected(client):
+    response = client.post("/submit-feedback", data=b"{", content_type="application/json")
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+def test_non_object_body_is_rejected(client):
+    response = client.post("/submit-feedback", data=msgpack.packb([1, 2]),
+                           content_type="application/msgpack")
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Request body must be an object"
+
+def test_bulk_requires_array(client):
+    response = client.post("/api/feedback/bulk", data=msgpack.packb({"a": 1}),
+                           content_type="application/msgpack")
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Request body must be an array"
@@ -0,0 +1,101 @@
+"""
+Tests for the Redis response cache of the search endpoint.
+"""
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("flask_sqlalchemy")
+pytest.importorskip("celery")
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from flask_app import app as app_module
+from flask_app import cache
+
+RESULTS = {
+    "hits": [{"_id": "1", "_score": 1.5, "category": "reading"}],
+    "total": 1,
+    "max_score": 1.5
+}
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(cache, "_redis", client)
+    return client
+
+@pytest.fixture
+def search(monkeypatch):
+    search = mock.Mock()
+    search.uncached.return_value = RESULTS
+    monkeypatch.setattr(app_module, "advanced_feedback_search", search)
+    return search
+
+@pytest.fixture
+def client(redis_client, search):
+    return app_module.app.test_client()
+
+def test_miss_then_hit(client, search):
+    miss = client.get("/search-feedback?q=reading")
+    assert miss.status_code == 200
+    assert miss.headers.get("ETag") is None
+    assert miss.get_json()["results"] == RESULTS["hits"]
+
+    hit = client.get("/search-feedback?q=reading")
+    assert hit.status_code == 200
+    assert hit.headers.get("ETag")
+    assert hit.get_data() == miss.get_data()
+    assert search.uncached.call_count == 1
+
+def test_failed_search_is_not_cached(client, search):
+    search.uncached.return_value = {"error": "unavailable", "hits": [], "total": 0, "max_score": None}
+    client.get("/search-feedback?q=reading").get_data()
+    client.get("/search-feedback?q=reading").get_data()
+    assert search.uncached.call_count == 2
+
+def test_category_invalidation(client, search):
+    client.get("/search-feedback?category=reading").get_data()
+    client.get("/search-feedback?category=math").get_data()
+    assert search.uncached.call_count == 2
+
+    cache.invalidate_categories(["reading"])
+
+    client.get("/search-feedback?category=math").get_data()
+    assert search.uncached.call_count == 2
+    client.get("/search-feedback?category=reading").get_data()
+    assert search.uncached.call_count == 3
+
+def test_uncategorized_results_are_invalidated_by_any_category(client, search):
+    client.get("/search-feedback?q=reading").get_data()
+    cache.invalidate_categories(["math"])
+    client.get("/search-feedback?q=reading").get_data()
+    assert search.uncached.call_count == 2
+
+def test_not_modified_when_etag_matches(client):
+    client.get("/search-feedback?q=reading").get_data()
+    etag = client.get("/search-feedback?q=reading").headers["ETag"]
+
+    response = client.get("/search-feedback?q=reading", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get("/search-feedback?q=reading", headers={"If-None-Match": 'W/"other"'})
+    assert response.status_code == 200
+
+def test_recent_feedback_short_circuit(client, search):
+    cache.add_recent_feedback([{"id": i, "category": "reading"} for i in range(1, 4)])
+
+    response = client.get("/search-feedback?size=2")
+    assert response.status_code == 200
+    assert [feedback["id"] for feedback in response.get_json()["results"]] == [3, 2]
+    assert search.uncached.call_count == 0
+
+    # More entries than are stored fall back to a search
+    client.get("/search-feedback?size=5").get_data()
+    assert search.uncached.call_count == 1
@@ -0,0 +1,111 @@
+"""
+Micro-batching of items submitted one at a time from many threads.
+"""
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Queued after the last item to stop the flush thread
+_STOP = object()
+
+class MicroBatcher:
+    """
+    Collects submitted items and flushes them in batches from a background thread.
+    
+    A batch is flushed once batch_size items are waiting, or max_wait seconds
+    after the first one was submitted, whichever comes first. Errors raised
+    by the flush callback are logged and the thread moves on to the next
+    batch. Anything still queued is flushed at interpreter exit.
+    """
+    
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], Any],
+        batch_size: int,
+        max_wait: float,
+        name: str
+    ):
+        """
+        Initialize the batcher.
+        
+        Args:
+            flush: Called from the background thread with each batch
+            batch_size: Number of waiting items that triggers a flush
+            max_wait: Maximum seconds an item waits before a flush
+            name: Name of the background thread, also used in log messages
+        """
+        self.flush = flush
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.name = name
+        self._queue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        atexit.register(self.stop)
+    
+    def submit(self, item: Any) -> None:
+        """
+        Queue an item for the next batch, starting the flush thread if needed.
+        
+        Args:
+            item: Item to flush
+        """
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run,
+                        name=self.name,
+                        daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put(item)
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Flush any queued items and stop the flush thread.
+        
+        Args:
+            timeout: Maximum seconds to wait for the last batch
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+    
+    def _run(self) -> None:
+        """Collect queued items into batches and flush them."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            try:
+                self.flush(batch)
+            except Exception as e:
+                logger.error(f"Error flushing {len(batch)} items in {self.name}: {str(e)}")
+            if stopping:
+                return
@@ -1,22 +1,30 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
 from datetime import datetime
 
-def get_logger(name, level=logging.INFO):
-    """
-    Configure and return a logger with the given name.
-    
-    Args:
-        name: Logger name, typically __name__ from the calling module
-        level: Logging level
-        
-    Returns:
-        logging.Logger: Configured logger
-    """
-    # Create logger
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
+# The log format doesn't use thread details, so records skip collecting
+# them. Process details are left on: this setting is process-wide, and
+# gunicorn's and Celery's formats use them
+logging.logThreads = False
+
+# Handlers are created once per process and shared by every logger, and each
+# logger gets them only once however many times get_logger is called for it.
+# Loggers only put records on a queue; a background listener thread writes
+# them to the console and file, so logging calls don't wait on I/O.
+_CONFIGURED = set()
+_HANDLERS = None
+_LOCK = threading.Lock()
+
+def _get_handlers():
+    """Create the shared queue handler and start its listener on first use."""
+    global _HANDLERS
+    if _HANDLERS is not None:
+        return _HANDLERS
     
     # Create formatter
     formatter = logging.Formatter(
@@ -26,7 +34,7 @@ def get_logger(name, level=logging.INFO):
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
     # Create file handler if logs directory exists
     logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
@@ -41,8 +49,55 @@ def get_logger(name, level=logging.INFO):
             logs_dir, 
             f"{datetime.now().strftime('%Y-%m-%d')}.log"
         )
-        file_handler = logging.FileHandler(log_file)
+        # Every gunicorn worker and Celery child appends to the same file, so
+        # none of them rotates it; the handler reopens the file after an
+        # external logrotate moves it
+        file_handler = logging.handlers.WatchedFileHandler(log_file)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    queue_handler = logging.handlers.QueueHandler(None)
+    
+    def start_listener():
+        queue_handler.queue = queue.Queue(-1)
+        listener = logging.handlers.QueueListener(
+            queue_handler.queue, *handlers, respect_handler_level=True
+        )
+        listener.start()
+        # Write out the records still queued at exit
+        atexit.register(listener.stop)
+    
+    start_listener()
+    # Forked workers (Celery, gunicorn) don't inherit the listener thread
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=start_listener)
+    
+    _HANDLERS = [queue_handler]
+    return _HANDLERS
+
+def get_logger(name, level=logging.INFO):
+    """
+    Configure and return a logger with the given name.
+    
+    Calling this again for the same name only updates the level; the
+    handler is shared and attached once. Records are written to the console
+    and the log file from a background thread.
+    
+    Args:
+        name: Logger name, typically __name__ from the calling module
+        level: Logging level
+        
+    Returns:
+        logging.Logger: Configured logger
+    """
+    # Create logger
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    
+    with _LOCK:
+        if name not in _CONFIGURED:
+            for handler in _get_handlers():
+                logger.addHandler(handler)
+            _CONFIGURED.add(name)
     
     return logger
@@ -1,3 +1,4 @@
+from operator import itemgetter
 from typing import Dict, Any, List, Tuple, Optional
 from utils.logger import get_logger
 
@@ -6,6 +7,24 @@ logger = get_logger(__name__)
 class DataValidator:
     """Utility for validating data structures."""
     
+    # Required fields, in the order missing ones are reported
+    _FEEDBACK_FIELDS = ('content', 'source', 'timestamp')
+    _FEEDBACK_REQUIRED = frozenset(_FEEDBACK_FIELDS)
+    _get_feedback_text = itemgetter('content', 'source')
+    _EMBEDDING_FIELDS = ('text', 'id')
+    _EMBEDDING_REQUIRED = frozenset(_EMBEDDING_FIELDS)
+    _get_embedding_text = itemgetter('text', 'id')
+    _GRAPH_FEEDBACK_FIELDS = ('feedback_id', 'student_id', 'teacher_name', 'category', 'rating')
+    _GRAPH_FEEDBACK_REQUIRED = frozenset(_GRAPH_FEEDBACK_FIELDS)
+    _get_graph_feedback_fields = itemgetter(*_GRAPH_FEEDBACK_FIELDS)
+    
+    @staticmethod
+    def _missing_field(data: Dict[str, Any], required: frozenset, fields: Tuple[str, ...]) -> Optional[str]:
+        """Get the first required field missing from data, if any."""
+        if data.keys() >= required:
+            return None
+        return next(field for field in fields if field not in data)
+    
     @staticmethod
     def validate_feedback(data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """
@@ -19,19 +38,21 @@ class DataValidator:
                 - bool: Whether the data is valid
                 - Optional[str]: Error message if invalid, None otherwise
         """
-        required_fields = ['content', 'source', 'timestamp']
-        
         # Check for required fields
-        for field in required_fields:
-            if field not in data:
-                return False, f"Missing required field: {field}"
+        missing = DataValidator._missing_field(
+            data, DataValidator._FEEDBACK_REQUIRED, DataValidator._FEEDBACK_FIELDS
+        )
+        if missing is not None:
+            return False, f"Missing required field: {missing}"
+        
+        content, source = DataValidator._get_feedback_text(data)
                 
         # Validate content
-        if not isinstance(data['content'], str) or len(data['content'].strip()) == 0:
+        if not isinstance(content, str) or not content.strip():
             return False, "Content must be a non-empty string"
             
         # Validate source
-        if not isinstance(data['source'], str) or len(data['source'].strip()) == 0:
+        if not isinstance(source, str) or not source.strip():
             return False, "Source must be a non-empty string"
             
         # Additional validations could be added here
@@ -51,23 +72,44 @@ class DataValidator:
                 - bool: Whether the data is valid
                 - Optional[str]: Error message if invalid, None otherwise
         """
-        required_fields = ['text', 'id']
-        
         # Check for required fields
-        for field in required_fields:
-            if field not in data:
-                return False, f"Missing required field: {field}"
+        missing = DataValidator._missing_field(
+            data, DataValidator._EMBEDDING_REQUIRED, DataValidator._EMBEDDING_FIELDS
+        )
+        if missing is not None:
+            return False, f"Missing required field: {missing}"
+        
+        text, text_id = DataValidator._get_embedding_text(data)
                 
         # Validate text
-        if not isinstance(data['text'], str) or len(data['text'].strip()) == 0:
+        if not isinstance(text, str) or not text.strip():
             return False, "Text must be a non-empty string"
             
         # Validate ID
-        if not isinstance(data['id'], str) or len(data['id'].strip()) == 0:
+        if not isinstance(text_id, str) or not text_id.strip():
             return False, "ID must be a non-empty string"
             
         return True, None
     
+    @staticmethod
+    def validate_graph_feedback(data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Validate feedback data to be loaded into the graph database.
+        
+        Args:
+            data: Feedback data to validate
+            
+        Returns:
+            Tuple containing:
+                - bool: Whether the data is valid
+                - List[str]: Required fields that are missing or empty
+        """
+        if data.keys() >= DataValidator._GRAPH_FEEDBACK_REQUIRED and all(
+            DataValidator._get_graph_feedback_fields(data)
+        ):
+            return True, []
+        return False, [field for field in DataValidator._GRAPH_FEEDBACK_FIELDS if not data.get(field)]
+    
     @staticmethod
     def sanitize_input(text: str) -> str:
         """
@@ -6,16 +6,120 @@ This module handles:
 2. Storing embeddings and metadata in Qdrant vector database
 3. Performing semantic search based on vector similarity
 """
+import hashlib
 import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-from typing import List, Dict, Any, Optional, Union
+import torch
+from typing import Callable, List, Dict, Any, Optional, Union
+from cachetools import LRUCache
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qdrant_models
 from utils.logger import get_logger
 
+try:
+    from model2vec import StaticModel
+except ImportError:  # model2vec is optional; only needed for fast_backend="model2vec"
+    StaticModel = None
+
 logger = get_logger(__name__)
 
+# Static embedding model loaded for fast_backend="model2vec"
+STATIC_MODEL_NAME = "minishlab/M2V_base_output"
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, leaving all-zero rows as they are."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+# Number of texts the model encodes per forward pass in batch operations
+ENCODE_BATCH_SIZE = 64
+
+# Points encoded and uploaded together, and sent per request, when storing
+# batches of embeddings
+UPLOAD_BATCH_SIZE = 256
+
+# Batch uploads that may be in flight while the next batch is encoded
+UPLOAD_CONCURRENCY = int(os.environ.get("QDRANT_UPLOAD_CONCURRENCY", "2"))
+
+# Feedback text is truncated to this many characters, once, for both the
+# model (which keeps only its first 256 tokens anyway) and the stored payload
+MAX_TEXT_LENGTH = 1000
+
+# Query embeddings kept per processor, so repeated searches skip the model
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Segments larger than this many kilobytes keep their full vectors in
+# memory-mapped files on disk; the int8 copies stay in RAM
+MEMMAP_THRESHOLD_KB = 20000
+
+# Searches fetch this many times the requested results from the int8 index,
+# rescore them with the full vectors and keep the best
+SEARCH_OVERSAMPLING = 2
+
+# HNSW graph settings for new collections: 16 links per node keeps the graph
+# small for 384-d vectors, and a wider build-time beam recovers the recall.
+# The graph itself is kept on disk; small segments are scanned exactly
+HNSW_M = 16
+HNSW_EF_CONSTRUCT = 128
+HNSW_FULL_SCAN_THRESHOLD = 10000
+
+# HNSW beam width for searches, and for fast searches that trade some
+# recall for less CPU per query
+SEARCH_HNSW_EF = 64
+FAST_SEARCH_HNSW_EF = 32
+
+# One Qdrant client per (host, port, grpc_port, prefer_grpc) for the whole
+# process, so processors share connections instead of opening their own
+_QDRANT_CLIENTS = {}
+_QDRANT_CLIENTS_LOCK = threading.Lock()
+
+def get_qdrant_client(host: str, port: int, grpc_port: int, prefer_grpc: bool) -> QdrantClient:
+    """
+    Get the shared Qdrant client for a server.
+    
+    Args:
+        host: Qdrant server host
+        port: Qdrant REST port
+        grpc_port: Qdrant gRPC port
+        prefer_grpc: Use gRPC instead of REST
+        
+    Returns:
+        QdrantClient: Shared client
+    """
+    key = (host, port, grpc_port, prefer_grpc)
+    with _QDRANT_CLIENTS_LOCK:
+        client = _QDRANT_CLIENTS.get(key)
+        if client is None:
+            # gRPC avoids JSON encoding of vectors and payloads on every call
+            client = _QDRANT_CLIENTS[key] = QdrantClient(
+                host=host,
+                port=port,
+                grpc_port=grpc_port,
+                prefer_grpc=prefer_grpc,
+                timeout=10
+            )
+        return client
+
+class _StaticEncoder:
+    """Gives a model2vec StaticModel the SentenceTransformer encode() call shape."""
+    
+    def __init__(self, model):
+        self.model = model
+    
+    def encode(self, sentences, normalize_embeddings: bool = False, **kwargs) -> np.ndarray:
+        # Static embeddings are token-embedding averages; the transformer
+        # batching options don't apply
+        embeddings = np.asarray(self.model.encode(sentences), dtype=np.float32)
+        if normalize_embeddings:
+            embeddings = _normalize_rows(embeddings)
+        return embeddings
+
 class SemanticProcessor:
     """
     Processes feedback text into semantic embeddings and interfaces with Qdrant.
@@ -27,7 +131,15 @@ class SemanticProcessor:
         qdrant_host: str = None,
         qdrant_port: int = None,
         collection_name: str = "feedback_embeddings",
-        vector_size: int = 384  # Dimension of all-MiniLM-L6-v2 embeddings
+        vector_size: int = 384,  # Dimension of all-MiniLM-L6-v2 embeddings
+        grpc_port: int = None,
+        prefer_grpc: bool = None,
+        quantize_model: bool = None,
+        fast_backend: str = None,
+        compile_model: bool = None,
+        store_text_in_qdrant: bool = None,
+        text_lookup: Optional[Callable[[List[str]], Dict[str, str]]] = None,
+        metadata_keys: Optional[List[str]] = None
     ):
         """
         Initialize the semantic processor.
@@ -38,27 +150,77 @@ class SemanticProcessor:
             qdrant_port: Qdrant server port (defaults to environment variable or 6333)
             collection_name: Name of the Qdrant collection to use
             vector_size: Dimension of the vector embeddings
+            grpc_port: Qdrant gRPC port (defaults to environment variable or 6334)
+            prefer_grpc: Use gRPC instead of REST for Qdrant calls (defaults to
+                the QDRANT_PREFER_GRPC environment variable, enabled unless "false")
+            quantize_model: Quantize the model's linear layers to int8 for
+                faster CPU inference, or run it in fp16 on GPU (defaults to
+                the EMBEDDING_QUANTIZE environment variable, disabled unless
+                "true"). The embeddings differ slightly from the full-
+                precision model's, so re-embed an existing collection when
+                turning this on
+            fast_backend: "model2vec" to embed with a static model instead of
+                the transformer (defaults to the EMBEDDING_FAST_BACKEND
+                environment variable). Much faster on CPU, but its vectors
+                aren't comparable with the transformer's, so use it with its
+                own collection_name; vector_size is taken from the model
+            compile_model: Compile the transformer with torch.compile and
+                warm it up for common batch sizes (defaults to the
+                EMBEDDING_COMPILE environment variable, disabled unless
+                "true"); needs PyTorch 2
+            store_text_in_qdrant: Keep the feedback text in each point's payload
+                (defaults to the QDRANT_STORE_TEXT environment variable,
+                enabled unless "false"). Without it Qdrant holds only IDs and
+                metadata, and search results get their text from text_lookup
+            text_lookup: Function mapping feedback IDs to their text, usually
+                read from the primary database; used by searches when
+                store_text_in_qdrant is off
+            metadata_keys: Metadata fields returned with search results; all
+                of them are returned when not given
         """
         self.model_name = model_name
         self.collection_name = collection_name
         self.vector_size = vector_size
+        self._query_embeddings = LRUCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)
+        self._query_embeddings_lock = threading.Lock()
+        if store_text_in_qdrant is None:
+            store_text_in_qdrant = os.environ.get("QDRANT_STORE_TEXT", "true").lower() != "false"
+        self.store_text_in_qdrant = store_text_in_qdrant
+        self.text_lookup = text_lookup
+        # Searches fetch only these payload fields instead of whole payloads
+        self._known_metadata_keys = tuple(metadata_keys) if metadata_keys is not None else None
         
-        # Initialize the SentenceTransformer model
-        logger.info(f"Loading SentenceTransformer model: {model_name}")
-        try:
-            self.model = SentenceTransformer(model_name)
-            logger.info(f"Successfully loaded model: {model_name}")
-        except Exception as e:
-            logger.error(f"Error loading model: {str(e)}")
-            raise
+        if fast_backend is None:
+            fast_backend = os.environ.get("EMBEDDING_FAST_BACKEND")
+        if fast_backend == "model2vec":
+            if StaticModel is None:
+                raise ImportError("fast_backend='model2vec' requires the model2vec package")
+            self.model_name = os.environ.get("EMBEDDING_STATIC_MODEL", STATIC_MODEL_NAME)
+            self.quantize_model = False
+            logger.info(f"Loading static embedding model: {self.model_name}")
+            self.model = _StaticEncoder(StaticModel.from_pretrained(self.model_name))
+            self.vector_size = len(self.model.encode(["vector size"])[0])
+        elif fast_backend:
+            raise ValueError(f"Unknown fast_backend {fast_backend!r}")
+        else:
+            self._load_transformer(model_name, quantize_model, compile_model)
         
         # Initialize Qdrant client
         self.qdrant_host = qdrant_host or os.environ.get("QDRANT_HOST", "localhost")
         self.qdrant_port = qdrant_port or int(os.environ.get("QDRANT_PORT", 6333))
+        self.qdrant_grpc_port = grpc_port or int(os.environ.get("QDRANT_GRPC_PORT", 6334))
+        if prefer_grpc is None:
+            prefer_grpc = os.environ.get("QDRANT_PREFER_GRPC", "true").lower() != "false"
+        self.prefer_grpc = prefer_grpc
         
         logger.info(f"Connecting to Qdrant at {self.qdrant_host}:{self.qdrant_port}")
         try:
-            self.qdrant_client = QdrantClient(host=self.qdrant_host, port=self.qdrant_port)
+            self.qdrant_client = get_qdrant_client(
+                self.qdrant_host,
+                self.qdrant_port,
+                self.qdrant_grpc_port,
+                self.prefer_grpc
+            )
             logger.info("Successfully connected to Qdrant")
             
             # Ensure collection exists
@@ -66,6 +228,125 @@ class SemanticProcessor:
         except Exception as e:
             logger.error(f"Error connecting to Qdrant: {str(e)}")
             raise
+        
+        self._warm_up()
+    
+    def _warm_up(self):
+        """
+        Run a throwaway search so the connection is open and the index is
+        loaded before the first real query.
+        """
+        try:
+            self.qdrant_client.search(
+                collection_name=self.collection_name,
+                query_vector=np.zeros(self.vector_size, dtype=np.float32),
+                limit=1
+            )
+        except Exception as e:
+            logger.warning(f"Error warming up Qdrant search: {str(e)}")
+    
+    def _load_transformer(
+        self,
+        model_name: str,
+        quantize_model: Optional[bool],
+        compile_model: Optional[bool]
+    ):
+        """
+        Load the SentenceTransformer model and tune it for the device.
+        
+        Args:
+            model_name: Name of the SentenceTransformer model to use
+            quantize_model: As for __init__
+            compile_model: As for __init__
+        """
+        logger.info(f"Loading SentenceTransformer model: {model_name}")
+        try:
+            self.model = SentenceTransformer(model_name)
+            if quantize_model is None:
+                quantize_model = os.environ.get("EMBEDDING_QUANTIZE", "false").lower() == "true"
+            self.quantize_model = quantize_model
+            if self.model.device.type == "cpu":
+                # Torch already uses one thread per physical core, and the
+                # setting is process-wide, so only change it when asked to,
+                # e.g. to split cores between several model processes
+                if os.environ.get("TORCH_NUM_THREADS"):
+                    torch.set_num_threads(int(os.environ["TORCH_NUM_THREADS"]))
+                try:
+                    torch.set_num_interop_threads(1)
+                except RuntimeError:
+                    # Already set, or inter-op work has started in this process
+                    pass
+                if quantize_model:
+                    # int8 weights with dynamically quantized activations
+                    torch.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                    )
+            elif quantize_model:
+                # fp16 matmuls run on tensor cores
+                self.model.half()
+            
+            if compile_model is None:
+                compile_model = os.environ.get("EMBEDDING_COMPILE", "false").lower() == "true"
+            if compile_model and not hasattr(torch, "compile"):
+                logger.warning("torch.compile needs PyTorch 2; running the model uncompiled")
+            elif compile_model:
+                self.model.eval()
+                self.model[0].auto_model = torch.compile(
+                    self.model[0].auto_model, mode="reduce-overhead", dynamic=True
+                )
+                # Compile for the common batch sizes before serving
+                with torch.inference_mode():
+                    for batch_size in (1, 8, 32, ENCODE_BATCH_SIZE):
+                        self.model.encode(["warm up"] * batch_size, batch_size=batch_size)
+            logger.info(f"Successfully loaded model: {model_name}")
+        except Exception as e:
+            logger.error(f"Error loading model: {str(e)}")
+            raise
+    
+    def _create_collection(self, collection_name: str):
+        """
+        Create a Qdrant collection for feedback embeddings.
+        
+        Embeddings are stored unit-length, so the dot product equals cosine
+        similarity without Qdrant normalizing every vector again. Only
+        feedback_id gets a payload index.
+        
+        Args:
+            collection_name: Name of the collection to create
+        """
+        self.qdrant_client.create_collection(
+            collection_name=collection_name,
+            vectors_config=qdrant_models.VectorParams(
+                size=self.vector_size,
+                distance=qdrant_models.Distance.DOT
+            ),
+            optimizers_config=qdrant_models.OptimizersConfigDiff(
+                memmap_threshold=MEMMAP_THRESHOLD_KB
+            ),
+            # Payloads are read only for returned hits, so they stay on disk
+            # and leave RAM to the vectors
+            on_disk_payload=True,
+            hnsw_config=qdrant_models.HnswConfigDiff(
+                m=HNSW_M,
+                ef_construct=HNSW_EF_CONSTRUCT,
+                full_scan_threshold=HNSW_FULL_SCAN_THRESHOLD,
+                on_disk=True
+            ),
+            # int8 copies of the vectors are searched from RAM; the
+            # full vectors are only used to rescore the top hits
+            quantization_config=qdrant_models.ScalarQuantization(
+                scalar=qdrant_models.ScalarQuantizationConfig(
+                    type=qdrant_models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
+            )
+        )
+        self.qdrant_client.create_payload_index(
+            collection_name=collection_name,
+            field_name="feedback_id",
+            field_schema=qdrant_models.PayloadSchemaType.KEYWORD
+        )
     
     def _ensure_collection_exists(self):
         """Ensure that the Qdrant collection exists, creating it if necessary."""
@@ -75,13 +356,7 @@ class SemanticProcessor:
             
             if self.collection_name not in collection_names:
                 logger.info(f"Creating collection '{self.collection_name}' in Qdrant")
-                self.qdrant_client.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config=qdrant_models.VectorParams(
-                        size=self.vector_size,
-                        distance=qdrant_models.Distance.COSINE
-                    )
-                )
+                self._create_collection(self.collection_name)
                 logger.info(f"Collection '{self.collection_name}' created successfully")
             else:
                 logger.info(f"Collection '{self.collection_name}' already exists")
@@ -89,6 +364,64 @@ class SemanticProcessor:
             logger.error(f"Error ensuring collection exists: {str(e)}")
             raise
     
+    def _copy_points(self, source: str, target: str, batch_size: int):
+        """Copy every point between collections, normalizing the vectors."""
+        offset = None
+        while True:
+            records, offset = self.qdrant_client.scroll(
+                collection_name=source,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True
+            )
+            if records:
+                vectors = _normalize_rows(np.asarray([record.vector for record in records], dtype=np.float32))
+                self.qdrant_client.upsert(
+                    collection_name=target,
+                    points=[
+                        qdrant_models.PointStruct(id=record.id, vector=vector, payload=record.payload)
+                        for record, vector in zip(records, vectors.tolist())
+                    ]
+                )
+            if offset is None:
+                return
+    
+    def migrate_to_dot_distance(self, batch_size: int = 256) -> bool:
+        """
+        Recreate a collection created with cosine distance to use dot product.
+        
+        The points are copied to a temporary collection with their vectors
+        normalized, and copied back once the collection has been recreated.
+        Searches return incomplete results while this runs.
+        
+        Args:
+            batch_size: Number of points copied per request
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            info = self.qdrant_client.get_collection(self.collection_name)
+            if info.config.params.vectors.distance == qdrant_models.Distance.DOT:
+                logger.info(f"Collection '{self.collection_name}' already uses dot product")
+                return True
+            
+            temporary = f"{self.collection_name}_dot_migration"
+            self._create_collection(temporary)
+            self._copy_points(self.collection_name, temporary, batch_size)
+            self.qdrant_client.delete_collection(self.collection_name)
+            self._create_collection(self.collection_name)
+            self._copy_points(temporary, self.collection_name, batch_size)
+            self.qdrant_client.delete_collection(temporary)
+            
+            logger.info(f"Migrated collection '{self.collection_name}' to dot product")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error migrating collection to dot product: {str(e)}")
+            return False
+    
     def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding vector for a piece of text.
@@ -102,15 +435,28 @@ class SemanticProcessor:
         if not text:
             logger.warning("Empty text provided for embedding generation")
             # Return zero vector of the correct size
-            return np.zeros(self.vector_size)
+            return np.zeros(self.vector_size, dtype=np.float32)
         
         try:
-            embedding = self.model.encode(text)
-            return embedding
+            with torch.inference_mode():
+                embedding = self.model.encode(text, normalize_embeddings=True)
+            return embedding.astype(np.float32, copy=False)
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             raise
     
+    def _embed_query(self, query_text: str) -> np.ndarray:
+        """Get the embedding of a search query, from the cache if possible."""
+        with self._query_embeddings_lock:
+            embedding = self._query_embeddings.get(query_text)
+        if embedding is None:
+            embedding = np.asarray(self.generate_embedding(query_text), dtype=np.float32)
+            # Shared between searches, so it must not be modified
+            embedding.flags.writeable = False
+            with self._query_embeddings_lock:
+                self._query_embeddings[query_text] = embedding
+        return embedding
+    
     def store_feedback_embedding(
         self,
         feedback_id: Union[int, str],
@@ -129,15 +475,13 @@ class SemanticProcessor:
             bool: Success status
         """
         try:
+            feedback_text = feedback_text[:MAX_TEXT_LENGTH]
+            
             # Generate embedding
             embedding = self.generate_embedding(feedback_text)
             
             # Prepare payload with metadata
-            payload = {
-                "feedback_id": str(feedback_id),
-                "text": feedback_text[:1000],  # Truncate text for storage
-                **metadata
-            }
+            payload = self._payload(feedback_id, feedback_text, metadata)
             
             # Store in Qdrant
             self.qdrant_client.upsert(
@@ -158,6 +502,81 @@ class SemanticProcessor:
             logger.error(f"Error storing feedback embedding: {str(e)}")
             return False
     
+    def _prepare_batch(self, feedback_data: List[Dict[str, Any]]):
+        """
+        Encode a batch of feedback texts and build their payloads.
+        
+        Args:
+            feedback_data: Feedback items, as for batch_store_feedback_embeddings
+            
+        Returns:
+            Tuple of the point IDs, their (N, vector_size) vectors, their
+            payloads, and the IDs of the items that failed
+        """
+        # Encode every non-empty text at once; empty texts get zero vectors
+        texts = [(item.get('feedback_text') or '')[:MAX_TEXT_LENGTH] for item in feedback_data]
+        non_empty = [i for i, text in enumerate(texts) if text]
+        embeddings = np.zeros((len(texts), self.vector_size), dtype=np.float32)
+        if non_empty:
+            try:
+                with torch.inference_mode():
+                    embeddings[non_empty] = self.model.encode(
+                        [texts[i] for i in non_empty],
+                        batch_size=ENCODE_BATCH_SIZE,
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                        show_progress_bar=False
+                    )
+            except Exception as e:
+                logger.error(f"Error generating batch embeddings: {str(e)}")
+                return [], embeddings[:0], [], [item.get('feedback_id') for item in feedback_data]
+        
+        ids = []
+        payloads = []
+        rows = []
+        failed_ids = []
+        for row, (item, feedback_text) in enumerate(zip(feedback_data, texts)):
+            try:
+                feedback_id = item.get('feedback_id')
+                metadata = item.get('metadata', {})
+                
+                # Prepare payload with metadata
+                payloads.append(self._payload(feedback_id, feedback_text, metadata))
+                ids.append(feedback_id)
+                rows.append(row)
+                
+            except Exception as e:
+                logger.error(f"Error processing feedback ID {item.get('feedback_id')}: {str(e)}")
+                failed_ids.append(item.get('feedback_id'))
+        
+        # Indexing copies the vectors, so only do it when rows were dropped
+        if len(rows) < len(texts):
+            embeddings = embeddings[rows]
+        return ids, embeddings, payloads, failed_ids
+    
+    def _payload(
+        self,
+        feedback_id: Union[int, str],
+        feedback_text: str,
+        metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the Qdrant payload for a feedback item, without modifying metadata."""
+        payload = metadata.copy()
+        payload["feedback_id"] = feedback_id if isinstance(feedback_id, str) else str(feedback_id)
+        if self.store_text_in_qdrant:
+            payload["text"] = feedback_text
+        return payload
+    
+    def _upload_batch(self, ids: List[Any], vectors: np.ndarray, payloads: List[Dict[str, Any]]):
+        """Store a prepared batch in Qdrant, passing the vectors as one array."""
+        self.qdrant_client.upload_collection(
+            collection_name=self.collection_name,
+            vectors=vectors,
+            payload=payloads,
+            ids=ids,
+            batch_size=UPLOAD_BATCH_SIZE
+        )
+    
     def batch_store_feedback_embeddings(
         self,
         feedback_data: List[Dict[str, Any]]
@@ -165,6 +584,13 @@ class SemanticProcessor:
         """
         Store multiple feedback embeddings in a batch operation.
         
+        Items are encoded and uploaded UPLOAD_BATCH_SIZE at a time, each
+        batch with one model call. Batches are uploaded from background
+        threads while the next one is encoded, up to UPLOAD_CONCURRENCY at
+        once, so encoding only waits on the network when that many uploads
+        are still running. At most UPLOAD_CONCURRENCY + 1 batches' vectors
+        are held in memory.
+        
         Args:
             feedback_data: List of dictionaries containing:
                 - feedback_id: Unique identifier for the feedback
@@ -174,53 +600,40 @@ class SemanticProcessor:
         Returns:
             Dict with success count and failed IDs
         """
-        points = []
         success_count = 0
         failed_ids = []
         
-        for item in feedback_data:
+        def finish(upload, ids):
+            # If a batch upload fails, all of its points are considered failed
+            nonlocal success_count
             try:
-                feedback_id = item.get('feedback_id')
-                feedback_text = item.get('feedback_text', '')
-                metadata = item.get('metadata', {})
-                
-                # Generate embedding
-                embedding = self.generate_embedding(feedback_text)
-                
-                # Prepare payload with metadata
-                payload = {
-                    "feedback_id": str(feedback_id),
-                    "text": feedback_text[:1000],  # Truncate text for storage
-                    **metadata
-                }
-                
-                points.append(
-                    qdrant_models.PointStruct(
-                        id=feedback_id,
-                        vector=embedding.tolist(),
-                        payload=payload
-                    )
-                )
-                success_count += 1
-                
+                upload.result()
+                success_count += len(ids)
             except Exception as e:
-                logger.error(f"Error processing feedback ID {item.get('feedback_id')}: {str(e)}")
-                failed_ids.append(item.get('feedback_id'))
+                logger.error(f"Error storing batch embeddings: {str(e)}")
+                failed_ids.extend(ids)
         
-        if points:
-            try:
-                # Store batch in Qdrant
-                self.qdrant_client.upsert(
-                    collection_name=self.collection_name,
-                    points=points
+        # encode() only sorts by length within a call, so sort the whole
+        # input first; each chunk then holds texts of similar length and
+        # pads little
+        ordered = sorted(feedback_data, key=lambda item: len(item.get('feedback_text') or ''))
+        
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as executor:
+            for start in range(0, len(ordered), UPLOAD_BATCH_SIZE):
+                ids, vectors, payloads, failed = self._prepare_batch(
+                    ordered[start:start + UPLOAD_BATCH_SIZE]
                 )
-                logger.info(f"Successfully stored {success_count} embeddings in batch")
-            except Exception as e:
-                logger.error(f"Error storing batch embeddings: {str(e)}")
-                # If batch insert fails, all points are considered failed
-                failed_ids = [item.get('feedback_id') for item in feedback_data]
-                success_count = 0
+                failed_ids.extend(failed)
+                while len(pending) >= UPLOAD_CONCURRENCY:
+                    finish(*pending.popleft())
+                if ids:
+                    pending.append((executor.submit(self._upload_batch, ids, vectors, payloads), ids))
+            while pending:
+                finish(*pending.popleft())
         
+        if success_count:
+            logger.info(f"Successfully stored {success_count} embeddings in batch")
         return {
             "success_count": success_count,
             "failed_ids": failed_ids
@@ -230,7 +643,9 @@ class SemanticProcessor:
         self,
         query_text: str,
         limit: int = 10,
-        score_threshold: float = 0.7
+        score_threshold: float = 0.7,
+        query_vector: Optional[np.ndarray] = None,
+        fast: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Perform semantic search using a text query.
@@ -239,39 +654,383 @@ class SemanticProcessor:
             query_text: The query text to search for
             limit: Maximum number of results to return
             score_threshold: Minimum similarity score threshold
+            query_vector: Precomputed embedding of query_text, if available
+            fast: Search with a narrower HNSW beam, for lower latency at
+                slightly lower recall
             
         Returns:
             List of matched documents with metadata and similarity scores
         """
         try:
-            # Generate embedding for the query
-            query_vector = self.generate_embedding(query_text)
+            # Generate embedding for the query unless the caller already has it
+            if query_vector is None:
+                query_vector = self._embed_query(query_text)
+            else:
+                query_vector = _normalize_rows(np.asarray(query_vector, dtype=np.float32))
             
             # Search in Qdrant
             search_results = self.qdrant_client.search(
                 collection_name=self.collection_name,
-                query_vector=query_vector.tolist(),
-                limit=limit,
-                score_threshold=score_threshold
+                query_vector=np.asarray(query_vector, dtype=np.float32),
+                search_params=self._search_params(fast),
+                limit=limit * SEARCH_OVERSAMPLING,
+                score_threshold=score_threshold,
+                with_payload=self._payload_selector(),
+                with_vectors=False
+            )[:limit]
+            
+            results = self._format_results([search_results])[0]
+            logger.info(f"Semantic search for '{query_text}' returned {len(results)} results")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error performing semantic search: {str(e)}")
+            return []
+    
+    def semantic_search_many(
+        self,
+        queries: List[str],
+        limit: int = 10,
+        score_threshold: float = 0.7,
+        fast: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Perform semantic searches for several text queries at once.
+        
+        Queries that aren't in the query cache are encoded with one model
+        call, and all searches are sent to Qdrant in a single request.
+        
+        Args:
+            queries: The query texts to search for
+            limit: Maximum number of results to return per query
+            score_threshold: Minimum similarity score threshold
+            fast: Search with a narrower HNSW beam, as for semantic_search
+            
+        Returns:
+            List of results for each query, in order, as for semantic_search
+        """
+        if not queries:
+            return []
+        
+        try:
+            with self._query_embeddings_lock:
+                cached = [self._query_embeddings.get(query) for query in queries]
+            uncached = list({query for query, embedding in zip(queries, cached) if embedding is None})
+            if uncached:
+                with torch.inference_mode():
+                    vectors = self.model.encode(
+                        uncached,
+                        batch_size=ENCODE_BATCH_SIZE,
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                        show_progress_bar=False
+                    ).astype(np.float32, copy=False)
+                vectors.flags.writeable = False
+                encoded = dict(zip(uncached, vectors))
+                with self._query_embeddings_lock:
+                    self._query_embeddings.update(encoded)
+                cached = [
+                    encoded[query] if embedding is None else embedding
+                    for query, embedding in zip(queries, cached)
+                ]
+            
+            search_params = self._search_params(fast)
+            batch_results = self.qdrant_client.search_batch(
+                collection_name=self.collection_name,
+                requests=[
+                    qdrant_models.SearchRequest(
+                        vector=embedding.tolist(),
+                        params=search_params,
+                        limit=limit * SEARCH_OVERSAMPLING,
+                        score_threshold=score_threshold,
+                        with_payload=self._payload_selector(),
+                        with_vector=False
+                    )
+                    for embedding in cached
+                ]
             )
             
-            # Format results
-            results = []
-            for result in search_results:
-                results.append({
+            results = self._format_results(
+                [search_results[:limit] for search_results in batch_results]
+            )
+            logger.info(f"Semantic search for {len(queries)} queries returned "
+                        f"{sum(len(query_results) for query_results in results)} results")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error performing semantic searches: {str(e)}")
+            return [[] for _ in queries]
+    
+    @staticmethod
+    def _search_params(fast: bool) -> qdrant_models.SearchParams:
+        """HNSW and quantization settings for a search."""
+        return qdrant_models.SearchParams(
+            hnsw_ef=FAST_SEARCH_HNSW_EF if fast else SEARCH_HNSW_EF,
+            quantization=qdrant_models.QuantizationSearchParams(rescore=True)
+        )
+    
+    def _payload_selector(self) -> Union[bool, qdrant_models.PayloadSelectorInclude]:
+        """Payload fields returned with search hits."""
+        if self._known_metadata_keys is None:
+            return True
+        return qdrant_models.PayloadSelectorInclude(
+            include=["feedback_id", "text", *self._known_metadata_keys]
+        )
+    
+    def _format_results(self, batch_results: List[List[Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Convert Qdrant hits for one or more searches into result dicts.
+        
+        Text that isn't kept in Qdrant is filled in with a single text_lookup
+        call across all the searches.
+        """
+        batch = [
+            [
+                {
                     "feedback_id": result.payload.get("feedback_id"),
                     "text": result.payload.get("text"),
                     "score": result.score,
                     "metadata": {k: v for k, v in result.payload.items() 
                                if k not in ["feedback_id", "text"]}
-                })
+                }
+                for result in search_results
+            ]
+            for search_results in batch_results
+        ]
+        
+        missing = [
+            result["feedback_id"]
+            for results in batch
+            for result in results
+            if result["text"] is None
+        ]
+        if missing and self.text_lookup is not None:
+            texts = self.text_lookup(missing)
+            for results in batch:
+                for result in results:
+                    if result["text"] is None:
+                        result["text"] = texts.get(result["feedback_id"])
+        return batch
+
+class EmbeddingCache:
+    """
+    Disk-backed cache of text embeddings stored in SQLite.
+    
+    Entries are keyed by a SHA-256 of the model name, quantization mode and
+    text, so they survive process restarts and are shared by every process
+    using the same file. Entries older than max_age_seconds are dropped, and
+    the newest max_entries are kept.
+    """
+    
+    # Writes between prunes of old and excess entries
+    PRUNE_EVERY = 100
+    
+    def __init__(self, path: str = None, max_entries: int = None, max_age_seconds: int = None):
+        """
+        Initialize the embedding cache.
+        
+        Args:
+            path: SQLite database file (defaults to environment variable or
+                /tmp/sped_embed_cache.db)
+            max_entries: Maximum number of cached embeddings (defaults to
+                environment variable or 100000)
+            max_age_seconds: Seconds an embedding is kept (defaults to
+                environment variable or 30 days)
+        """
+        self.path = path or os.environ.get("EMBEDDING_CACHE_PATH", "/tmp/sped_embed_cache.db")
+        self.max_entries = max_entries or int(os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", 100000))
+        self.max_age_seconds = max_age_seconds or int(os.environ.get("EMBEDDING_CACHE_MAX_AGE", 30 * 24 * 3600))
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embed_cache ("
+            "text_sha256 BLOB PRIMARY KEY, vector BLOB NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embed_cache_ts ON embed_cache (ts)")
+        self._conn.commit()
+        
+        with self._lock:
+            self._prune()
+    
+    @staticmethod
+    def _key(model_name: str, quantized: bool, text: str) -> bytes:
+        mode = "int8" if quantized else "fp"
+        return hashlib.sha256(f"{model_name}\0{mode}\0{text}".encode("utf-8")).digest()
+    
+    def _prune(self):
+        """Drop expired entries and all but the newest max_entries. Call with the lock held."""
+        try:
+            self._conn.execute(
+                "DELETE FROM embed_cache WHERE ts < ?",
+                (int(time.time()) - self.max_age_seconds,)
+            )
+            self._conn.execute(
+                "DELETE FROM embed_cache WHERE text_sha256 NOT IN ("
+                "SELECT text_sha256 FROM embed_cache ORDER BY ts DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Error pruning embedding cache: {str(e)}")
+    
+    def get(self, model_name: str, text: str, quantized: bool = False) -> Optional[np.ndarray]:
+        """
+        Look up the cached embedding of a text.
+        
+        Args:
+            model_name: Name of the model that produced the embedding
+            text: The embedded text
+            quantized: Whether the model was quantized to int8
             
-            logger.info(f"Semantic search for '{query_text}' returned {len(results)} results")
-            return results
+        Returns:
+            Optional[np.ndarray]: The embedding if cached, None otherwise
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT vector, ts FROM embed_cache WHERE text_sha256 = ?",
+                    (self._key(model_name, quantized, text),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Error reading embedding cache: {str(e)}")
+            return None
+        
+        if row is None or row[1] < time.time() - self.max_age_seconds:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32)
+    
+    def put(self, model_name: str, text: str, vector: np.ndarray, quantized: bool = False):
+        """
+        Store the embedding of a text.
+        
+        Args:
+            model_name: Name of the model that produced the embedding
+            text: The embedded text
+            vector: The embedding
+            quantized: Whether the model was quantized to int8
+        """
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embed_cache (text_sha256, vector, ts) VALUES (?, ?, ?)",
+                    (
+                        self._key(model_name, quantized, text),
+                        np.asarray(vector, dtype=np.float32).tobytes(),
+                        int(time.time())
+                    )
+                )
+                self._conn.commit()
+                
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    self._prune()
+        except sqlite3.Error as e:
+            logger.warning(f"Error writing embedding cache: {str(e)}")
+
+class SemanticSearchCache:
+    """
+    In-memory cache of search results keyed by query embedding similarity.
+    
+    A lookup hits when a cached query's embedding has cosine similarity of at
+    least similarity_threshold with the new query and was searched with a limit
+    and score threshold that cover the new request.
+    """
+    
+    def __init__(
+        self,
+        capacity: int = 128,
+        ttl_seconds: float = 600,
+        similarity_threshold: float = 0.86
+    ):
+        """
+        Initialize the search cache.
+        
+        Args:
+            capacity: Maximum number of cached queries
+            ttl_seconds: Seconds a cached result stays valid
+            similarity_threshold: Minimum cosine similarity for a cache hit
+        """
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self._entries = []
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _evict_expired(self):
+        cutoff = time.monotonic() - self.ttl_seconds
+        self._entries = [entry for entry in self._entries if entry["created"] >= cutoff]
+    
+    def get(
+        self,
+        query_vector,
+        limit: int,
+        score_threshold: float
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached results for a query embedding.
+        
+        Args:
+            query_vector: Embedding of the query
+            limit: Maximum number of results requested
+            score_threshold: Minimum similarity score requested
             
-        except Exception as e:
-            logger.error(f"Error performing semantic search: {str(e)}")
-            return []
+        Returns:
+            Optional[List[Dict[str, Any]]]: Cached results, or None on a miss
+        """
+        query = self._normalize(query_vector)
+        
+        with self._lock:
+            self._evict_expired()
+            candidates = [
+                entry for entry in self._entries
+                if entry["limit"] >= limit and entry["score_threshold"] <= score_threshold
+            ]
+            if not candidates:
+                return None
+            
+            similarities = np.stack([entry["vector"] for entry in candidates]) @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                return None
+            results = candidates[best]["results"]
+        
+        return [result for result in results if result["score"] >= score_threshold][:limit]
+    
+    def put(
+        self,
+        query_vector,
+        limit: int,
+        score_threshold: float,
+        results: List[Dict[str, Any]]
+    ):
+        """
+        Cache the results of a search.
+        
+        Args:
+            query_vector: Embedding of the query
+            limit: Maximum number of results that was requested
+            score_threshold: Minimum similarity score that was requested
+            results: Search results, ordered by descending score
+        """
+        with self._lock:
+            self._evict_expired()
+            if len(self._entries) >= self.capacity:
+                # Entries are kept in insertion order, so the oldest goes first
+                self._entries.pop(0)
+            self._entries.append({
+                "vector": self._normalize(query_vector),
+                "limit": limit,
+                "score_threshold": score_threshold,
+                "results": results,
+                "created": time.monotonic()
+            })
 
 # Function to get a pre-configured instance of the semantic processor
 def get_semantic_processor(
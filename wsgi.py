@@ -0,0 +1,6 @@
+"""
+WSGI entry point for serving the Flask API with gunicorn.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from flask_app.app import app